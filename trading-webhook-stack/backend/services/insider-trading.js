@@ -156,6 +156,55 @@ function formatInsiderAlert(data) {
   `.trim();
 }
 
+/**
+ * Normalize an incoming /webhook/insider-trading body into a list of alerts.
+ * Accepts a single alert, a batch ({ type: 'insider_trading_batch', alerts: [...] }),
+ * a legacy batch ({ transactions: [...] }) or a bare array of alerts.
+ */
+function normalizeInsiderPayload(body) {
+  if (!body) {
+    return [];
+  }
+
+  if (Array.isArray(body)) {
+    return body;
+  }
+
+  if (Array.isArray(body.alerts)) {
+    return body.alerts;
+  }
+
+  if (Array.isArray(body.transactions)) {
+    return body.transactions;
+  }
+
+  return [body];
+}
+
+/**
+ * Format a coalesced batch of insider alerts as a single Telegram message
+ */
+function formatInsiderBatchAlert(alerts) {
+  if (alerts.length === 1) {
+    return formatInsiderAlert(alerts[0]);
+  }
+
+  const lines = alerts.map(alert => {
+    const ticker = alert.ticker || 'N/A';
+    const detail = alert.company && alert.company !== ticker ? ` - ${alert.company}` : '';
+    const date = alert.filing_date || alert.latest_filing || 'N/A';
+    return `• <code>${ticker}</code>${detail} (${date})`;
+  });
+
+  return `
+🟢 <b>Insider Trading Alerts (${alerts.length})</b>
+
+${lines.join('\n')}
+
+🕐 ${new Date().toLocaleString('en-US', { timeZone: 'Europe/Warsaw' })}
+  `.trim();
+}
+
 /**
  * Send insider trading alert to webhook
  */
@@ -187,5 +236,7 @@ export default {
   getRecentForm4Filings,
   monitorTickers,
   formatInsiderAlert,
+  formatInsiderBatchAlert,
+  normalizeInsiderPayload,
   sendInsiderAlert
 };
@@ -1,18 +1,45 @@
 import Database from 'better-sqlite3';
+import fs from 'fs';
 import path from 'path';
+import zlib from 'zlib';
 import { logger } from '../backend/utils/logger.js';
 
 const dbPath = path.join(process.cwd(), 'database', 'trading.db');
+const archiveDir = path.join(process.cwd(), 'database', 'archive');
 let db;
 
+// raw_data compression: NULL raw_codec = plain text, 0 = deflate, N = deflate
+// with payload_dicts.id N as preset dictionary (trained on recent payloads)
+const DICT_SIZE = 16 * 1024;
+const MIN_TRAINING_SAMPLES = 200;
+const TRAINING_SAMPLES = 2000;
+const DICT_MAX_AGE_DAYS = 30;
+const ARCHIVE_DAYS = 365;
+const MAINTENANCE_INTERVAL_HOURS = 24;
+const MAINTENANCE_CHECK_MS = 60 * 60 * 1000;
+const MAINTENANCE_STARTUP_DELAY_MS = 60 * 1000;
+const payloadDicts = new Map();
+let currentDictId = 0;
+let maintenanceRunning = false;
+
 export function initDatabase() {
   db = new Database(dbPath);
 
   // Enable foreign keys
   db.pragma('foreign_keys = ON');
 
+  // Bounded page cache (8 MiB) for small hosts
+  db.pragma('cache_size = -8192');
+
   // Create tables
   createTables();
+  loadPayloadDicts();
+  enableIncrementalVacuum();
+
+  // Daily compaction, archival and incremental vacuum. The last run is kept in
+  // the database, so a process restarted more often than daily still gets it
+  setTimeout(maybeMaintainStorage, MAINTENANCE_STARTUP_DELAY_MS).unref();
+  setInterval(maybeMaintainStorage, MAINTENANCE_CHECK_MS).unref();
 
   logger.info(`Database initialized: ${dbPath}`);
   return db;
@@ -50,6 +77,36 @@ function createTables() {
     // Column already exists, ignore error
   }
 
+  // Migration: compressed/archived raw_data
+  try {
+    db.exec(`ALTER TABLE signals ADD COLUMN raw_codec INTEGER`);
+  } catch (e) {
+    // Column already exists, ignore error
+  }
+  try {
+    db.exec(`ALTER TABLE signals ADD COLUMN archived TEXT`);
+  } catch (e) {
+    // Column already exists, ignore error
+  }
+
+  // Trained compression dictionaries for raw_data
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS payload_dicts (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      dict BLOB NOT NULL,
+      samples INTEGER,
+      created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+  `);
+
+  // Last run of periodic jobs (storage maintenance)
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS maintenance_runs (
+      task TEXT PRIMARY KEY,
+      last_run DATETIME NOT NULL
+    )
+  `);
+
   // Trades table
   db.exec(`
     CREATE TABLE IF NOT EXISTS trades (
@@ -84,26 +141,366 @@ function createTables() {
     )
   `);
 
+  // Daily signal rollup per symbol and type (statistics holds the per-day totals)
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS signal_stats_daily (
+      date TEXT NOT NULL,
+      symbol TEXT NOT NULL,
+      type TEXT NOT NULL DEFAULT '',
+      total_signals INTEGER DEFAULT 0,
+      long_signals INTEGER DEFAULT 0,
+      short_signals INTEGER DEFAULT 0,
+      price_sum REAL DEFAULT 0,
+      PRIMARY KEY (date, symbol, type)
+    )
+  `);
+
   // Create indexes
   db.exec(`
     CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp);
     CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals(symbol);
     CREATE INDEX IF NOT EXISTS idx_signals_type ON signals(type);
     CREATE INDEX IF NOT EXISTS idx_trades_signal_id ON trades(signal_id);
+    CREATE INDEX IF NOT EXISTS idx_signal_stats_daily_type ON signal_stats_daily(type);
   `);
 
+  createRollupTriggers();
+
   logger.info('Database tables created');
 }
 
+// Rollups are maintained by triggers, inside the same transaction as each
+// insert/update/delete, so stats queries never scan signals or trades.
+const ROLLUP_VERSION = 1;
+
+function signalRollupSql(row, sign) {
+  const date = `COALESCE(DATE(${row}.timestamp), DATE('now'))`;
+  const long = `(${row}.action = 'LONG') * ${sign}`;
+  const short = `(${row}.action = 'SHORT') * ${sign}`;
+
+  return `
+    INSERT INTO signal_stats_daily (date, symbol, type, total_signals, long_signals, short_signals, price_sum)
+    VALUES (${date}, ${row}.symbol, COALESCE(${row}.type, ''), ${sign}, ${long}, ${short}, ${row}.price * ${sign})
+    ON CONFLICT(date, symbol, type) DO UPDATE SET
+      total_signals = total_signals + excluded.total_signals,
+      long_signals = long_signals + excluded.long_signals,
+      short_signals = short_signals + excluded.short_signals,
+      price_sum = price_sum + excluded.price_sum;
+
+    INSERT INTO statistics (date, total_signals, long_signals, short_signals)
+    VALUES (${date}, ${sign}, ${long}, ${short})
+    ON CONFLICT(date) DO UPDATE SET
+      total_signals = total_signals + excluded.total_signals,
+      long_signals = long_signals + excluded.long_signals,
+      short_signals = short_signals + excluded.short_signals;
+  `;
+}
+
+function tradeRollupSql(row, sign) {
+  // Trades count on the day they closed; only won/lost trades contribute
+  const date = `COALESCE(DATE(${row}.closed_at), DATE(${row}.opened_at), DATE('now'))`;
+
+  return `
+    INSERT INTO statistics (date, won_trades, lost_trades, total_profit, total_loss)
+    SELECT ${date},
+      (${row}.status = 'won') * ${sign},
+      (${row}.status = 'lost') * ${sign},
+      CASE WHEN ${row}.status = 'won' THEN COALESCE(${row}.profit_loss, 0) ELSE 0 END * ${sign},
+      CASE WHEN ${row}.status = 'lost' THEN ABS(COALESCE(${row}.profit_loss, 0)) ELSE 0 END * ${sign}
+    WHERE ${row}.status IN ('won', 'lost')
+    ON CONFLICT(date) DO UPDATE SET
+      won_trades = won_trades + excluded.won_trades,
+      lost_trades = lost_trades + excluded.lost_trades,
+      total_profit = total_profit + excluded.total_profit,
+      total_loss = total_loss + excluded.total_loss;
+
+    UPDATE statistics SET
+      win_rate = CASE WHEN won_trades + lost_trades > 0
+        THEN won_trades * 100.0 / (won_trades + lost_trades) ELSE 0 END,
+      profit_factor = CASE WHEN total_loss > 0 THEN total_profit / total_loss ELSE total_profit END
+    WHERE date = ${date} AND ${row}.status IN ('won', 'lost');
+  `;
+}
+
+function createRollupTriggers() {
+  db.exec(`
+    CREATE TRIGGER IF NOT EXISTS trg_signals_rollup_insert AFTER INSERT ON signals BEGIN
+      ${signalRollupSql('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_signals_rollup_update
+    AFTER UPDATE OF timestamp, symbol, type, action, price ON signals BEGIN
+      ${signalRollupSql('OLD', -1)}
+      ${signalRollupSql('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_signals_rollup_delete AFTER DELETE ON signals BEGIN
+      ${signalRollupSql('OLD', -1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_trades_rollup_insert AFTER INSERT ON trades BEGIN
+      ${tradeRollupSql('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_trades_rollup_update
+    AFTER UPDATE OF status, profit_loss, opened_at, closed_at ON trades BEGIN
+      ${tradeRollupSql('OLD', -1)}
+      ${tradeRollupSql('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_trades_rollup_delete AFTER DELETE ON trades BEGIN
+      ${tradeRollupSql('OLD', -1)}
+    END;
+  `);
+
+  // Databases created before the rollups existed: backfill once from the base tables
+  if (db.pragma('user_version', { simple: true }) < ROLLUP_VERSION) {
+    rebuildStatistics();
+    db.pragma(`user_version = ${ROLLUP_VERSION}`);
+  }
+}
+
+export function rebuildStatistics() {
+  db.transaction(() => {
+    db.exec(`
+      DELETE FROM signal_stats_daily;
+      DELETE FROM statistics;
+
+      INSERT INTO signal_stats_daily (date, symbol, type, total_signals, long_signals, short_signals, price_sum)
+      SELECT COALESCE(DATE(timestamp), DATE('now')), symbol, COALESCE(type, ''), COUNT(*),
+        SUM(action = 'LONG'), SUM(action = 'SHORT'), SUM(price)
+      FROM signals
+      GROUP BY 1, 2, 3;
+
+      INSERT INTO statistics (date, total_signals, long_signals, short_signals)
+      SELECT date, SUM(total_signals), SUM(long_signals), SUM(short_signals)
+      FROM signal_stats_daily
+      GROUP BY date;
+
+      INSERT INTO statistics (date, won_trades, lost_trades, total_profit, total_loss)
+      SELECT COALESCE(DATE(closed_at), DATE(opened_at), DATE('now')),
+        SUM(status = 'won'), SUM(status = 'lost'),
+        SUM(CASE WHEN status = 'won' THEN COALESCE(profit_loss, 0) ELSE 0 END),
+        SUM(CASE WHEN status = 'lost' THEN ABS(COALESCE(profit_loss, 0)) ELSE 0 END)
+      FROM trades
+      WHERE status IN ('won', 'lost')
+      GROUP BY 1
+      ON CONFLICT(date) DO UPDATE SET
+        won_trades = excluded.won_trades,
+        lost_trades = excluded.lost_trades,
+        total_profit = excluded.total_profit,
+        total_loss = excluded.total_loss;
+
+      UPDATE statistics SET
+        win_rate = CASE WHEN won_trades + lost_trades > 0
+          THEN won_trades * 100.0 / (won_trades + lost_trades) ELSE 0 END,
+        profit_factor = CASE WHEN total_loss > 0 THEN total_profit / total_loss ELSE total_profit END;
+    `);
+  })();
+
+  logger.info('Statistics rollups rebuilt');
+}
+
+// Payload compression
+function loadPayloadDicts() {
+  for (const row of db.prepare('SELECT id, dict FROM payload_dicts ORDER BY id').all()) {
+    payloadDicts.set(row.id, row.dict);
+    currentDictId = row.id;
+  }
+}
+
+function encodePayload(text) {
+  if (text === null || text === undefined) return { raw: null, codec: null };
+
+  const data = Buffer.from(typeof text === 'string' ? text : JSON.stringify(text));
+  if (!currentDictId) return { raw: zlib.deflateSync(data, { level: 9 }), codec: 0 };
+
+  return {
+    raw: zlib.deflateSync(data, { level: 9, dictionary: payloadDicts.get(currentDictId) }),
+    codec: currentDictId
+  };
+}
+
+function decodePayload(raw, codec) {
+  if (raw === null || codec === null || codec === undefined) return raw;
+  if (codec === 0) return zlib.inflateSync(raw).toString();
+  return zlib.inflateSync(raw, { dictionary: payloadDicts.get(codec) }).toString();
+}
+
+function decodeSignal(row) {
+  if (!row) return row;
+  const { raw_codec: codec, ...signal } = row;
+  signal.raw_data = decodePayload(row.raw_data, codec);
+  return signal;
+}
+
+// Digit-free byte runs shared by many payloads (keys, enums, URL prefixes),
+// best ones last so deflate reaches them with the shortest distances
+export function trainDictionary(samples, size = DICT_SIZE) {
+  const documentFreq = new Map();
+  for (const sample of samples) {
+    for (const segment of new Set(sample.match(/\D{4,}/g) || [])) {
+      documentFreq.set(segment, (documentFreq.get(segment) || 0) + 1);
+    }
+  }
+
+  const threshold = Math.max(2, Math.floor(samples.length / 20));
+  const score = (segment) => documentFreq.get(segment) * Buffer.byteLength(segment);
+  const ranked = [...documentFreq.keys()]
+    .filter((segment) => documentFreq.get(segment) >= threshold)
+    .sort((a, b) => score(b) - score(a));
+
+  const parts = [];
+  let total = 0;
+  for (const segment of ranked) {
+    const length = Buffer.byteLength(segment);
+    if (total + length > size) continue;
+    parts.unshift(segment);
+    total += length;
+  }
+
+  return Buffer.from(parts.join(''));
+}
+
+function retrainDictionary() {
+  const fresh = db.prepare(`
+    SELECT 1 FROM payload_dicts WHERE id = ? AND created_at >= datetime('now', ?)
+  `).get(currentDictId, `-${DICT_MAX_AGE_DAYS} days`);
+  if (fresh) return null;
+
+  const rows = db.prepare(`
+    SELECT raw_data, raw_codec FROM signals
+    WHERE raw_data IS NOT NULL
+    ORDER BY id DESC
+    LIMIT ?
+  `).all(TRAINING_SAMPLES);
+  if (rows.length < MIN_TRAINING_SAMPLES) return null;
+
+  const dict = trainDictionary(rows.map((row) => String(decodePayload(row.raw_data, row.raw_codec))));
+  const result = db.prepare('INSERT INTO payload_dicts (dict, samples) VALUES (?, ?)').run(dict, rows.length);
+  payloadDicts.set(Number(result.lastInsertRowid), dict);
+  currentDictId = Number(result.lastInsertRowid);
+  return currentDictId;
+}
+
+// Migration: incremental auto-vacuum. Switching an existing database needs
+// one full VACUUM, done here at startup rather than while serving requests
+function enableIncrementalVacuum() {
+  if (db.pragma('auto_vacuum', { simple: true }) === 2) return;
+
+  logger.info('Enabling incremental auto-vacuum (one-time full VACUUM)...');
+  db.pragma('auto_vacuum = INCREMENTAL');
+  db.exec('VACUUM');
+  logger.info('Enabled incremental auto-vacuum');
+}
+
+// Let queued requests run between maintenance batches
+const yieldToEventLoop = () => new Promise((resolve) => setImmediate(resolve));
+
+// Run maintainStorage if its last recorded run is older than the interval
+export async function maybeMaintainStorage() {
+  if (maintenanceRunning) return;
+
+  const due = !db.prepare(`
+    SELECT 1 FROM maintenance_runs
+    WHERE task = 'storage' AND last_run >= datetime('now', ?)
+  `).get(`-${MAINTENANCE_INTERVAL_HOURS} hours`);
+  if (!due) return;
+
+  maintenanceRunning = true;
+  try {
+    await maintainStorage();
+    db.prepare(`
+      INSERT INTO maintenance_runs (task, last_run) VALUES ('storage', datetime('now'))
+      ON CONFLICT(task) DO UPDATE SET last_run = excluded.last_run
+    `).run();
+  } catch (e) {
+    logger.error(`Storage maintenance failed: ${e.message}`);
+  } finally {
+    maintenanceRunning = false;
+  }
+}
+
+// Storage maintenance: compress legacy rows, archive old payloads into
+// monthly gzip partitions (database/archive/signals-YYYY-MM.jsonl.gz),
+// then return free pages with incremental vacuum. Each batch is one short
+// transaction and the event loop is yielded between batches, so webhooks
+// keep being served while a large backlog is worked through
+export async function maintainStorage({ archiveDays = ARCHIVE_DAYS, batch = 5000 } = {}) {
+  const dictId = retrainDictionary();
+  if (dictId) logger.info(`Trained payload dictionary #${dictId}`);
+
+  const compress = db.transaction(() => {
+    const rows = db.prepare(`
+      SELECT id, raw_data FROM signals
+      WHERE raw_codec IS NULL AND raw_data IS NOT NULL
+      LIMIT ?
+    `).all(batch);
+    const update = db.prepare('UPDATE signals SET raw_data = ?, raw_codec = ? WHERE id = ?');
+    for (const row of rows) {
+      const { raw, codec } = encodePayload(row.raw_data);
+      update.run(raw, codec, row.id);
+    }
+    return rows.length;
+  });
+
+  const archive = db.transaction(() => {
+    const rows = db.prepare(`
+      SELECT id, strftime('%Y-%m', created_at) as month, raw_data, raw_codec
+      FROM signals
+      WHERE created_at < datetime('now', ?) AND raw_data IS NOT NULL
+      ORDER BY id
+      LIMIT ?
+    `).all(`-${archiveDays} days`, batch);
+
+    const partitions = new Map();
+    for (const row of rows) {
+      const month = row.month || 'unknown';
+      if (!partitions.has(month)) partitions.set(month, []);
+      partitions.get(month).push(row);
+    }
+
+    fs.mkdirSync(archiveDir, { recursive: true });
+    const update = db.prepare('UPDATE signals SET raw_data = NULL, raw_codec = NULL, archived = ? WHERE id = ?');
+    for (const [month, items] of partitions) {
+      // Each append is its own gzip member; the file still reads as one stream
+      const name = `signals-${month}.jsonl.gz`;
+      const lines = items
+        .map((row) => JSON.stringify({ id: row.id, raw_data: decodePayload(row.raw_data, row.raw_codec) }))
+        .join('\n') + '\n';
+      fs.appendFileSync(path.join(archiveDir, name), zlib.gzipSync(lines));
+      for (const row of items) update.run(name, row.id);
+    }
+    return rows.length;
+  });
+
+  let compressed = 0;
+  let archived = 0;
+  for (let done = batch; done === batch; compressed += done) {
+    done = compress();
+    await yieldToEventLoop();
+  }
+  for (let done = batch; done === batch; archived += done) {
+    done = archive();
+    await yieldToEventLoop();
+  }
+
+  db.pragma('incremental_vacuum(2000)');
+
+  logger.info(`Storage maintenance: compressed ${compressed}, archived ${archived} signal payloads`);
+  return { compressed, archived };
+}
+
 // Signal operations
 export async function saveSignal(signal) {
   const stmt = db.prepare(`
     INSERT INTO signals (
       timestamp, symbol, action, price, timeframe, strategy, type,
       setup, fibonacci_level, stop_loss, take_profit, risk_percent,
-      notes, indicator_value, raw_data
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+      notes, indicator_value, raw_data, raw_codec
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
   `);
+  const payload = encodePayload(signal.raw_data);
 
   const result = stmt.run(
     signal.timestamp,
@@ -120,7 +517,8 @@ export async function saveSignal(signal) {
     signal.risk_percent,
     signal.notes,
     signal.indicator_value || null,
-    signal.raw_data
+    payload.raw,
+    payload.codec
   );
 
   return result.lastInsertRowid;
@@ -132,7 +530,7 @@ export async function getSignalsPaginated(page = 1, limit = 50) {
     SELECT * FROM signals
     ORDER BY timestamp DESC
     LIMIT ? OFFSET ?
-  `).all(limit, offset);
+  `).all(limit, offset).map(decodeSignal);
 
   const total = db.prepare('SELECT COUNT(*) as count FROM signals').get();
 
@@ -148,7 +546,7 @@ export async function getSignalsPaginated(page = 1, limit = 50) {
 }
 
 export async function getSignal(id) {
-  return db.prepare('SELECT * FROM signals WHERE id = ?').get(id);
+  return decodeSignal(db.prepare('SELECT * FROM signals WHERE id = ?').get(id));
 }
 
 export async function getSignalsByDate(date) {
@@ -156,7 +554,7 @@ export async function getSignalsByDate(date) {
     SELECT * FROM signals
     WHERE DATE(timestamp) = ?
     ORDER BY timestamp DESC
-  `).all(date);
+  `).all(date).map(decodeSignal);
 }
 
 export async function getSignalsByType(type) {
@@ -164,22 +562,19 @@ export async function getSignalsByType(type) {
     SELECT * FROM signals
     WHERE type = ?
     ORDER BY timestamp DESC
-  `).all(type);
+  `).all(type).map(decodeSignal);
 }
 
-// Statistics operations
+// Statistics operations (read from the rollups, never the base tables)
 export async function getTotalSignals() {
-  const result = db.prepare('SELECT COUNT(*) as count FROM signals').get();
+  const result = db.prepare('SELECT COALESCE(SUM(total_signals), 0) as count FROM statistics').get();
   return result.count;
 }
 
 export async function getTodaySignals() {
   const today = new Date().toISOString().split('T')[0];
-  const result = db.prepare(`
-    SELECT COUNT(*) as count FROM signals
-    WHERE DATE(timestamp) = ?
-  `).get(today);
-  return result.count;
+  const result = db.prepare('SELECT total_signals as count FROM statistics WHERE date = ?').get(today);
+  return result ? result.count : 0;
 }
 
 export async function getRecentSignals(limit = 10) {
@@ -187,85 +582,90 @@ export async function getRecentSignals(limit = 10) {
     SELECT * FROM signals
     ORDER BY timestamp DESC
     LIMIT ?
-  `).all(limit);
+  `).all(limit).map(decodeSignal);
 }
 
 export async function getStatsByType() {
   return db.prepare(`
     SELECT
-      type,
-      COUNT(*) as count,
-      AVG(price) as avg_price
-    FROM signals
+      NULLIF(type, '') as type,
+      SUM(total_signals) as count,
+      SUM(price_sum) / SUM(total_signals) as avg_price
+    FROM signal_stats_daily
     GROUP BY type
+    HAVING SUM(total_signals) > 0
   `).all();
 }
 
 export async function getWinRate() {
-  const won = db.prepare("SELECT COUNT(*) as count FROM trades WHERE status = 'won'").get();
-  const total = db.prepare("SELECT COUNT(*) as count FROM trades WHERE status IN ('won', 'lost')").get();
+  const totals = db.prepare(`
+    SELECT COALESCE(SUM(won_trades), 0) as won, COALESCE(SUM(won_trades + lost_trades), 0) as total
+    FROM statistics
+  `).get();
 
-  if (total.count === 0) return 0;
-  return ((won.count / total.count) * 100).toFixed(2);
+  if (totals.total === 0) return 0;
+  return ((totals.won / totals.total) * 100).toFixed(2);
 }
 
 export async function getProfitFactor() {
-  const profit = db.prepare("SELECT SUM(profit_loss) as total FROM trades WHERE status = 'won'").get();
-  const loss = db.prepare("SELECT SUM(ABS(profit_loss)) as total FROM trades WHERE status = 'lost'").get();
+  const totals = db.prepare(`
+    SELECT SUM(total_profit) as profit, SUM(total_loss) as loss
+    FROM statistics
+  `).get();
 
-  if (!loss.total || loss.total === 0) return profit.total || 0;
-  return (profit.total / loss.total).toFixed(2);
+  if (!totals.loss || totals.loss === 0) return totals.profit || 0;
+  return (totals.profit / totals.loss).toFixed(2);
 }
 
 export async function getDailyStatistics(date) {
-  const signals = db.prepare(`
-    SELECT COUNT(*) as count FROM signals
-    WHERE DATE(timestamp) = ?
-  `).get(date);
-
-  const long = db.prepare(`
-    SELECT COUNT(*) as count FROM signals
-    WHERE DATE(timestamp) = ? AND action = 'LONG'
-  `).get(date);
-
-  const short = db.prepare(`
-    SELECT COUNT(*) as count FROM signals
-    WHERE DATE(timestamp) = ? AND action = 'SHORT'
+  const row = db.prepare(`
+    SELECT total_signals, long_signals, short_signals
+    FROM statistics
+    WHERE date = ?
   `).get(date);
 
   return {
     date,
-    totalSignals: signals.count,
-    longSignals: long.count,
-    shortSignals: short.count
+    totalSignals: row ? row.total_signals : 0,
+    longSignals: row ? row.long_signals : 0,
+    shortSignals: row ? row.short_signals : 0
   };
 }
 
 export async function getMonthlyStatistics(month) {
-  const signals = db.prepare(`
-    SELECT COUNT(*) as count FROM signals
-    WHERE strftime('%Y-%m', timestamp) = ?
-  `).get(month);
-
   const byDay = db.prepare(`
     SELECT
-      DATE(timestamp) as day,
-      COUNT(*) as count,
-      SUM(CASE WHEN action = 'LONG' THEN 1 ELSE 0 END) as longs,
-      SUM(CASE WHEN action = 'SHORT' THEN 1 ELSE 0 END) as shorts
-    FROM signals
-    WHERE strftime('%Y-%m', timestamp) = ?
-    GROUP BY DATE(timestamp)
+      date as day,
+      total_signals as count,
+      long_signals as longs,
+      short_signals as shorts
+    FROM statistics
+    WHERE date >= ? AND date < ? AND total_signals > 0
     ORDER BY day
-  `).all(month);
+  `).all(`${month}-01`, `${month}-32`);
 
   return {
     month,
-    totalSignals: signals.count,
+    totalSignals: byDay.reduce((sum, day) => sum + day.count, 0),
     dailyBreakdown: byDay
   };
 }
 
+export async function getSymbolStatistics(symbol, fromDate, toDate) {
+  return db.prepare(`
+    SELECT
+      date,
+      type,
+      total_signals as count,
+      long_signals as longs,
+      short_signals as shorts,
+      price_sum / total_signals as avg_price
+    FROM signal_stats_daily
+    WHERE symbol = ? AND date BETWEEN ? AND ? AND total_signals > 0
+    ORDER BY date
+  `).all(symbol, fromDate, toDate);
+}
+
 export function closeDatabase() {
   if (db) {
     db.close();
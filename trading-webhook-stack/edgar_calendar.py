@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+EDGAR acceptance calendar for poll scheduling
+
+EDGAR accepts filings 06:00-22:00 US Eastern on business days and not on
+federal holidays. Most forms filed after 17:30 get the next business day's
+filing date, but Section 16 forms (3, 4 and 5) are exempt: they keep the
+same-day filing date until the 22:00 close. Form 4 volume therefore peaks
+in the evening after the 16:00 market close and runs well past 17:30,
+which is why the peak window ends at 20:00 and EDGAR_CLOSE_HOUR matters.
+
+    closed   nights, weekends and holidays: nothing new to poll for
+    peak     PEAK_START_HOUR-PEAK_END_HOUR on business days
+    open     the rest of the acceptance hours
+
+Holidays come from a text file with one YYYY-MM-DD date per line (#
+comments allowed); edgar_holidays.txt next to this module is the default.
+"""
+
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+from zoneinfo import ZoneInfo
+
+EDGAR_TZ = ZoneInfo('America/New_York')
+EDGAR_OPEN_HOUR = 6
+EDGAR_CLOSE_HOUR = 22
+PEAK_START_HOUR = 16
+PEAK_END_HOUR = 20
+
+DEFAULT_HOLIDAYS = Path(__file__).resolve().parent / 'edgar_holidays.txt'
+
+
+def load_holidays(path: str) -> Set[date]:
+    """Dates from a holiday file, one YYYY-MM-DD per line"""
+    holidays = set()
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                holidays.add(date.fromisoformat(line))
+    return holidays
+
+
+class EdgarCalendar:
+    """Business days, acceptance hours and the post-close peak, in US Eastern time"""
+
+    def __init__(self, holidays: Iterable[date] = (), peak_start: int = PEAK_START_HOUR,
+                 peak_end: int = PEAK_END_HOUR):
+        self.holidays = frozenset(holidays)
+        # Phase boundaries of a business day, in order
+        self.edges = [(EDGAR_OPEN_HOUR, 'open'), (peak_start, 'peak'), (peak_end, 'open'), (EDGAR_CLOSE_HOUR, 'closed')]
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> 'EdgarCalendar':
+        """Calendar with the holidays in `path` (default file if present, else none)"""
+        if path is None:
+            return cls(load_holidays(DEFAULT_HOLIDAYS) if DEFAULT_HOLIDAYS.exists() else ())
+        return cls(load_holidays(path))
+
+    def is_business_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def phase(self, when: datetime) -> str:
+        """'closed', 'open' or 'peak' at `when`"""
+        local = when.astimezone(EDGAR_TZ)
+        if not self.is_business_day(local.date()):
+            return 'closed'
+
+        phase = 'closed'
+        for hour, name in self.edges:
+            if local.hour >= hour:
+                phase = name
+        return phase
+
+    def next_change(self, when: datetime) -> datetime:
+        """Start of the next phase after `when` (the next opening once closed for the day)"""
+        local = when.astimezone(EDGAR_TZ)
+        if self.is_business_day(local.date()):
+            for hour, _ in self.edges:
+                edge = local.replace(hour=hour, minute=0, second=0, microsecond=0)
+                if edge > local:
+                    return edge.astimezone(when.tzinfo)
+
+        day = local.date() + timedelta(days=1)
+        while not self.is_business_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, time(EDGAR_OPEN_HOUR), tzinfo=EDGAR_TZ).astimezone(when.tzinfo)
+
+    def next_open(self, when: datetime) -> datetime:
+        """Return `when` if EDGAR is accepting filings then, else the next opening time"""
+        return when if self.phase(when) != 'closed' else self.next_change(when)
+
+    def next_poll(self, when: datetime, intervals: Dict[str, float]) -> datetime:
+        """When to poll after `when`, given seconds between polls per open phase
+
+        A poll is never scheduled past the next phase change, so the first
+        poll of the peak, the last one at the close and the catch-up at the
+        opening happen on time whatever the interval.
+        """
+        change = self.next_change(when)
+        if self.phase(when) == 'closed':
+            return change
+        return min(when + timedelta(seconds=intervals[self.phase(when)]), change)
+
+
+_default_calendar: Optional[EdgarCalendar] = None
+
+
+def default_calendar() -> EdgarCalendar:
+    """Shared calendar with the default holiday file, loaded on first use"""
+    global _default_calendar
+    if _default_calendar is None:
+        _default_calendar = EdgarCalendar.from_file()
+    return _default_calendar
+
+
+def next_edgar_open(when: datetime) -> datetime:
+    """Return `when` if EDGAR is accepting filings then, else the next opening time"""
+    return default_calendar().next_open(when)
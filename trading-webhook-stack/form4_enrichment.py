@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Form 4 Enrichment
+Downloads and parses newly seen Form 4 filings in a bounded worker pool,
+so the monitors can alert with shares, price and value instead of counts.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+from insider_trading_fetcher import SECInsiderTrading, InsiderSignalAnalyzer
+
+
+class Form4Enricher:
+    """Bounded pool of Form 4 download + parse workers"""
+
+    # SEC allows ~10 requests per second; stay well below across all workers
+    MIN_REQUEST_SPACING = 0.15
+
+    def __init__(self, user_agent: str = "Insider Monitor (test@example.com)", max_workers: int = 4):
+        self.sec = SECInsiderTrading(user_agent=user_agent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='form4-enrich')
+        self._throttle_lock = threading.Lock()
+        self._next_request = 0.0
+
+    def _throttle(self):
+        """Space out request starts across all worker threads"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.MIN_REQUEST_SPACING
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def fetch_transactions(self, cik: str, accession_number: str) -> List[Dict]:
+        """Download and parse a single filing (runs in a worker thread)"""
+        self._throttle()
+        filing_text = self.sec.download_form4(cik, accession_number)
+
+        if not filing_text:
+            return []
+
+        return self.sec.parse_form4(filing_text)
+
+    def enrich(self, filings: List[Dict]) -> Dict[str, List[Dict]]:
+        """Fetch transactions for many filings concurrently, keyed by accession number"""
+        futures = {
+            filing['accession_number']: self.executor.submit(
+                self.fetch_transactions, filing['cik'], filing['accession_number']
+            )
+            for filing in filings
+        }
+
+        results = {}
+        for accession, future in futures.items():
+            try:
+                results[accession] = future.result()
+            except Exception as e:
+                print(f"✗ Error enriching {accession}: {e}")
+                results[accession] = []
+
+        return results
+
+    @staticmethod
+    def summarize(transactions: List[Dict]) -> Dict:
+        """Collapse a filing's transactions into webhook fields"""
+        if not transactions:
+            return {}
+
+        shares = sum(t['shares'] for t in transactions)
+        value = sum(t['total_value'] for t in transactions)
+        largest = max(transactions, key=lambda t: t['total_value'])
+
+        summary = {
+            'insider': largest['insider_name'],
+            'position': largest['position'],
+            'transaction_code': largest['transaction_code'],
+            'shares': shares,
+            'price': round(value / shares, 4) if shares else 0,
+            'value': value,
+            'transaction_count': len(transactions),
+            'signal': InsiderSignalAnalyzer.calculate_signal(largest)
+        }
+        if largest.get('stake_change_pct') is not None:
+            # Trailing-year change of the insider's stake (insider_holdings.annotate)
+            summary['stake_change_pct'] = round(largest['stake_change_pct'], 4)
+        return summary
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
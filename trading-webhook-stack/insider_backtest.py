@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Event-study backtest of InsiderSignalAnalyzer signals
+
+Every stored transaction is an event on its filing date. The position is
+entered at the first close after that date (a filing is public on the day
+it is filed, often after the close) and held for each horizon, counted in
+trading days of that ticker's price history. An event whose first close is
+more than --max-entry-days calendar days away (it predates the ticker's
+history or falls in a gap of the price data) is not priced. Results are grouped by signal,
+insider position and trade value.
+
+Entries come from one asof join: a binary search of every event's
+(ticker, date) key in the price array sorted on the same key. Exits are row
+offsets into that array, so the whole run is a handful of array operations,
+not a loop over events.
+
+Usage:
+    python insider_backtest.py --prices prices.parquet
+    python insider_backtest.py --prices prices.csv --transactions trades.csv --horizons 1,5,20,60
+    python insider_backtest.py --prices prices.csv --output events.csv
+
+Prices file: one row per ticker and day with `ticker`, `date` and `adj_close`
+(or `close`). Transactions come from insider_monitor.py's database (--db) or
+a CSV written by insider_trading_fetcher.py --details --output.
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from insider_trading_fetcher import InsiderSignalAnalyzer
+
+DEFAULT_HORIZONS = [1, 5, 20, 60]
+MAX_ENTRY_DAYS = 5  # calendar days; covers a long weekend plus a holiday
+VALUE_BINS = [0, 1e4, 1e5, 1e6, 1e7, np.inf]
+VALUE_LABELS = ['<$10k', '$10k-100k', '$100k-1M', '$1M-10M', '>$10M']
+
+# Direction a signal bets on; a hit is a forward return with the same sign
+SIGNAL_DIRECTION = {'STRONG_BUY': 1, 'BUY': 1, 'SELL': -1, 'STRONG_SELL': -1}
+
+
+def load_transactions(db_path: Optional[str] = None, csv_path: Optional[str] = None) -> pd.DataFrame:
+    """Stored transactions with their filing date"""
+    if csv_path:
+        df = pd.read_csv(csv_path)
+    else:
+        conn = sqlite3.connect(db_path)
+        df = pd.read_sql_query('''
+            SELECT t.ticker, t.accession_number, t.insider_name, t.position, t.transaction_code,
+                   t.transaction_date, f.filing_date, t.shares, t.price AS price_per_share, t.total_value
+            FROM transactions t
+            LEFT JOIN filings f ON f.ticker = t.ticker AND f.accession_number = t.accession_number
+        ''', conn)
+        conn.close()
+
+    # Fall back to the trade date for rows whose filing is not stored
+    filing_date = df['filing_date'] if 'filing_date' in df else df['transaction_date']
+    df['event_date'] = pd.to_datetime(filing_date.fillna(df['transaction_date']), errors='coerce').dt.normalize()
+    return df.dropna(subset=['event_date'])
+
+
+def load_prices(path: str) -> pd.DataFrame:
+    """Daily closes sorted by ticker and date, from CSV or Parquet"""
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        prices = pd.read_parquet(path)
+    else:
+        prices = pd.read_csv(path)
+
+    prices.columns = [column.lower() for column in prices.columns]
+    close = 'adj_close' if 'adj_close' in prices else 'close'
+    prices = pd.DataFrame({
+        'ticker': prices['ticker'].astype(str).str.upper(),
+        'date': pd.to_datetime(prices['date']).dt.normalize(),
+        'close': prices[close].astype(float)
+    })
+    prices = prices[prices['close'] > 0]
+    return prices.sort_values(['ticker', 'date'], ignore_index=True)
+
+
+def event_returns(events: pd.DataFrame, prices: pd.DataFrame, horizons: List[int],
+                  max_entry_days: int = MAX_ENTRY_DAYS) -> pd.DataFrame:
+    """Add entry_date, entry_gap_days plus ret_<h>d and hit_<h>d columns for every horizon
+
+    `prices` must be sorted by ticker and date, as load_prices returns it.
+    entry_gap_days is the distance to the ticker's next close (NaN if there
+    is none); events with a gap over `max_entry_days` get no entry.
+    """
+    events = events.copy()
+    events['ticker'] = events['ticker'].astype(str).str.upper()
+    if 'signal' not in events:
+        events['signal'] = InsiderSignalAnalyzer.calculate_signals(events)
+    events['position_bucket'] = InsiderSignalAnalyzer.position_roles(events['position'])
+    events['value_bucket'] = pd.cut(events['total_value'].fillna(0), VALUE_BINS,
+                                    labels=VALUE_LABELS, include_lowest=True)
+
+    # (ticker, day) as one int64 key; the price array is already sorted on it
+    tickers = pd.Categorical(prices['ticker'])
+    price_code = tickers.codes.astype(np.int64)
+    price_day = prices['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    price_key = (price_code << 32) + price_day
+    last_row = np.searchsorted(price_code, np.arange(len(tickers.categories)), side='right') - 1
+
+    code = tickers.categories.get_indexer(events['ticker']).astype(np.int64)
+    day = events['event_date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    # Asof join: entry is the first trading day strictly after the event date
+    row = np.searchsorted(price_key, (code << 32) + day, side='right')
+    row = np.minimum(row, len(prices) - 1)
+    later = (code >= 0) & (price_code[row] == code) & (price_day[row] > day)
+    gap = price_day[row] - day
+    events['entry_gap_days'] = np.where(later, gap, np.nan)
+    matched = later & (gap <= max_entry_days)
+    end = np.where(matched, last_row[code], -1)
+
+    events['entry_date'] = prices['date'].to_numpy()[row]
+    events.loc[~matched, 'entry_date'] = pd.NaT
+
+    close = prices['close'].to_numpy()
+    direction = events['signal'].map(SIGNAL_DIRECTION).to_numpy(dtype=float)
+
+    for horizon in horizons:
+        exit_row = row + horizon
+        valid = matched & (exit_row <= end)
+        ret = np.full(len(events), np.nan)
+        ret[valid] = close[exit_row[valid]] / close[row[valid]] - 1
+        events[f'ret_{horizon}d'] = ret
+
+        # NaN (not a miss) for NEUTRAL signals and events without a full horizon
+        hit = np.where(ret * direction > 0, 1.0, 0.0)
+        hit[np.isnan(ret) | np.isnan(direction)] = np.nan
+        events[f'hit_{horizon}d'] = hit
+
+    return events
+
+
+def summarize(entries: pd.DataFrame, by: str, horizons: List[int]) -> pd.DataFrame:
+    """Event count, mean/median return and hit rate per group and horizon"""
+    columns = {'events': ('ticker', 'size')}
+    for horizon in horizons:
+        columns[f'mean_{horizon}d'] = (f'ret_{horizon}d', 'mean')
+        columns[f'median_{horizon}d'] = (f'ret_{horizon}d', 'median')
+        columns[f'hit_{horizon}d'] = (f'hit_{horizon}d', 'mean')
+    return entries.groupby(by, observed=True).agg(**columns)
+
+
+def print_summary(title: str, summary: pd.DataFrame):
+    print(f"\n{title}")
+    print("-" * len(title))
+    formatters = {column: '{:7.2%}'.format for column in summary.columns if column != 'events'}
+    print(summary.to_string(formatters=formatters, na_rep='-'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest insider trading signals against daily prices')
+    parser.add_argument('--prices', required=True, help='Daily prices CSV/Parquet (ticker, date, adj_close or close)')
+    parser.add_argument('--db', default='insider_monitor.db', help='insider_monitor.py database with transactions')
+    parser.add_argument('--transactions', type=str, help='Use a transactions CSV instead of --db')
+    parser.add_argument('--horizons', type=str, default=','.join(map(str, DEFAULT_HORIZONS)),
+                        help='Comma-separated holding periods in trading days (default: 1,5,20,60)')
+    parser.add_argument('--max-entry-days', type=int, default=MAX_ENTRY_DAYS,
+                        help='Skip events with no close within N calendar days after them (default: 5)')
+    parser.add_argument('--output', type=str, help='Write every event with its returns to this CSV')
+
+    args = parser.parse_args()
+    horizons = sorted({int(h) for h in args.horizons.split(',')})
+
+    start = time.perf_counter()
+    events = load_transactions(db_path=args.db, csv_path=args.transactions)
+    prices = load_prices(args.prices)
+    print(f"📂 {len(events):,} transactions, {len(prices):,} price rows "
+          f"({prices['ticker'].nunique():,} tickers) loaded in {time.perf_counter() - start:.1f}s")
+
+    if events.empty or prices.empty:
+        print("❌ Nothing to backtest")
+        return
+
+    start = time.perf_counter()
+    entries = event_returns(events, prices, horizons, max_entry_days=args.max_entry_days)
+    priced = entries['entry_date'].notna().sum()
+    print(f"📈 {priced:,} of {len(entries):,} events priced in {time.perf_counter() - start:.2f}s")
+
+    stale = (entries['entry_gap_days'] > args.max_entry_days).sum()
+    if stale:
+        print(f"⚠️  {stale:,} events dropped: next close more than {args.max_entry_days} days later "
+              f"(before the price history or in a gap)")
+
+    print_summary('By signal', summarize(entries, 'signal', horizons))
+    print_summary('By position', summarize(entries, 'position_bucket', horizons))
+    print_summary('By value', summarize(entries, 'value_bucket', horizons))
+
+    if args.output:
+        entries.to_csv(args.output, index=False)
+        print(f"\n💾 Events saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+In-process response cache and request coalescing for SEC lookups
+
+Tickers that share a CIK (GOOGL/GOOG, BRK.A/BRK.B) and concurrent tasks
+asking for the same document would otherwise fetch and parse the same URL
+more than once.
+
+    TTLCache            small LRU of parsed responses, entries expire after `ttl`
+    AsyncSingleFlight   concurrent callers of the same key await one in-flight fetch
+
+Cached values are shared between callers; treat them as read-only.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from insider_metrics import SEC_CACHE
+
+SUBMISSIONS_CACHE_SIZE = 256
+SUBMISSIONS_CACHE_TTL = 300  # seconds; new filings show up on the next fetch after this
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int = SUBMISSIONS_CACHE_SIZE, ttl: float = SUBMISSIONS_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None if missing or expired"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class AsyncSingleFlight:
+    """Share one in-flight coroutine between concurrent callers of the same key"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def pending(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fetch() once per key at a time; later callers get the same result or exception"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            SEC_CACHE.labels(result='shared').inc()
+
+        # One caller being cancelled must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved if every waiter was cancelled
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Per-insider holdings timeline, keyed by (issuer CIK, owner)
+
+Every parsed Form 4 transaction is stored with its signed share change and
+the `shares_owned_after` the filing reports. The table's primary key is
+(issuer_cik, owner, transaction_date, ...) on a WITHOUT ROWID table, so one
+insider's history at one company is stored contiguously and any window is
+a single range scan of the key.
+
+    owner   reporting owner CIK, or the name when the filing has none
+
+Holdings before the first transaction in a window are its
+shares_owned_after minus its own change, so a window never needs earlier
+rows. Holdings are as reported on Form 4 (direct and indirect lines are
+not told apart).
+
+Usage:
+    python insider_holdings.py --ticker AAPL
+    python insider_holdings.py --ticker AAPL --owner 0001214156 --days 365
+"""
+
+import argparse
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+# Codes that reduce holdings when a filing has no acquired/disposed flag
+DISPOSITION_CODES = {'S', 'D', 'F', 'G'}
+
+
+def init_table(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS holdings (
+            issuer_cik TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            transaction_date TEXT NOT NULL,
+            accession_number TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            ticker TEXT,
+            owner_name TEXT,
+            position TEXT,
+            transaction_code TEXT,
+            shares_delta REAL,
+            shares_owned_after REAL,
+            price REAL,
+            PRIMARY KEY (issuer_cik, owner, transaction_date, accession_number, seq)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_holdings_ticker ON holdings(ticker)')
+
+
+def owner_key(transaction: Dict) -> str:
+    return transaction.get('insider_cik') or transaction.get('insider_name') or 'Unknown'
+
+
+def normalize_cik(value: str) -> str:
+    """Zero-padded 10-digit CIK as the store keys it; non-numeric values unchanged"""
+    value = value.strip()
+    return str(int(value)).zfill(10) if value.isdigit() else value
+
+
+def shares_delta(transaction: Dict) -> float:
+    """Signed share change: acquired > 0, disposed < 0"""
+    flag = transaction.get('acquired_disposed')
+    disposed = flag == 'D' if flag else transaction.get('transaction_code') in DISPOSITION_CODES
+    return -transaction['shares'] if disposed else transaction['shares']
+
+
+def record(conn: sqlite3.Connection, issuer_cik: str, ticker: str,
+           transactions_by_filing: Dict[str, List[Dict]]) -> int:
+    """Add parsed transactions (parse_form4 dicts) to the timeline; returns rows written"""
+    rows = [
+        (issuer_cik, owner_key(t), t['transaction_date'], accession, seq, ticker,
+         t['insider_name'], t['position'], t['transaction_code'], shares_delta(t),
+         t['shares_owned_after'], t['price_per_share'])
+        for accession, transactions in transactions_by_filing.items()
+        for seq, t in enumerate(transactions)
+        if t.get('transaction_date')
+    ]
+    conn.executemany('''
+        INSERT OR REPLACE INTO holdings
+        (issuer_cik, owner, transaction_date, accession_number, seq, ticker,
+         owner_name, position, transaction_code, shares_delta, shares_owned_after, price)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+
+def stake(conn: sqlite3.Connection, issuer_cik: str, owner: str, start: str, end: str) -> Dict:
+    """Holdings, net flow and percent of holdings traded between two dates (inclusive)"""
+    rows = conn.execute('''
+        SELECT shares_delta, shares_owned_after FROM holdings
+        WHERE issuer_cik = ? AND owner = ? AND transaction_date BETWEEN ? AND ?
+        ORDER BY transaction_date, accession_number, seq
+    ''', (issuer_cik, owner, start, end)).fetchall()
+
+    if rows:
+        holdings_start = rows[0][1] - rows[0][0]
+        holdings_end = rows[-1][1]
+    else:
+        # No trades in the window: holdings are whatever the last earlier filing left
+        before = conn.execute('''
+            SELECT shares_owned_after FROM holdings
+            WHERE issuer_cik = ? AND owner = ? AND transaction_date < ?
+            ORDER BY transaction_date DESC, accession_number DESC, seq DESC
+            LIMIT 1
+        ''', (issuer_cik, owner, start)).fetchone()
+        holdings_start = holdings_end = before[0] if before else None
+
+    bought = sum(delta for delta, _ in rows if delta > 0)
+    sold = -sum(delta for delta, _ in rows if delta < 0)
+
+    def pct(shares: float) -> Optional[float]:
+        return shares / holdings_start if holdings_start else None
+
+    return {
+        'transactions': len(rows),
+        'holdings_start': holdings_start,
+        'holdings_end': holdings_end,
+        'bought': bought,
+        'sold': sold,
+        'net_shares': bought - sold,
+        'pct_bought': pct(bought),
+        'pct_sold': pct(sold),
+        'stake_change_pct': pct(holdings_end - holdings_start) if holdings_end is not None else None
+    }
+
+
+def annotate(conn: sqlite3.Connection, issuer_cik: str, transactions: List[Dict], window_days: int = 365):
+    """Set stake_change_pct and net_shares_window on each transaction, for the signal scorer
+
+    The window ends at the transaction's date, so record() must have stored
+    it first.
+    """
+    for transaction in transactions:
+        end = transaction.get('transaction_date')
+        if not end:
+            continue
+        start = (date.fromisoformat(end[:10]) - timedelta(days=window_days)).isoformat()
+        result = stake(conn, issuer_cik, owner_key(transaction), start, end)
+        transaction['stake_change_pct'] = result['stake_change_pct']
+        transaction['net_shares_window'] = result['net_shares']
+
+
+def owners(conn: sqlite3.Connection, issuer_cik: str) -> List[tuple]:
+    """(owner, name, latest position, last date, shares owned) for every insider of an issuer"""
+    return conn.execute('''
+        SELECT owner, owner_name, position, transaction_date, shares_owned_after
+        FROM holdings h
+        WHERE issuer_cik = ? AND transaction_date = (
+            SELECT MAX(transaction_date) FROM holdings
+            WHERE issuer_cik = h.issuer_cik AND owner = h.owner
+        )
+        GROUP BY owner
+        ORDER BY shares_owned_after DESC
+    ''', (issuer_cik,)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query insider holdings timelines')
+    parser.add_argument('--db', default='insider_monitor.db', help='insider_monitor.py database')
+    parser.add_argument('--ticker', type=str, help='Issuer ticker')
+    parser.add_argument('--cik', type=str, help='Issuer CIK (instead of --ticker)')
+    parser.add_argument('--owner', type=str, help='Reporting owner CIK or name; omit to list insiders')
+    parser.add_argument('--days', type=int, default=365, help='Window ending today (default: 365)')
+
+    args = parser.parse_args()
+    if not args.ticker and not args.cik:
+        parser.error('Either --ticker or --cik must be specified')
+
+    conn = sqlite3.connect(args.db)
+    init_table(conn)
+
+    issuer_cik = normalize_cik(args.cik) if args.cik else None
+    if not issuer_cik:
+        row = conn.execute('SELECT issuer_cik FROM holdings WHERE ticker = ? LIMIT 1',
+                           (args.ticker.upper(),)).fetchone()
+        if not row:
+            print(f"❌ No holdings stored for {args.ticker.upper()}")
+            return
+        issuer_cik = row[0]
+
+    if not args.owner:
+        rows = owners(conn, issuer_cik)
+        if not rows:
+            print(f"❌ No holdings stored for {args.ticker.upper() if args.ticker else issuer_cik}")
+            return
+
+        print(f"\n👥 Insiders of {args.ticker or issuer_cik}:")
+        for owner, name, position, last_date, shares in rows:
+            print(f"   {name:<30} {str(position):<25} {shares:>15,.0f} shares  (as of {last_date}, {owner})")
+        return
+
+    owner = normalize_cik(args.owner)
+    if not conn.execute('SELECT 1 FROM holdings WHERE issuer_cik = ? AND owner = ? LIMIT 1',
+                        (issuer_cik, owner)).fetchone():
+        row = conn.execute('SELECT owner FROM holdings WHERE issuer_cik = ? AND owner_name LIKE ? LIMIT 1',
+                           (issuer_cik, f'%{owner}%')).fetchone()
+        owner = row[0] if row else owner
+
+    end = date.today().isoformat()
+    start = (date.today() - timedelta(days=args.days)).isoformat()
+    result = stake(conn, issuer_cik, owner, start, end)
+    conn.close()
+
+    def pct(value: Optional[float]) -> str:
+        return f"{value:.1%}" if value is not None else '-'
+
+    print(f"\n📈 {owner} at {args.ticker or issuer_cik}, {start} to {end}:")
+    print(f"   Transactions: {result['transactions']}")
+    if result['holdings_start'] is None:
+        print("   No holdings recorded")
+        return
+    print(f"   Holdings:     {result['holdings_start']:,.0f} -> {result['holdings_end']:,.0f} "
+          f"({pct(result['stake_change_pct'])})")
+    print(f"   Bought:       {result['bought']:,.0f} ({pct(result['pct_bought'])} of starting stake)")
+    print(f"   Sold:         {result['sold']:,.0f} ({pct(result['pct_sold'])} of starting stake)")
+    print(f"   Net flow:     {result['net_shares']:+,.0f} shares")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the insider trading tools
+
+Counters, gauges and fixed-bucket latency histograms kept in one registry.
+Recording is a lock and a bisect, cheap enough for the hot paths. The
+long-running monitors serve the registry in Prometheus text format on
+/metrics; the one-shot CLIs write it as a JSON summary when they finish.
+
+Usage:
+    from insider_metrics import REGISTRY, PARSE_FORM4_SECONDS, sec_request
+
+    with PARSE_FORM4_SECONDS.time():
+        ...
+    with sec_request(url) as call:
+        response = requests.get(url)
+        call.status = response.status_code
+
+    REGISTRY.start_http_server(9108)      # monitors
+    REGISTRY.write_json('metrics.json')   # one-shot runs
+
+Filing-to-alert latency: alerts carry accepted_at (EDGAR acceptance),
+first_seen_at (our poll), persisted_at (saved to SQLite) and sent_at; the
+monitors record those plus delivered_at per filing and summarise the
+stages with latency_summary().
+"""
+
+import bisect
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from edgar_calendar import EDGAR_TZ  # EDGAR timestamps without an offset are US Eastern
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a sub-millisecond SQLite write up to a slow SEC response
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Seconds from EDGAR acceptance to delivery: a fast poll up to a next-day catch-up
+ALERT_LATENCY_BUCKETS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, 21600, 86400)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return '{' + body + '}'
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from `function` at collection time (e.g. a queue's qsize)"""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is None:
+            return self._value
+        try:
+            return float(self._function())
+        except Exception:
+            return float('nan')
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower  # +Inf bucket: the best we can say is "above the last bound"
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class _Metric:
+    """A named metric with zero or more label dimensions"""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        return self.labels()
+
+    def children(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in sorted(items)]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._unlabelled().set_function(function)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+
+class MetricsRegistry:
+    """All metrics of one process, renderable as Prometheus text or JSON"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.started = time.time()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self.metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"Metric {metric.name} already registered as a {existing.kind}")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        """Text exposition format 0.0.4"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+
+            for labels, child in metric.children():
+                if metric.kind != 'histogram':
+                    lines.append(f'{metric.name}{_format_labels(labels)} {child.value:g}')
+                    continue
+
+                cumulative = 0
+                for bound, n in zip(metric.buckets + (float('inf'),), child.counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'{metric.name}_bucket{_format_labels({**labels, "le": le})} {cumulative}')
+                lines.append(f'{metric.name}_sum{_format_labels(labels)} {child.sum:g}')
+                lines.append(f'{metric.name}_count{_format_labels(labels)} {child.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly summary; histograms report count, sum, mean and p50/p95/p99"""
+        summary = {
+            'generated_at': datetime.now().isoformat(),
+            'uptime_seconds': round(time.time() - self.started, 3),
+            'metrics': {}
+        }
+
+        for metric in self.metrics.values():
+            samples = []
+            for labels, child in metric.children():
+                if metric.kind != 'histogram':
+                    samples.append({'labels': labels, 'value': child.value})
+                    continue
+                samples.append({
+                    'labels': labels,
+                    'count': child.count,
+                    'sum': round(child.sum, 6),
+                    'mean': round(child.sum / child.count, 6) if child.count else 0.0,
+                    'p50': round(child.quantile(0.50), 6),
+                    'p95': round(child.quantile(0.95), 6),
+                    'p99': round(child.quantile(0.99), 6)
+                })
+            if samples:
+                summary['metrics'][metric.name] = {'type': metric.kind, 'help': metric.documentation,
+                                                   'samples': samples}
+
+        return summary
+
+    def write_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def start_http_server(self, port: int, host: str = '127.0.0.1') -> Optional[ThreadingHTTPServer]:
+        """Serve /metrics from a daemon thread; returns None if the port is taken"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood the console
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint disabled, cannot bind {host}:{port}: {e}")
+            return None
+
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+        return self._server
+
+
+REGISTRY = MetricsRegistry()
+
+SEC_REQUESTS = REGISTRY.counter(
+    'insider_sec_requests_total', 'SEC HTTP requests by host and status (error = no response)', ('host', 'status'))
+SEC_REQUEST_SECONDS = REGISTRY.histogram(
+    'insider_sec_request_seconds', 'SEC request latency including the response body', ('host',))
+PARSE_FORM4_SECONDS = REGISTRY.histogram(
+    'insider_parse_form4_seconds', 'Time spent parsing one Form 4 filing')
+ROWS_SCORED = REGISTRY.counter(
+    'insider_rows_scored_total', 'Transactions scored by the signal analyzer')
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    'insider_db_write_seconds', 'SQLite write transaction latency', ('op',))
+WEBHOOK_DELIVERIES = REGISTRY.counter(
+    'insider_webhook_deliveries_total', 'Webhook POSTs by outcome (ok, http_error, error)', ('outcome',))
+WEBHOOK_SECONDS = REGISTRY.histogram(
+    'insider_webhook_delivery_seconds', 'Webhook POST latency')
+QUEUE_DEPTH = REGISTRY.gauge(
+    'insider_queue_depth', 'Items waiting in an internal queue', ('queue',))
+SEC_CACHE = REGISTRY.counter(
+    'insider_sec_cache_total', 'SEC lookups by cache result (hit, miss, shared = joined an in-flight request)', ('result',))
+FILING_TO_ALERT_SECONDS = REGISTRY.histogram(
+    'insider_filing_to_alert_seconds', 'EDGAR acceptance to webhook delivery', buckets=ALERT_LATENCY_BUCKETS)
+
+
+class _RequestCall:
+    status = 'error'
+
+
+@contextmanager
+def sec_request(url: str):
+    """Count and time one SEC request; set .status on the yielded object once a response arrives"""
+    call = _RequestCall()
+    host = urlsplit(url).hostname or 'unknown'
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        SEC_REQUEST_SECONDS.labels(host=host).observe(time.perf_counter() - start)
+        SEC_REQUESTS.labels(host=host, status=call.status).inc()
+
+
+@contextmanager
+def webhook_delivery():
+    """Count and time one webhook POST; set .status on the yielded object"""
+    call = _RequestCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        WEBHOOK_SECONDS.observe(time.perf_counter() - start)
+        if call.status == 'error':
+            outcome = 'error'
+        else:
+            outcome = 'ok' if 200 <= int(call.status) < 300 else 'http_error'
+        WEBHOOK_DELIVERIES.labels(outcome=outcome).inc()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_timestamp(text: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an ISO 8601 timestamp (feed `updated`, acceptanceDateTime, alert fields)"""
+    if not text:
+        return None
+    try:
+        when = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=EDGAR_TZ)
+    return when.timestamp()
+
+
+def format_timestamp(epoch: Optional[float]) -> Optional[str]:
+    """UTC ISO 8601 with milliseconds for alert payloads"""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec='milliseconds')
+
+
+def observe_alert_latency(accepted_at: Optional[float], delivered_at: Optional[float]):
+    if accepted_at is not None and delivered_at is not None:
+        FILING_TO_ALERT_SECONDS.observe(max(delivered_at - accepted_at, 0.0))
+
+
+def latency_summary(rows: Iterable[Tuple[Optional[float], ...]]) -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99 per stage from (accepted_at, first_seen_at, persisted_at, delivered_at) rows
+
+    Stages: detect (acceptance -> first poll that saw it), persist, deliver,
+    and end_to_end (acceptance -> delivery). Missing timestamps skip a stage.
+    """
+    stages = {
+        'detect': (0, 1),
+        'persist': (1, 2),
+        'deliver': (2, 3),
+        'end_to_end': (0, 3)
+    }
+    durations: Dict[str, List[float]] = {name: [] for name in stages}
+    for row in rows:
+        for name, (start, end) in stages.items():
+            if row[start] is not None and row[end] is not None:
+                durations[name].append(max(row[end] - row[start], 0.0))
+
+    return {
+        name: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99)
+        }
+        for name, values in durations.items()
+    }
@@ -8,19 +8,186 @@ import requests
 import json
 import sqlite3
 import argparse
+import heapq
+import math
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
+
+import insider_holdings
+from edgar_calendar import EDGAR_TZ, next_edgar_open
+from form4_enrichment import Form4Enricher
+from insider_metrics import (
+    REGISTRY, DB_WRITE_SECONDS, QUEUE_DEPTH, format_timestamp, latency_summary, observe_alert_latency,
+    parse_timestamp, sec_request, webhook_delivery
+)
+from insider_profiling import Profiler
 
 # Configuration
 WEBHOOK_URL = "http://localhost:3000/webhook/insider-trading"
 SEC_BASE_URL = "https://www.sec.gov"
 
+
+class PollScheduler:
+    """Priority-queue scheduler with adaptive per-ticker poll intervals
+
+    Each ticker gets a weight from its Form 4 filing rate over the last year
+    plus a decaying boost for recently seen new filings. The global request
+    budget is shared in proportion to sqrt(weight), which minimises the
+    expected detection delay across the watchlist for a fixed request rate.
+    Poll times falling outside EDGAR acceptance hours (edgar_calendar.py,
+    holidays included) move to the next opening.
+    """
+
+    HISTORY_DAYS = 365
+    ACTIVITY_HALF_LIFE = 3 * 86400  # seconds
+    MIN_WEIGHT = 0.01  # filings/day floor so dormant tickers are still polled
+
+    def __init__(self, tickers: List[str], budget_per_hour: float = 600,
+                 min_interval: float = 300, max_interval: float = 86400):
+        self.budget_per_hour = budget_per_hour
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self.filing_rate: Dict[str, float] = {}
+        self.activity: Dict[str, Tuple[float, float]] = {}  # ticker -> (score, as_of)
+        self.weights: Dict[str, float] = {}
+        self.total_sqrt_weight = 0.0
+
+        # Everything is due immediately; the budget spacing staggers the first pass
+        now = time.time()
+        self.queue: List[Tuple[float, str]] = []
+        for ticker in dict.fromkeys(tickers):
+            self._set_weight(ticker, self.MIN_WEIGHT)
+            heapq.heappush(self.queue, (now, ticker))
+
+    @property
+    def request_spacing(self) -> float:
+        """Minimum seconds between two polls under the global budget"""
+        return 3600.0 / self.budget_per_hour
+
+    def _set_weight(self, ticker: str, weight: float):
+        self.total_sqrt_weight -= math.sqrt(self.weights.get(ticker, 0.0))
+        self.weights[ticker] = weight
+        self.total_sqrt_weight += math.sqrt(weight)
+
+    def _activity_score(self, ticker: str, now: float) -> float:
+        score, as_of = self.activity.get(ticker, (0.0, now))
+        return score * 0.5 ** ((now - as_of) / self.ACTIVITY_HALF_LIFE)
+
+    def pop_due(self) -> Tuple[float, str]:
+        """Remove and return the (due_time, ticker) polled next"""
+        return heapq.heappop(self.queue)
+
+    def interval_for(self, ticker: str) -> float:
+        """Seconds until the ticker's next poll under the current weights"""
+        share = math.sqrt(self.weights[ticker]) / self.total_sqrt_weight
+        interval = 3600.0 / (self.budget_per_hour * share)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def record_poll(self, ticker: str, filing_dates: List[str], new_filings: int,
+                    now: Optional[float] = None) -> float:
+        """Update the ticker's weight from a poll result and schedule it again"""
+        now = now if now is not None else time.time()
+
+        cutoff = (datetime.now() - timedelta(days=self.HISTORY_DAYS)).strftime('%Y-%m-%d')
+        recent = sum(1 for d in filing_dates if d >= cutoff)
+        self.filing_rate[ticker] = recent / self.HISTORY_DAYS
+
+        activity = self._activity_score(ticker, now) + new_filings
+        self.activity[ticker] = (activity, now)
+
+        self._set_weight(ticker, max(self.filing_rate[ticker] + activity, self.MIN_WEIGHT))
+
+        due = datetime.fromtimestamp(now + self.interval_for(ticker), tz=EDGAR_TZ)
+        due_at = next_edgar_open(due).timestamp()
+        heapq.heappush(self.queue, (due_at, ticker))
+        return due_at
+
+
+class AlertBatcher:
+    """Coalesce webhook alerts into a single array payload
+
+    A batch is sent when it holds max_size alerts or when its oldest alert
+    has waited max_wait seconds. The age check runs on every add() and on
+    maybe_flush(), which the monitor calls after each ticker.
+    """
+
+    def __init__(self, webhook_url: str, max_size: int = 50, max_wait: float = 5.0,
+                 on_sent: Optional[Callable[[List[Dict], float, Optional[float]], None]] = None):
+        self.webhook_url = webhook_url
+        self.max_size = max_size
+        self.max_wait = max_wait
+        # on_sent(alerts, sent_at, delivered_at or None) after every POST
+        self.on_sent = on_sent
+        self.pending: List[Dict] = []
+        self.oldest: Optional[float] = None
+
+    def add(self, alert: Dict):
+        """Queue an alert and flush if a limit is reached"""
+        if not self.pending:
+            self.oldest = time.monotonic()
+        self.pending.append(alert)
+
+        if len(self.pending) >= self.max_size:
+            self.flush()
+        else:
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        """Flush if the oldest queued alert has waited long enough"""
+        if self.pending and time.monotonic() - self.oldest >= self.max_wait:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Send all queued alerts as one batch payload"""
+        if not self.pending:
+            return False
+
+        alerts, self.pending = self.pending, []
+        self.oldest = None
+        sent_at = time.time()
+        for alert in alerts:
+            alert['sent_at'] = format_timestamp(sent_at)
+        payload = {
+            'type': 'insider_trading_batch',
+            'count': len(alerts),
+            'alerts': alerts,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        delivered = False
+        try:
+            with webhook_delivery() as call:
+                response = requests.post(self.webhook_url, json=payload, timeout=10)
+                call.status = response.status_code
+            if response.status_code == 200:
+                print(f"✅ Batch webhook sent ({len(alerts)} alerts)")
+                delivered = True
+        except Exception as e:
+            print(f"⚠️  Webhook error: {e}")
+
+        if self.on_sent:
+            self.on_sent(alerts, sent_at, time.time() if delivered else None)
+        return delivered
+
+
 class InsiderMonitor:
     """Simplified SEC Form 4 monitor"""
 
-    def __init__(self, db_path='insider_monitor.db'):
+    def __init__(self, db_path='insider_monitor.db', batch_size: int = 0, batch_wait: float = 5.0,
+                 enrich_workers: int = 0):
         self.db_path = db_path
         self.ticker_to_cik = {}
+        self.form4_history: Dict[str, List[str]] = {}  # ticker -> all recent Form 4 dates
+        # Optional alert coalescing (batch_size <= 1 sends one POST per ticker)
+        self.batcher = None
+        if batch_size > 1:
+            self.batcher = AlertBatcher(WEBHOOK_URL, batch_size, batch_wait, on_sent=self.record_delivery)
+        # Optional transaction enrichment of newly seen filings
+        self.enricher = Form4Enricher(max_workers=enrich_workers) if enrich_workers > 0 else None
+        if self.batcher:
+            QUEUE_DEPTH.labels(queue='alert_batch').set_function(lambda: len(self.batcher.pending))
         self.init_database()
         self.load_tickers()
 
@@ -44,6 +211,35 @@ class InsiderMonitor:
             )
         ''')
 
+        # Alert latency per filing (epoch seconds): EDGAR acceptance -> first seen -> saved -> delivered
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(filings)')}
+        for column in ('accepted_at', 'first_seen_at', 'persisted_at', 'sent_at', 'delivered_at'):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE filings ADD COLUMN {column} REAL')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_filings_delivered_at ON filings(delivered_at)')
+
+        # Parsed transactions (filled by the enrichment stage)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT,
+                accession_number TEXT,
+                insider_name TEXT,
+                position TEXT,
+                transaction_code TEXT,
+                transaction_date TEXT,
+                shares REAL,
+                price REAL,
+                total_value REAL,
+                shares_owned_after REAL,
+                UNIQUE(accession_number, insider_name, transaction_date, transaction_code, shares)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)')
+
+        # Holdings timeline per (issuer CIK, insider), for stake-change queries
+        insider_holdings.init_table(conn)
+
         # Watchlist table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS watchlist (
@@ -63,10 +259,12 @@ class InsiderMonitor:
         url = f"{SEC_BASE_URL}/files/company_tickers.json"
 
         try:
-            response = requests.get(url, headers={
-                'User-Agent': 'Insider Monitor (test@example.com)',
-                'Accept': 'application/json'
-            })
+            with sec_request(url) as call:
+                response = requests.get(url, headers={
+                    'User-Agent': 'Insider Monitor (test@example.com)',
+                    'Accept': 'application/json'
+                })
+                call.status = response.status_code
             response.raise_for_status()
             data = response.json()
 
@@ -94,17 +292,24 @@ class InsiderMonitor:
         url = f"https://data.sec.gov/submissions/CIK{cik}.json"
 
         try:
-            response = requests.get(url, headers={
-                'User-Agent': 'Insider Monitor (test@example.com)',
-                'Accept': 'application/json'
-            })
+            with sec_request(url) as call:
+                response = requests.get(url, headers={
+                    'User-Agent': 'Insider Monitor (test@example.com)',
+                    'Accept': 'application/json'
+                })
+                call.status = response.status_code
             response.raise_for_status()
             data = response.json()
+            first_seen_at = time.time()
 
             filings = data['filings']['recent']
+            acceptance = filings.get('acceptanceDateTime', [])
             cutoff_date = datetime.now() - timedelta(days=days_back)
 
             form4_filings = []
+            self.form4_history[ticker] = [
+                filings['filingDate'][i] for i in range(len(filings['form'])) if filings['form'][i] == '4'
+            ]
             for i in range(len(filings['form'])):
                 if filings['form'][i] == '4':
                     filing_date = datetime.strptime(filings['filingDate'][i], '%Y-%m-%d')
@@ -113,7 +318,9 @@ class InsiderMonitor:
                             'ticker': ticker,
                             'cik': cik,
                             'accession_number': filings['accessionNumber'][i],
-                            'filing_date': filings['filingDate'][i]
+                            'filing_date': filings['filingDate'][i],
+                            'accepted_at': parse_timestamp(acceptance[i] if i < len(acceptance) else None),
+                            'first_seen_at': first_seen_at
                         })
 
             return form4_filings
@@ -122,27 +329,75 @@ class InsiderMonitor:
             print(f"❌ Error fetching filings: {e}")
             return []
 
-    def save_filings(self, ticker: str, filings: List[Dict]):
-        """Save filings to database"""
+    def save_filings(self, ticker: str, filings: List[Dict]) -> List[Dict]:
+        """Save filings to database, returning the ones not seen before"""
+        with DB_WRITE_SECONDS.labels(op='save_filings').time():
+            return self._save_filings(ticker, filings)
+
+    def _save_filings(self, ticker: str, filings: List[Dict]) -> List[Dict]:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        new_count = 0
+        # A ticker's first poll is a backlog, not a measure of alert latency:
+        # its filings are stored without an acceptance time
+        cursor.execute('SELECT 1 FROM filings WHERE ticker = ? LIMIT 1', (ticker,))
+        backfill = cursor.fetchone() is None
+
+        new_filings = []
         for filing in filings:
             try:
                 cursor.execute('''
-                    INSERT INTO filings (ticker, cik, accession_number, filing_date, form)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (ticker, filing['cik'], filing['accession_number'], filing['filing_date'], '4'))
-                new_count += 1
+                    INSERT INTO filings (ticker, cik, accession_number, filing_date, form, accepted_at, first_seen_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (ticker, filing['cik'], filing['accession_number'], filing['filing_date'], '4',
+                      None if backfill else filing.get('accepted_at'), filing.get('first_seen_at')))
+                new_filings.append(filing)
             except sqlite3.IntegrityError:
                 pass  # Already exists
 
         conn.commit()
         conn.close()
-        return new_count
 
-    def send_webhook(self, ticker: str, filing_count: int, latest_date: str):
+        persisted_at = time.time()
+        for filing in new_filings:
+            filing['persisted_at'] = persisted_at
+            filing['backfill'] = backfill
+        return new_filings
+
+    def save_transactions(self, ticker: str, transactions_by_filing: Dict[str, List[Dict]],
+                          issuer_cik: Optional[str] = None) -> int:
+        """Write parsed transactions for many filings in one transaction
+
+        With the issuer CIK they also go into the holdings timeline, and each
+        transaction gets its trailing-year stake change for the scorer.
+        """
+        rows = [
+            (ticker, accession, t['insider_name'], t['position'], t['transaction_code'],
+             t['transaction_date'], t['shares'], t['price_per_share'], t['total_value'],
+             t['shares_owned_after'])
+            for accession, transactions in transactions_by_filing.items()
+            for t in transactions
+        ]
+        if not rows:
+            return 0
+
+        conn = sqlite3.connect(self.db_path)
+        with DB_WRITE_SECONDS.labels(op='save_transactions').time(), conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO transactions
+                (ticker, accession_number, insider_name, position, transaction_code,
+                 transaction_date, shares, price, total_value, shares_owned_after)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            if issuer_cik:
+                insider_holdings.record(conn, issuer_cik, ticker, transactions_by_filing)
+                for transactions in transactions_by_filing.values():
+                    insider_holdings.annotate(conn, issuer_cik, transactions)
+        conn.close()
+        return len(rows)
+
+    def send_webhook(self, ticker: str, filing_count: int, latest_date: str,
+                     details: Optional[Dict] = None, new_filings: Optional[List[Dict]] = None):
         """Send alert to webhook"""
         payload = {
             'type': 'insider_trading',
@@ -151,38 +406,118 @@ class InsiderMonitor:
             'filing_count': filing_count,
             'latest_filing': latest_date
         }
+        if new_filings:
+            # Timestamps of the newest filing; every accession's own are kept in the database
+            newest = max(new_filings, key=lambda f: f.get('accepted_at') or 0)
+            payload.update({
+                'accession_numbers': [f['accession_number'] for f in new_filings],
+                'accepted_at': format_timestamp(newest.get('accepted_at')),
+                'first_seen_at': format_timestamp(newest.get('first_seen_at')),
+                'persisted_at': format_timestamp(newest.get('persisted_at')),
+                'backfill': newest.get('backfill', False)
+            })
+        if details:
+            payload.update(details)
+
+        if self.batcher:
+            self.batcher.add(payload)
+            return True
 
+        sent_at = time.time()
+        payload['sent_at'] = format_timestamp(sent_at)
+        delivered = False
         try:
-            response = requests.post(WEBHOOK_URL, json=payload, timeout=10)
+            with webhook_delivery() as call:
+                response = requests.post(WEBHOOK_URL, json=payload, timeout=10)
+                call.status = response.status_code
             if response.status_code == 200:
                 print(f"✅ Webhook sent for {ticker}")
-                return True
+                delivered = True
         except Exception as e:
             print(f"⚠️  Webhook error: {e}")
 
-        return False
+        self.record_delivery([payload], sent_at, time.time() if delivered else None)
+        return delivered
+
+    def record_delivery(self, alerts: List[Dict], sent_at: float, delivered_at: Optional[float]):
+        """Stamp the alerted filings with send/delivery times (delivered_at None = failed)"""
+        rows = [
+            (parse_timestamp(alert.get('persisted_at')), sent_at, delivered_at, delivered_at is not None,
+             alert['ticker'], accession)
+            for alert in alerts
+            for accession in alert.get('accession_numbers', [])
+        ]
+        if not rows:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        with DB_WRITE_SECONDS.labels(op='record_delivery').time(), conn:
+            conn.executemany('''
+                UPDATE filings SET persisted_at = ?, sent_at = ?, delivered_at = ?, notified = ?
+                WHERE ticker = ? AND accession_number = ?
+            ''', rows)
+        conn.close()
+
+        for alert in alerts:
+            if not alert.get('backfill'):
+                observe_alert_latency(parse_timestamp(alert.get('accepted_at')), delivered_at)
+
+    def get_latency_stats(self, window_hours: float = 24) -> Dict:
+        """Rolling filing-to-alert latency percentiles over alerts delivered in the window"""
+        since = time.time() - window_hours * 3600
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT accepted_at, first_seen_at, persisted_at, delivered_at
+            FROM filings
+            WHERE delivered_at > ?
+        ''', (since,)).fetchall()
+        failed = conn.execute('SELECT COUNT(*) FROM filings WHERE delivered_at IS NULL AND sent_at > ?',
+                              (since,)).fetchone()[0]
+        conn.close()
+
+        return {'latency': latency_summary(rows), 'failed_alerts': failed}
 
-    def monitor_ticker(self, ticker: str, days_back: int = 7):
-        """Monitor a single ticker"""
+    def monitor_ticker(self, ticker: str, days_back: int = 7) -> int:
+        """Monitor a single ticker, returning the number of new filings"""
         print(f"\n📊 Monitoring {ticker}...")
 
+        new_filings = 0
         filings = self.get_form4_filings(ticker, days_back)
 
         if filings:
-            new_filings = self.save_filings(ticker, filings)
+            new = self.save_filings(ticker, filings)
+            new_filings = len(new)
 
             if new_filings > 0:
                 latest = filings[0]['filing_date']
                 print(f"   📋 Found {len(filings)} filings ({new_filings} new)")
                 print(f"   📅 Latest: {latest}")
 
+                # Parse only the new accessions, then summarise them for the alert
+                details = None
+                if self.enricher:
+                    parsed = self.enricher.enrich(new)
+                    saved = self.save_transactions(ticker, parsed, new[0]['cik'])
+                    details = Form4Enricher.summarize([t for ts in parsed.values() for t in ts])
+                    print(f"   💵 Parsed {saved} transactions")
+
                 # Send webhook
-                self.send_webhook(ticker, len(filings), latest)
+                self.send_webhook(ticker, len(filings), latest, details, new)
             else:
                 print(f"   ℹ️  {len(filings)} filings (no new)")
         else:
             print(f"   ℹ️  No Form 4 filings found")
 
+        if self.batcher:
+            self.batcher.maybe_flush()
+
+        return new_filings
+
+    def flush_alerts(self):
+        """Send any alerts still queued in the batcher"""
+        if self.batcher:
+            self.batcher.flush()
+
     def add_to_watchlist(self, ticker: str):
         """Add ticker to watchlist"""
         conn = sqlite3.connect(self.db_path)
@@ -199,32 +534,74 @@ class InsiderMonitor:
 
     def run_watchlist(self, days_back: int = 7):
         """Monitor all tickers in watchlist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT ticker FROM watchlist WHERE active = 1')
-        tickers = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        tickers = self.get_watchlist()
 
         print(f"\n🔍 Monitoring {len(tickers)} tickers in watchlist...")
 
         for ticker in tickers:
             self.monitor_ticker(ticker, days_back)
 
+    def get_watchlist(self) -> List[str]:
+        """Get active watchlist tickers"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT ticker FROM watchlist WHERE active = 1')
+        tickers = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return tickers
 
-def main():
-    parser = argparse.ArgumentParser(description='Insider Trading Monitor')
-    parser.add_argument('--ticker', help='Monitor specific ticker')
-    parser.add_argument('--tickers', help='Monitor multiple tickers (comma-separated)')
-    parser.add_argument('--add', help='Add ticker to watchlist')
-    parser.add_argument('--watchlist', action='store_true', help='Run watchlist monitoring')
-    parser.add_argument('--days', type=int, default=7, help='Days to look back (default: 7)')
-
-    args = parser.parse_args()
-
-    monitor = InsiderMonitor()
+    def run_daemon(self, tickers: List[str], days_back: int = 7, budget_per_hour: float = 600):
+        """Poll tickers forever, adapting each ticker's cadence to its filing activity"""
+        scheduler = PollScheduler(tickers, budget_per_hour=budget_per_hour)
+        QUEUE_DEPTH.labels(queue='poll_due').set_function(
+            lambda: sum(1 for due_at, _ in scheduler.queue if due_at <= time.time())
+        )
+        print(f"\n🔁 Daemon mode: {len(scheduler.weights)} tickers, budget {budget_per_hour:.0f} requests/hour")
 
-    if args.ticker:
+        last_request = 0.0
+        try:
+            while True:
+                due_at, ticker = scheduler.pop_due()
+                start = max(due_at, last_request + scheduler.request_spacing)
+
+                # Sleep in short steps so batched alerts keep their latency bound
+                while time.time() < start:
+                    time.sleep(min(start - time.time(), 1.0))
+                    if self.batcher:
+                        self.batcher.maybe_flush()
+
+                last_request = time.time()
+                new_filings = self.monitor_ticker(ticker, days_back)
+                next_at = scheduler.record_poll(ticker, self.form4_history.get(ticker, []), new_filings)
+                print(f"   ⏱️  Next check {datetime.fromtimestamp(next_at):%Y-%m-%d %H:%M}")
+
+        except KeyboardInterrupt:
+            print("\n🛑 Daemon stopped")
+        finally:
+            self.flush_alerts()
+
+
+def run(monitor: InsiderMonitor, args: argparse.Namespace):
+    """Dispatch the parsed CLI arguments"""
+    if args.stats:
+        stats = monitor.get_latency_stats(args.latency_window)
+        print(f"\n⏱️  Filing-to-alert latency (last {args.latency_window:g}h, "
+              f"{stats['failed_alerts']} failed deliveries):")
+        for stage, summary in stats['latency'].items():
+            print(f"   {stage:<11} n={summary['count']:<6} p50={summary['p50']:8.2f}s "
+                  f"p95={summary['p95']:8.2f}s p99={summary['p99']:8.2f}s")
+    elif args.daemon:
+        if args.metrics_port:
+            REGISTRY.start_http_server(args.metrics_port)
+
+        if args.ticker:
+            tickers = [args.ticker]
+        elif args.tickers:
+            tickers = [t.strip() for t in args.tickers.split(',')]
+        else:
+            tickers = monitor.get_watchlist() or ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA']
+        monitor.run_daemon([t.upper() for t in tickers], args.days, args.budget)
+    elif args.ticker:
         monitor.monitor_ticker(args.ticker, args.days)
     elif args.tickers:
         for ticker in args.tickers.split(','):
@@ -241,5 +618,58 @@ def main():
             monitor.monitor_ticker(ticker, args.days)
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Insider Trading Monitor')
+    parser.add_argument('--ticker', help='Monitor specific ticker')
+    parser.add_argument('--tickers', help='Monitor multiple tickers (comma-separated)')
+    parser.add_argument('--add', help='Add ticker to watchlist')
+    parser.add_argument('--watchlist', action='store_true', help='Run watchlist monitoring')
+    parser.add_argument('--days', type=int, default=7, help='Days to look back (default: 7)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run continuously with adaptive per-ticker polling')
+    parser.add_argument('--budget', type=float, default=600,
+                        help='Daemon request budget per hour across all tickers (default: 600)')
+    parser.add_argument('--enrich', action='store_true',
+                        help='Download new filings and alert with shares, price and value')
+    parser.add_argument('--enrich-workers', type=int, default=4,
+                        help='Parallel filing downloads when enriching (default: 4)')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='Coalesce up to N alerts into one webhook payload (0 = disabled)')
+    parser.add_argument('--batch-wait', type=float, default=5.0,
+                        help='Max seconds an alert may wait in a batch (default: 5)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Show filing-to-alert latency percentiles and exit')
+    parser.add_argument('--latency-window', type=float, default=24,
+                        help='Hours of delivered alerts summarised by --stats (default: 24)')
+    parser.add_argument('--metrics-port', type=int, default=0,
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT/metrics in daemon mode (0 = disabled)')
+    parser.add_argument('--metrics-json', type=str,
+                        help='Write request/DB/webhook metrics to this JSON file on exit')
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                        help='Write CPU and allocation profiles of this run under DIR (default: profiles/)')
+
+    args = parser.parse_args()
+
+    profiler = Profiler('insider_monitor', args.profile) if args.profile else None
+    if profiler:
+        profiler.start()
+
+    monitor = InsiderMonitor(
+        batch_size=args.batch_size,
+        batch_wait=args.batch_wait,
+        enrich_workers=args.enrich_workers if args.enrich else 0
+    )
+
+    try:
+        run(monitor, args)
+    finally:
+        monitor.flush_alerts()
+        if profiler:
+            profiler.stop()
+        if args.metrics_json:
+            REGISTRY.write_json(args.metrics_json)
+            print(f"📈 Metrics saved to {args.metrics_json}")
+
+
 if __name__ == '__main__':
     main()
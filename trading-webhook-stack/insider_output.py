@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Streaming output writers for fetcher results
+
+Each writer takes DataFrame batches as they are produced (one per ticker
+for the fetcher) and appends them to the file, so a run never has to hold
+its full result to save it.
+
+    csv       header once, then appended rows
+    jsonl     one JSON object per line
+    parquet   one row group per batch (needs pyarrow)
+
+The file's columns and dtypes are fixed when the writer is opened
+(insider_trading_fetcher.output_dtypes), not taken from the first batch:
+a ticker's batch may hold only whole numbers or no values in a column.
+Every batch is reindexed and cast to them; a batch with a column outside
+the schema, or one that cannot be cast, raises ValueError rather than
+being dropped.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl',
+              '.parquet': 'parquet', '.pq': 'parquet'}
+
+
+class BatchWriter:
+    """Append DataFrame batches with fixed columns and dtypes to one output file"""
+
+    def __init__(self, path: str, dtypes: Dict[str, str]):
+        self.path = path
+        self.dtypes = dtypes
+        self.rows = 0
+
+    def conform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with exactly the schema's columns, in order, cast to its dtypes"""
+        extra = [column for column in df.columns if column not in self.dtypes]
+        if extra:
+            raise ValueError(f"columns not in the output schema: {', '.join(map(str, extra))}")
+        return df.reindex(columns=list(self.dtypes)).astype(self.dtypes)
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        self._write(self.conform(df))
+        self.rows += len(df)
+
+    def _write(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> 'BatchWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVWriter(BatchWriter):
+    def __init__(self, path: str, dtypes: Dict[str, str]):
+        super().__init__(path, dtypes)
+        self._file = open(path, 'w', newline='')
+
+    def _write(self, df: pd.DataFrame):
+        df.to_csv(self._file, index=False, header=self.rows == 0)
+
+    def close(self):
+        self._file.close()
+
+
+class JSONLWriter(BatchWriter):
+    def __init__(self, path: str, dtypes: Dict[str, str]):
+        super().__init__(path, dtypes)
+        self._file = open(path, 'w')
+
+    def _write(self, df: pd.DataFrame):
+        lines = df.to_json(orient='records', lines=True, date_format='iso')
+        self._file.write(lines if lines.endswith('\n') else lines + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(BatchWriter):
+    def __init__(self, path: str, dtypes: Dict[str, str]):
+        super().__init__(path, dtypes)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('Parquet output needs pyarrow (pip install pyarrow)')
+        self._pa = pa
+        empty = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+        self._schema = pa.Schema.from_pandas(empty, preserve_index=False)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write(self, df: pd.DataFrame):
+        table = self._pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table, row_group_size=len(df))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {'csv': CSVWriter, 'jsonl': JSONLWriter, 'parquet': ParquetWriter}
+
+
+def open_writer(path: str, dtypes: Dict[str, str], fmt: Optional[str] = None) -> BatchWriter:
+    """Writer for `path` with columns `dtypes`, in `fmt` or the format its extension names (default CSV)"""
+    fmt = fmt or EXTENSIONS.get(Path(path).suffix.lower(), 'csv')
+    return WRITERS[fmt](path, dtypes)
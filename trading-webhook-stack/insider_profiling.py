@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Profiling mode for the insider trading CLIs (--profile)
+
+One run writes a directory of files that can be diffed against another run:
+
+    cpu.prof              cProfile stats (main and worker threads), for pstats/snakeviz
+    cpu.txt               top functions by cumulative and by own time
+    alloc-<func>.snapshot tracemalloc snapshot of the largest sampled call (Snapshot.load)
+    alloc.txt             peak and live allocation sites per call of parse_form4/analyze_dataframe
+    slow_callbacks.log    asyncio callbacks that blocked the loop (sec_monitor only)
+    summary.json          the numbers above, keyed by function/site for comparison
+
+Allocations are traced only inside sampled calls of the hot functions, which
+wrap their work in ``with allocations('name'):``. Tracing the whole run
+would make every snapshot cost seconds; this keeps each one to the blocks a
+single call allocates. Sites are what is still live when the block exits,
+the peak includes temporaries. Outside --profile it is a no-op.
+
+Compare two runs:
+    python insider_profiling.py compare profiles/fetcher-20250101-120000 profiles/fetcher-20250102-120000
+"""
+
+import argparse
+import contextlib
+import cProfile
+import inspect
+import io
+import json
+import logging
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+TRACEBACK_FRAMES = 25
+TOP_N = 40
+SLOW_CALLBACK_SECONDS = 0.1
+# Trace the first few calls of a hot function, then every Nth, up to a cap
+SAMPLE_FIRST = 5
+SAMPLE_EVERY = 25
+MAX_SAMPLES = 200
+
+_active: Optional['Profiler'] = None
+_OWN_FILES = {__file__, tracemalloc.__file__, contextlib.__file__}
+
+
+@contextmanager
+def allocations(name: str):
+    """Trace allocations of a hot function body on sampled calls while profiling"""
+    profiler = _active
+    if profiler is None or not profiler.begin_sample(name):
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        profiler.end_sample(name)
+
+
+def _code_range(func) -> Tuple[str, int, int]:
+    lines, first = inspect.getsourcelines(func)
+    return func.__code__.co_filename, first, first + len(lines) - 1
+
+
+def hot_paths() -> Dict[str, Tuple[str, int, int]]:
+    """(file, first line, last line) of the functions wrapped in allocations()"""
+    from insider_trading_fetcher import SECInsiderTrading, InsiderSignalAnalyzer
+
+    return {
+        'parse_form4': _code_range(SECInsiderTrading.parse_form4),
+        'analyze_dataframe': _code_range(InsiderSignalAnalyzer.analyze_dataframe)
+    }
+
+
+class Profiler:
+    """CPU, allocation and event-loop profiling for one CLI run"""
+
+    def __init__(self, tool: str, out_dir: str = 'profiles'):
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.path = Path(out_dir) / f'{tool}-{stamp}'
+        self.profile = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._tracing = threading.Lock()  # tracemalloc is process-wide: one sampled call at a time
+        self._loop_handler: Optional[logging.Handler] = None
+
+        self.hot_paths: Dict[str, Tuple[str, int, int]] = {}
+        self.calls: Dict[str, int] = {}
+        self.samples: Dict[str, int] = {}
+        self.peaks: Dict[str, int] = {}
+        self.sites: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.largest: Dict[str, Tuple[int, tracemalloc.Snapshot]] = {}
+
+    def _profile_thread(self, frame, event, arg):
+        # Called once in each new thread; switches that thread to its own profiler
+        profile = cProfile.Profile()
+        with self._lock:
+            self.thread_profiles.append(profile)
+        sys.setprofile(None)
+        profile.enable()
+
+    def start(self):
+        global _active
+        self.path.mkdir(parents=True, exist_ok=True)
+        threading.setprofile(self._profile_thread)
+        _active = self
+        self.profile.enable()
+        print(f"🔬 Profiling to {self.path}")
+
+    def begin_sample(self, name: str) -> bool:
+        """Start tracing if this call of `name` is sampled; False to skip it"""
+        with self._lock:
+            calls = self.calls[name] = self.calls.get(name, 0) + 1
+            if self.samples.get(name, 0) >= MAX_SAMPLES:
+                return False
+            if calls > SAMPLE_FIRST and calls % SAMPLE_EVERY:
+                return False
+        if tracemalloc.is_tracing() or not self._tracing.acquire(blocking=False):
+            return False
+
+        tracemalloc.start(TRACEBACK_FRAMES)
+        return True
+
+    def end_sample(self, name: str):
+        """Attribute the call's live allocations to their lines and stop tracing"""
+        try:
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+            self._tracing.release()
+
+        # Drop the profiler's own blocks and those other threads allocated meanwhile
+        if not self.hot_paths:
+            self.hot_paths = hot_paths()
+        filename, first, last = self.hot_paths[name]
+        statistics = [
+            stat for stat in snapshot.statistics('traceback')
+            if stat.traceback[-1].filename not in _OWN_FILES
+            and any(frame.filename == filename and first <= frame.lineno <= last for frame in stat.traceback)
+        ]
+        size = sum(stat.size for stat in statistics)
+
+        with self._lock:
+            self.samples[name] = self.samples.get(name, 0) + 1
+            self.peaks[name] = self.peaks.get(name, 0) + peak
+            sites = self.sites.setdefault(name, {})
+            for site, values in self.top_sites(statistics, limit=None).items():
+                total = sites.setdefault(site, {'size': 0, 'count': 0})
+                total['size'] += values['size']
+                total['count'] += values['count']
+            if size > self.largest.get(name, (-1, None))[0]:
+                self.largest[name] = (size, snapshot)
+
+    def watch_loop(self, loop, slow_seconds: float = SLOW_CALLBACK_SECONDS):
+        """Log event-loop callbacks that run longer than slow_seconds"""
+        loop.set_debug(True)
+        loop.slow_callback_duration = slow_seconds
+
+        handler = logging.FileHandler(self.path / 'slow_callbacks.log')
+        handler.setLevel(logging.WARNING)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logging.getLogger('asyncio').addHandler(handler)
+        self._loop_handler = handler
+
+    def stop(self):
+        """Stop collecting and write all profile files"""
+        global _active
+        self.profile.disable()
+        threading.setprofile(None)
+        _active = None
+
+        if self._loop_handler:
+            logging.getLogger('asyncio').removeHandler(self._loop_handler)
+            self._loop_handler.close()
+
+        stats = pstats.Stats(self.profile)
+        for profile in self.thread_profiles:
+            try:
+                stats.add(profile)
+            except (TypeError, ValueError):
+                pass  # thread never ran any profiled code
+        stats.dump_stats(self.path / 'cpu.prof')
+
+        summary = {
+            'created_at': datetime.now().isoformat(),
+            'argv': sys.argv,
+            'cpu': self.write_cpu(stats),
+            'alloc': self.write_alloc()
+        }
+        with open(self.path / 'summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        print(f"🔬 Profile written to {self.path}")
+
+    def write_cpu(self, stats: pstats.Stats) -> Dict[str, Dict[str, float]]:
+        with open(self.path / 'cpu.txt', 'w') as f:
+            stats.stream = f
+            f.write(f"Total: {stats.total_tt:.3f}s in {stats.total_calls} calls\n\n")
+            stats.sort_stats('cumulative').print_stats(TOP_N)
+            stats.sort_stats('tottime').print_stats(TOP_N)
+
+        functions = {}
+        for (filename, lineno, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            functions[f'{Path(filename).name}:{lineno}({name})'] = {
+                'calls': calls, 'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)
+            }
+        top = sorted(functions.items(), key=lambda item: item[1]['cumtime'], reverse=True)[:TOP_N * 5]
+        return dict(top)
+
+    def write_alloc(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Per-call averages over the sampled calls of each hot function"""
+        sections = {}
+        with open(self.path / 'alloc.txt', 'w') as f:
+            for name, sites in self.sites.items():
+                samples = self.samples[name]
+                averaged = {
+                    site: {'size': values['size'] // samples, 'count': values['count'] // samples}
+                    for site, values in sites.items()
+                    if values['size'] >= samples
+                }
+                sections[name] = dict(
+                    sorted(averaged.items(), key=lambda item: item[1]['size'], reverse=True)[:TOP_N]
+                )
+
+                title = (f"{name}: {samples} of {self.calls[name]} calls sampled, "
+                         f"peak {self.peaks[name] / samples / 1024:.1f} KiB per call")
+                f.write(f"{title}\n{'-' * len(title)}\n")
+                for site, values in sections[name].items():
+                    f.write(f"{values['size'] / 1024:10.1f} KiB {values['count']:8d} blocks  {site}\n")
+                f.write('\n')
+
+                self.largest[name][1].dump(str(self.path / f'alloc-{name}.snapshot'))
+
+        return sections
+
+    @staticmethod
+    def top_sites(statistics: List[tracemalloc.Statistic], limit: Optional[int] = TOP_N) -> Dict[str, Dict[str, int]]:
+        """Merge statistics by allocating line (the most recent frame)"""
+        sites: Dict[str, Dict[str, int]] = {}
+        for stat in statistics:
+            frame = stat.traceback[-1]
+            site = sites.setdefault(f'{frame.filename}:{frame.lineno}', {'size': 0, 'count': 0})
+            site['size'] += stat.size
+            site['count'] += stat.count
+        top = sorted(sites.items(), key=lambda item: item[1]['size'], reverse=True)[:limit]
+        return dict(top)
+
+
+def compare(old_dir: str, new_dir: str, limit: int = 20) -> str:
+    """Text report of the largest CPU and allocation changes between two profile runs"""
+    with open(Path(old_dir) / 'summary.json') as f:
+        old = json.load(f)
+    with open(Path(new_dir) / 'summary.json') as f:
+        new = json.load(f)
+
+    out = io.StringIO()
+
+    def section(title: str, before: Dict, after: Dict, key: str, unit: str, scale: float):
+        rows = []
+        for name in set(before) | set(after):
+            a = before.get(name, {}).get(key, 0)
+            b = after.get(name, {}).get(key, 0)
+            rows.append((b - a, a, b, name))
+        rows.sort(key=lambda row: abs(row[0]), reverse=True)
+
+        out.write(f"{title}\n{'-' * len(title)}\n")
+        for delta, a, b, name in rows[:limit]:
+            out.write(f"{a / scale:12.3f} -> {b / scale:12.3f} {unit} ({delta / scale:+.3f})  {name}\n")
+        out.write('\n')
+
+    section('Cumulative CPU time', old['cpu'], new['cpu'], 'cumtime', 's', 1)
+    for name in new['alloc']:
+        section(f'Live memory per call ({name})', old['alloc'].get(name, {}), new['alloc'][name], 'size', 'KiB', 1024)
+
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two --profile runs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compare_parser = subparsers.add_parser('compare', help='Show the biggest changes between two runs')
+    compare_parser.add_argument('old', help='Earlier profile directory')
+    compare_parser.add_argument('new', help='Later profile directory')
+    compare_parser.add_argument('--limit', type=int, default=20, help='Rows per section (default: 20)')
+
+    args = parser.parse_args()
+    print(compare(args.old, args.new, args.limit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Cross-ticker insider screener over the local transaction store
+
+Ranks every ticker in insider_monitor.py's database by recent insider
+activity in one grouped pass: the window is one indexed query, signals are
+scored for all rows at once (InsiderSignalAnalyzer.calculate_signals) and
+per-ticker figures come from a single groupby. No network calls.
+
+Usage:
+    python insider_screener.py
+    python insider_screener.py --days 90 --sort distinct_buyers --top 50
+    python insider_screener.py --watchlist scrapers/watchlists/tech-stocks.txt
+    python insider_screener.py --watchlist db
+    python insider_screener.py --sectors-file sectors.csv --sector "Technology,Health Care"
+
+Sectors come from a CSV with `ticker` and `sector` columns, since the
+store itself has no sector data.
+"""
+
+import argparse
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from insider_trading_fetcher import InsiderSignalAnalyzer
+
+SORT_COLUMNS = ['net_buy_value', 'buy_value', 'distinct_buyers', 'strong_buys', 'net_shares', 'signal_buy_value']
+
+
+def load_window(db_path: str, days: int, tickers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Transactions traded in the last `days` days, optionally for some tickers only"""
+    since = (date.today() - timedelta(days=days)).isoformat()
+    query = '''
+        SELECT ticker, insider_name, position, transaction_code, shares, total_value
+        FROM transactions
+        WHERE transaction_date >= ?
+    '''
+    params: List = [since]
+    if tickers is not None:
+        tickers = sorted(set(tickers))
+        query += f" AND ticker IN ({','.join('?' * len(tickers))})"
+        params.extend(tickers)
+
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+def load_watchlist(source: str, db_path: str) -> List[str]:
+    """Tickers from a watchlist file (one per line, # comments) or 'db' for insider_monitor's table"""
+    if source == 'db':
+        conn = sqlite3.connect(db_path)
+        tickers = [row[0] for row in conn.execute('SELECT ticker FROM watchlist WHERE active = 1')]
+        conn.close()
+        return tickers
+
+    with open(source) as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [line.upper() for line in lines if line]
+
+
+def load_sectors(path: str) -> pd.Series:
+    """ticker -> sector from a CSV with ticker and sector columns"""
+    sectors = pd.read_csv(path)
+    sectors.columns = [column.lower() for column in sectors.columns]
+    return pd.Series(sectors['sector'].to_numpy(), index=sectors['ticker'].astype(str).str.upper())
+
+
+def screen(df: pd.DataFrame, sectors: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Per-ticker insider activity, one row per ticker"""
+    if df.empty:
+        return pd.DataFrame(columns=['ticker'] + SORT_COLUMNS)
+
+    code = df['transaction_code'].to_numpy()
+    value = df['total_value'].fillna(0).to_numpy()
+    shares = df['shares'].fillna(0).to_numpy()
+    signal = InsiderSignalAnalyzer.calculate_signals(df).to_numpy()
+
+    buy = code == 'P'
+    sell = code == 'S'
+    bullish = (signal == 'BUY') | (signal == 'STRONG_BUY')
+
+    columns = pd.DataFrame({
+        'ticker': df['ticker'].to_numpy(),
+        'transactions': 1,
+        'buys': buy.astype(int),
+        'sells': sell.astype(int),
+        'buy_value': np.where(buy, value, 0),
+        'sell_value': np.where(sell, value, 0),
+        'net_shares': np.where(buy, shares, 0) - np.where(sell, shares, 0),
+        'strong_buys': (signal == 'STRONG_BUY').astype(int),
+        'buy_signals': bullish.astype(int),
+        'signal_buy_value': np.where(bullish, value, 0)
+    })
+    result = columns.groupby('ticker', sort=False).sum()
+    result['net_buy_value'] = result['buy_value'] - result['sell_value']
+
+    # Distinct open-market buyers: unique (ticker, insider) pairs among purchases
+    buyers = df.loc[buy, ['ticker', 'insider_name']].drop_duplicates()
+    result['distinct_buyers'] = buyers.groupby('ticker').size().reindex(result.index, fill_value=0)
+
+    if sectors is not None:
+        result['sector'] = sectors.reindex(result.index).to_numpy()
+
+    return result.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank tickers by insider activity in the local store')
+    parser.add_argument('--db', default='insider_monitor.db', help='insider_monitor.py database')
+    parser.add_argument('--days', type=int, default=30, help='Look back this many days (default: 30)')
+    parser.add_argument('--watchlist', type=str, help="Watchlist file, or 'db' for the monitor's watchlist")
+    parser.add_argument('--sectors-file', type=str, help='CSV with ticker and sector columns')
+    parser.add_argument('--sector', type=str, help='Comma-separated sectors to keep (needs --sectors-file)')
+    parser.add_argument('--sort', choices=SORT_COLUMNS, default='net_buy_value', help='Ranking column')
+    parser.add_argument('--min-buyers', type=int, default=0, help='Only tickers with at least N distinct buyers')
+    parser.add_argument('--top', type=int, default=20, help='Rows to show (default: 20)')
+    parser.add_argument('--output', type=str, help='Save the full ranking to CSV')
+
+    args = parser.parse_args()
+    if args.sector and not args.sectors_file:
+        parser.error('--sector needs --sectors-file')
+
+    start = time.perf_counter()
+
+    sectors = load_sectors(args.sectors_file) if args.sectors_file else None
+    tickers = set(load_watchlist(args.watchlist, args.db)) if args.watchlist else None
+    if args.sector:
+        wanted = {sector.strip().lower() for sector in args.sector.split(',')}
+        in_sectors = set(sectors[sectors.str.lower().isin(wanted)].index)
+        tickers = in_sectors if tickers is None else tickers & in_sectors
+
+    df = load_window(args.db, args.days, tickers)
+    ranking = screen(df, sectors)
+    ranking = ranking[ranking['distinct_buyers'] >= args.min_buyers]
+    ranking = ranking.sort_values(args.sort, ascending=False, ignore_index=True)
+    ranking.index += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"🔎 {len(df):,} transactions across {len(ranking):,} tickers, last {args.days} days ({elapsed:.2f}s)")
+
+    if ranking.empty:
+        print("❌ No insider activity found")
+        return
+
+    columns = ['ticker'] + (['sector'] if sectors is not None else []) + [
+        'net_buy_value', 'buy_value', 'sell_value', 'distinct_buyers', 'buys', 'sells', 'strong_buys', 'buy_signals'
+    ]
+
+    def money(value: float) -> str:
+        return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+    print(ranking[columns].head(args.top).to_string(
+        formatters={'net_buy_value': money, 'buy_value': money, 'sell_value': money}
+    ))
+
+    if args.output:
+        ranking.to_csv(args.output, index_label='rank')
+        print(f"\n💾 Ranking saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
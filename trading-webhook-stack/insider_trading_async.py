@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Async SEC Form 4 client for asyncio code (sec_monitor.py, notebooks, services)
+
+AsyncSECInsiderTrading has the same methods as SECInsiderTrading, as
+coroutines, and shares its mappings, DataFrame building and parse_form4.
+Requests go through one aiohttp session, bounded by `concurrency` and spaced
+to `rate` requests per second; parse_form4 runs in an executor so parsing
+never blocks the event loop. Concurrent requests for the same URL share one
+fetch, and submissions come from the sync client's TTL cache when fresh.
+
+    async with AsyncSECInsiderTrading(user_agent='Name (email)') as sec:
+        df = await sec.get_multiple_tickers(['AAPL', 'MSFT'], fetch_details=True)
+
+The default executor is the loop's thread pool. Pass a
+ProcessPoolExecutor to parse on several cores (parse metrics then stay in
+the worker processes).
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiohttp
+import pandas as pd
+
+from insider_cache import AsyncSingleFlight
+from insider_metrics import SEC_CACHE, sec_request
+from insider_trading_fetcher import SECInsiderTrading
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5  # SEC allows ~10 requests/s; stay at half
+
+
+class AsyncSECInsiderTrading:
+    """Fetch SEC Form 4 insider trading data from an event loop"""
+
+    def __init__(
+        self,
+        user_agent: str = "Your Name (your.email@example.com)",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        executor: Optional[Executor] = None
+    ):
+        # Mappings, URLs, DataFrame building and parsing are shared with the sync client
+        self.sync = SECInsiderTrading(user_agent=user_agent)
+        self.headers = self.sync.headers
+        self.concurrency = concurrency
+        self.interval = 1.0 / rate
+        self.executor = executor
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.mappings_lock = asyncio.Lock()
+        self.inflight = AsyncSingleFlight()
+        self._next_request = 0.0
+
+    async def __aenter__(self) -> 'AsyncSECInsiderTrading':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for SEC requests"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.concurrency),
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+
+    async def _throttle(self):
+        """Space request starts evenly at the configured rate"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = self._next_request - now
+        self._next_request = max(now, self._next_request) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _get(self, url: str, as_json: bool):
+        """GET a URL; returns parsed JSON or text, raising on HTTP errors"""
+        return await self.inflight.do(url, lambda: self._fetch(url, as_json))
+
+    async def _fetch(self, url: str, as_json: bool):
+        async with self.semaphore:
+            await self._throttle()
+            with sec_request(url) as call:
+                async with self.get_session().get(url) as response:
+                    call.status = response.status
+                    response.raise_for_status()
+                    if as_json:
+                        # SEC serves some JSON as application/octet-stream
+                        return await response.json(content_type=None)
+                    return await response.text()
+
+    async def load_ticker_mappings(self, force_reload: bool = False):
+        """Load ticker to CIK mappings from SEC"""
+        async with self.mappings_lock:
+            # Concurrent lookups wait for the first load instead of repeating it
+            if self.sync.ticker_to_cik and not force_reload:
+                return
+
+            url = f"{self.sync.BASE_URL}/files/company_tickers.json"
+            try:
+                self.sync.store_ticker_mappings(await self._get(url, as_json=True))
+            except Exception as e:
+                print(f"✗ Error loading ticker mappings: {e}")
+
+    async def get_cik(self, ticker: str) -> Optional[str]:
+        """Convert ticker to CIK"""
+        if not self.sync.ticker_to_cik:
+            await self.load_ticker_mappings()
+
+        return self.sync.ticker_to_cik.get(ticker.upper())
+
+    async def get_ticker(self, cik: str) -> Optional[str]:
+        """Convert CIK to ticker"""
+        if not self.sync.cik_to_ticker:
+            await self.load_ticker_mappings()
+
+        return self.sync.cik_to_ticker.get(cik)
+
+    async def get_company_submissions(self, cik: str) -> Optional[Dict]:
+        """Get all filings for a company"""
+        url = self.sync.submissions_url(cik)
+        data = self.sync.submissions_cache.get(url)
+        if data is not None:
+            SEC_CACHE.labels(result='hit').inc()
+            return data
+
+        try:
+            if not self.inflight.pending(url):
+                SEC_CACHE.labels(result='miss').inc()
+            data = await self._get(url, as_json=True)
+            self.sync.submissions_cache.put(url, data)
+            return data
+
+        except Exception as e:
+            print(f"✗ Error fetching submissions for {cik}: {e}")
+            return None
+
+    async def get_form4_filings(self, ticker: str, days_back: int = 30) -> pd.DataFrame:
+        """Get recent Form 4 filings for a ticker"""
+        cik = await self.get_cik(ticker)
+
+        if not cik:
+            print(f"✗ Ticker {ticker} not found")
+            return pd.DataFrame()
+
+        print(f"Fetching filings for {ticker} (CIK: {cik})...")
+
+        data = await self.get_company_submissions(cik)
+        if not data:
+            return pd.DataFrame()
+
+        return self.sync.form4_frame(data, ticker, cik, days_back)
+
+    async def download_form4(self, cik: str, accession_number: str) -> Optional[str]:
+        """Download full Form 4 filing text"""
+        try:
+            return await self._get(self.sync.filing_url(cik, accession_number), as_json=False)
+
+        except Exception as e:
+            print(f"✗ Error downloading Form 4: {e}")
+            return None
+
+    async def parse_form4(self, filing_text: str) -> List[Dict]:
+        """Parse Form 4 filing in the executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, SECInsiderTrading.parse_form4, filing_text)
+
+    async def _filing_transactions(self, ticker: str, filing) -> List[Dict]:
+        filing_text = await self.download_form4(filing['cik'], filing['accession_number'])
+        if not filing_text:
+            return []
+
+        transactions = await self.parse_form4(filing_text)
+        for transaction in transactions:
+            transaction['ticker'] = ticker
+            transaction['filing_date'] = filing['filing_date']
+            transaction['accession_number'] = filing['accession_number']
+        return transactions
+
+    async def get_insider_trading(self, ticker: str, days_back: int = 30, fetch_details: bool = False) -> pd.DataFrame:
+        """Get complete insider trading data for a ticker"""
+        filings_df = await self.get_form4_filings(ticker, days_back)
+
+        if filings_df.empty or not fetch_details:
+            return filings_df
+
+        # Download and parse every filing concurrently; the semaphore and throttle pace the requests
+        results = await asyncio.gather(*(
+            self._filing_transactions(ticker, filing) for _, filing in filings_df.iterrows()
+        ))
+        all_transactions = [transaction for transactions in results for transaction in transactions]
+
+        if all_transactions:
+            df = pd.DataFrame(all_transactions)
+            print(f"✓ Extracted {len(df)} transactions from {len(filings_df)} filings")
+            return df
+        else:
+            return pd.DataFrame()
+
+    async def iter_multiple_tickers(self, tickers: List[str], days_back: int = 30,
+                                    fetch_details: bool = False) -> AsyncIterator[pd.DataFrame]:
+        """Yield each ticker's non-empty result as soon as it completes"""
+        for next_done in asyncio.as_completed([
+            self.get_insider_trading(ticker, days_back, fetch_details) for ticker in tickers
+        ]):
+            df = await next_done
+            if not df.empty:
+                yield df
+
+    async def get_multiple_tickers(self, tickers: List[str], days_back: int = 30, fetch_details: bool = False) -> pd.DataFrame:
+        """Fetch insider trading data for multiple tickers concurrently"""
+        results = await asyncio.gather(*(
+            self.get_insider_trading(ticker, days_back, fetch_details) for ticker in tickers
+        ))
+        all_data = [df for df in results if not df.empty]
+
+        if all_data:
+            return pd.concat(all_data, ignore_index=True)
+        else:
+            return pd.DataFrame()
@@ -12,12 +12,41 @@ Usage:
 
 import requests
 import argparse
+import asyncio
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import time
 import xml.etree.ElementTree as ET
 import json
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional
+
+from insider_cache import TTLCache
+from insider_output import FORMATS, open_writer
+from insider_metrics import REGISTRY, PARSE_FORM4_SECONDS, ROWS_SCORED, SEC_CACHE, sec_request
+from insider_profiling import Profiler, allocations
+
+# Output columns and dtypes: form4_frame rows (filings), parse_form4 rows plus
+# their filing (--details) and the scores analyze_dataframe adds (--signals)
+FILING_DTYPES = {
+    'ticker': 'string', 'cik': 'string', 'accession_number': 'string',
+    'filing_date': 'datetime64[ns]', 'report_date': 'string'
+}
+TRANSACTION_DTYPES = {
+    'insider_name': 'string', 'insider_cik': 'string', 'position': 'string',
+    'transaction_date': 'string', 'transaction_code': 'string', 'acquired_disposed': 'string',
+    'shares': 'float64', 'price_per_share': 'float64', 'total_value': 'float64',
+    'shares_owned_after': 'float64', 'ticker': 'string', 'filing_date': 'datetime64[ns]',
+    'accession_number': 'string'
+}
+SIGNAL_DTYPES = {'signal': 'string', 'transaction_type': 'string'}
+
+
+def output_dtypes(details: bool, signals: bool) -> Dict[str, str]:
+    """Columns and dtypes of the fetcher's rows for these CLI options"""
+    if not details:
+        return dict(FILING_DTYPES)
+    return {**TRANSACTION_DTYPES, **(SIGNAL_DTYPES if signals else {})}
 
 
 class SECInsiderTrading:
@@ -33,28 +62,33 @@ class SECInsiderTrading:
         }
         self.ticker_to_cik = {}
         self.cik_to_ticker = {}
+        # Parsed submissions JSON; share classes of one company (GOOGL/GOOG) reuse it
+        self.submissions_cache = TTLCache()
 
     def load_ticker_mappings(self, force_reload: bool = False):
         """Load ticker to CIK mappings from SEC"""
         url = f"{self.BASE_URL}/files/company_tickers.json"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            with sec_request(url) as call:
+                response = requests.get(url, headers=self.headers)
+                call.status = response.status_code
             response.raise_for_status()
-            data = response.json()
+            self.store_ticker_mappings(response.json())
 
-            # Build mappings
-            for item in data.values():
-                ticker = item['ticker'].upper()
-                cik = str(item['cik_str']).zfill(10)
+        except Exception as e:
+            print(f"✗ Error loading ticker mappings: {e}")
 
-                self.ticker_to_cik[ticker] = cik
-                self.cik_to_ticker[cik] = ticker
+    def store_ticker_mappings(self, data: Dict):
+        """Build ticker <-> CIK mappings from company_tickers.json data"""
+        for item in data.values():
+            ticker = item['ticker'].upper()
+            cik = str(item['cik_str']).zfill(10)
 
-            print(f"✓ Loaded {len(self.ticker_to_cik)} ticker mappings")
+            self.ticker_to_cik[ticker] = cik
+            self.cik_to_ticker[cik] = ticker
 
-        except Exception as e:
-            print(f"✗ Error loading ticker mappings: {e}")
+        print(f"✓ Loaded {len(self.ticker_to_cik)} ticker mappings")
 
     def get_cik(self, ticker: str) -> Optional[str]:
         """Convert ticker to CIK"""
@@ -72,14 +106,32 @@ class SECInsiderTrading:
 
         return self.cik_to_ticker.get(cik)
 
+    @staticmethod
+    def submissions_url(cik: str) -> str:
+        return f"https://data.sec.gov/submissions/CIK{cik}.json"
+
+    @classmethod
+    def filing_url(cls, cik: str, accession_number: str) -> str:
+        acc_clean = accession_number.replace('-', '')
+        return f"{cls.BASE_URL}/Archives/edgar/data/{cik}/{acc_clean}.txt"
+
     def get_company_submissions(self, cik: str) -> Optional[Dict]:
         """Get all filings for a company"""
-        url = f"https://data.sec.gov/submissions/CIK{cik}.json"
+        url = self.submissions_url(cik)
+        data = self.submissions_cache.get(url)
+        if data is not None:
+            SEC_CACHE.labels(result='hit').inc()
+            return data
 
         try:
-            response = requests.get(url, headers=self.headers)
+            SEC_CACHE.labels(result='miss').inc()
+            with sec_request(url) as call:
+                response = requests.get(url, headers=self.headers)
+                call.status = response.status_code
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self.submissions_cache.put(url, data)
+            return data
 
         except Exception as e:
             print(f"✗ Error fetching submissions for {cik}: {e}")
@@ -99,6 +151,11 @@ class SECInsiderTrading:
         if not data:
             return pd.DataFrame()
 
+        return self.form4_frame(data, ticker, cik, days_back)
+
+    @staticmethod
+    def form4_frame(data: Dict, ticker: str, cik: str, days_back: int) -> pd.DataFrame:
+        """Recent Form 4 filings from a submissions document"""
         # Extract filings
         filings = data['filings']['recent']
 
@@ -140,15 +197,16 @@ class SECInsiderTrading:
 
         print(f"✓ Found {len(df)} Form 4 filings for {ticker} in last {days_back} days")
 
-        return df[['ticker', 'cik', 'accession_number', 'filing_date', 'report_date']]
+        return df[list(FILING_DTYPES)]
 
     def download_form4(self, cik: str, accession_number: str) -> Optional[str]:
         """Download full Form 4 filing text"""
-        acc_clean = accession_number.replace('-', '')
-        url = f"{self.BASE_URL}/Archives/edgar/data/{cik}/{acc_clean}.txt"
+        url = self.filing_url(cik, accession_number)
 
         try:
-            response = requests.get(url, headers=self.headers)
+            with sec_request(url) as call:
+                response = requests.get(url, headers=self.headers)
+                call.status = response.status_code
             response.raise_for_status()
             return response.text
 
@@ -156,8 +214,14 @@ class SECInsiderTrading:
             print(f"✗ Error downloading Form 4: {e}")
             return None
 
-    def parse_form4(self, filing_text: str) -> List[Dict]:
+    @staticmethod
+    def parse_form4(filing_text: str) -> List[Dict]:
         """Parse Form 4 filing to extract transactions"""
+        with PARSE_FORM4_SECONDS.time(), allocations('parse_form4'):
+            return SECInsiderTrading._parse_form4(filing_text)
+
+    @staticmethod
+    def _parse_form4(filing_text: str) -> List[Dict]:
         transactions = []
 
         try:
@@ -188,11 +252,16 @@ class SECInsiderTrading:
             reporting_owner = root.find('.//reportingOwner') or root.find('.//reportingOwnerId')
 
             insider_name = "Unknown"
+            insider_cik = ""
             if reporting_owner is not None:
                 name_elem = reporting_owner.find('.//reportingOwnerName') or reporting_owner.find('.//rptOwnerName')
                 if name_elem is not None:
                     insider_name = name_elem.text
 
+                cik_elem = reporting_owner.find('.//rptOwnerCik')
+                if cik_elem is not None and cik_elem.text:
+                    insider_cik = cik_elem.text.strip().zfill(10)
+
             # Extract position/title
             position = "Unknown"
             officer_title = root.find('.//officerTitle')
@@ -220,10 +289,14 @@ class SECInsiderTrading:
                         continue
 
                     shares_elem = amounts.find('.//transactionShares/value')
-                    shares = float(shares_elem.text) if shares_elem is not None and shares_elem.text else 0
+                    shares = float(shares_elem.text) if shares_elem is not None and shares_elem.text else 0.0
 
                     price_elem = amounts.find('.//transactionPricePerShare/value')
-                    price = float(price_elem.text) if price_elem is not None and price_elem.text else 0
+                    price = float(price_elem.text) if price_elem is not None and price_elem.text else 0.0
+
+                    # A = acquired, D = disposed
+                    acquired_elem = amounts.find('.//transactionAcquiredDisposedCode/value')
+                    acquired_disposed = acquired_elem.text.strip() if acquired_elem is not None and acquired_elem.text else ""
 
                     # Calculate total value
                     total_value = shares * price
@@ -238,9 +311,11 @@ class SECInsiderTrading:
 
                     transactions.append({
                         'insider_name': insider_name,
+                        'insider_cik': insider_cik,
                         'position': position,
                         'transaction_date': transaction_date,
                         'transaction_code': transaction_code,
+                        'acquired_disposed': acquired_disposed,
                         'shares': shares,
                         'price_per_share': price,
                         'total_value': total_value,
@@ -294,10 +369,9 @@ class SECInsiderTrading:
         else:
             return pd.DataFrame()
 
-    def get_multiple_tickers(self, tickers: List[str], days_back: int = 30, fetch_details: bool = False) -> pd.DataFrame:
-        """Fetch insider trading data for multiple tickers"""
-        all_data = []
-
+    def iter_multiple_tickers(self, tickers: List[str], days_back: int = 30,
+                              fetch_details: bool = False) -> Iterator[pd.DataFrame]:
+        """Yield each ticker's non-empty result as soon as it is fetched"""
         for ticker in tickers:
             print(f"\n{'='*60}")
             print(f"Processing {ticker}...")
@@ -306,11 +380,15 @@ class SECInsiderTrading:
             df = self.get_insider_trading(ticker, days_back, fetch_details)
 
             if not df.empty:
-                all_data.append(df)
+                yield df
 
             # Rate limiting between tickers
             time.sleep(1)
 
+    def get_multiple_tickers(self, tickers: List[str], days_back: int = 30, fetch_details: bool = False) -> pd.DataFrame:
+        """Fetch insider trading data for multiple tickers"""
+        all_data = list(self.iter_multiple_tickers(tickers, days_back, fetch_details))
+
         if all_data:
             combined = pd.concat(all_data, ignore_index=True)
             return combined
@@ -318,6 +396,11 @@ class SECInsiderTrading:
             return pd.DataFrame()
 
 
+# Trailing-year stake change (insider_holdings.annotate) that moves the score by one
+STAKE_GROWTH = 0.25  # grew their holdings by a quarter or more
+STAKE_EXIT = 0.5     # sold half or more of their holdings
+
+
 class InsiderSignalAnalyzer:
     """Analyze insider trading and generate signals"""
 
@@ -367,6 +450,14 @@ class InsiderSignalAnalyzer:
         elif 'director' in position:
             score += 1
 
+        # Stake change over the trailing year, when the holdings index supplied it
+        stake_change = transaction.get('stake_change_pct')
+        if pd.notna(stake_change):
+            if stake_change >= STAKE_GROWTH:
+                score += 1
+            elif stake_change <= -STAKE_EXIT:
+                score -= 1
+
         # Determine signal
         if score >= 5:
             return 'STRONG_BUY'
@@ -379,115 +470,239 @@ class InsiderSignalAnalyzer:
         else:
             return 'STRONG_SELL'
 
+    SIGNALS = np.array(['STRONG_SELL', 'SELL', 'NEUTRAL', 'BUY', 'STRONG_BUY'], dtype=object)
+
+    @staticmethod
+    def position_roles(position: pd.Series) -> np.ndarray:
+        """CEO, CFO, Director or Other per title, matched like calculate_signal"""
+        # Titles repeat a lot: classify each distinct one once
+        codes, titles = pd.factorize(position, use_na_sentinel=False)
+        titles = pd.Series([str(title).lower() for title in titles], dtype=object)
+
+        def mentions(*words):
+            return np.logical_or.reduce([titles.str.contains(word, regex=False).to_numpy() for word in words])
+
+        roles = np.select([
+            mentions('ceo', 'chief executive'),
+            mentions('cfo', 'chief financial'),
+            mentions('director')
+        ], ['CEO', 'CFO', 'Director'], 'Other')
+        return roles[codes]
+
+    @staticmethod
+    def calculate_signals(df: pd.DataFrame) -> pd.Series:
+        """calculate_signal for every row at once, as array operations"""
+        code = df['transaction_code'] if 'transaction_code' in df else pd.Series('', index=df.index)
+        value = df['total_value'] if 'total_value' in df else pd.Series(0, index=df.index)
+        position = df['position'] if 'position' in df else pd.Series('', index=df.index)
+        role = InsiderSignalAnalyzer.position_roles(position)
+
+        score = np.select([code == 'P', code == 'S', code == 'A'], [2, -1, 1], 0)
+        score += np.select([value > 1000000, value > 100000], [2, 1], 0)
+        score += np.select([role == 'CEO', role == 'CFO', role == 'Director'], [2, 2, 1], 0)
+        if 'stake_change_pct' in df:
+            stake_change = df['stake_change_pct'].astype(float)
+            score += np.select([stake_change >= STAKE_GROWTH, stake_change <= -STAKE_EXIT], [1, -1], 0)
+
+        # Same cut-offs as calculate_signal: >= -2 SELL, >= 0 NEUTRAL, >= 3 BUY, >= 5 STRONG_BUY
+        bucket = np.searchsorted([-2, 0, 3, 5], score, side='right')
+        return pd.Series(InsiderSignalAnalyzer.SIGNALS[bucket], index=df.index)
+
     @staticmethod
     def analyze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         """Add signal column to DataFrame"""
         if df.empty:
             return df
 
-        df = df.copy()
-        df['signal'] = df.apply(InsiderSignalAnalyzer.calculate_signal, axis=1)
-        df['transaction_type'] = df['transaction_code'].map(
-            InsiderSignalAnalyzer.TRANSACTION_CODES
-        ).fillna(df['transaction_code'])
+        with allocations('analyze_dataframe'):
+            df = df.copy()
+            df['signal'] = InsiderSignalAnalyzer.calculate_signals(df)
+            ROWS_SCORED.inc(len(df))
+            df['transaction_type'] = df['transaction_code'].map(
+                InsiderSignalAnalyzer.TRANSACTION_CODES
+            ).fillna(df['transaction_code'])
 
         return df
 
 
-def main():
-    """Main function"""
-    parser = argparse.ArgumentParser(description='Fetch SEC Form 4 insider trading data')
+async def fetch_concurrently(tickers: List[str], args: argparse.Namespace,
+                             handle: Callable[[pd.DataFrame], None]):
+    """Fetch all tickers on one event loop with the async client, handing each result to `handle`"""
+    from insider_trading_async import AsyncSECInsiderTrading
 
-    parser.add_argument('--ticker', type=str, help='Stock ticker symbol')
-    parser.add_argument('--tickers', type=str, help='Comma-separated list of ticker symbols')
-    parser.add_argument('--days', type=int, default=30, help='Number of days to look back (default: 30)')
-    parser.add_argument('--details', action='store_true', help='Fetch detailed transaction data')
-    parser.add_argument('--signals', action='store_true', help='Generate trading signals')
-    parser.add_argument('--output', type=str, help='Output CSV file path')
-    parser.add_argument('--user-agent', type=str, default='Your Name (your.email@example.com)',
-                       help='User-Agent header for SEC requests')
-
-    args = parser.parse_args()
+    async with AsyncSECInsiderTrading(user_agent=args.user_agent, concurrency=args.concurrency) as sec:
+        async for df in sec.iter_multiple_tickers(tickers, days_back=args.days, fetch_details=args.details):
+            handle(df)
 
-    # Validate arguments
-    if not args.ticker and not args.tickers:
-        parser.error('Either --ticker or --tickers must be specified')
-
-    # Determine tickers to fetch
-    if args.tickers:
-        tickers = [t.strip().upper() for t in args.tickers.split(',')]
-    else:
-        tickers = [args.ticker.upper()]
 
-    print(f"Fetching insider trading data for: {', '.join(tickers)}")
-    print(f"Looking back {args.days} days")
-    print()
+def run(sec: SECInsiderTrading, tickers: List[str], args: argparse.Namespace):
+    """Fetch, score and print/save results for the parsed CLI arguments
 
-    # Initialize fetcher
-    sec = SECInsiderTrading(user_agent=args.user_agent)
+    Each ticker's rows are scored, written to --output and folded into the
+    summary as they arrive; only the console table needs them all at once,
+    so --summary-only keeps nothing.
+    """
+    score = args.signals and args.details
+    try:
+        writer = open_writer(args.output, output_dtypes(args.details, score), args.format) if args.output else None
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        return
+    frames = []
+    stats: Dict[str, Dict] = {}
+    signal_counts: Dict[str, int] = {}
+
+    def handle(df: pd.DataFrame):
+        if score:
+            df = InsiderSignalAnalyzer.analyze_dataframe(df)
+            for signal, count in df['signal'].value_counts().items():
+                signal_counts[signal] = signal_counts.get(signal, 0) + count
+
+        for ticker, ticker_df in df.groupby('ticker', sort=False):
+            entry = stats.setdefault(ticker, {'rows': 0, 'value': 0.0, 'bullish': 0, 'bearish': 0})
+            entry['rows'] += len(ticker_df)
+            if args.details:
+                entry['value'] += ticker_df['total_value'].sum()
+            if score:
+                entry['bullish'] += ticker_df['signal'].isin(['BUY', 'STRONG_BUY']).sum()
+                entry['bearish'] += ticker_df['signal'].isin(['SELL', 'STRONG_SELL']).sum()
+
+        if writer:
+            try:
+                writer.write(df)
+            except (ValueError, TypeError) as e:
+                # A partial file must not pass for a complete one
+                raise SystemExit(f"✗ Cannot write {args.output}: {e}")
+        if not args.summary_only:
+            frames.append(df)
 
     # Fetch data
-    df = sec.get_multiple_tickers(tickers, days_back=args.days, fetch_details=args.details)
+    try:
+        if args.concurrency:
+            asyncio.run(fetch_concurrently(tickers, args, handle))
+        else:
+            for df in sec.iter_multiple_tickers(tickers, days_back=args.days, fetch_details=args.details):
+                handle(df)
+    finally:
+        if writer:
+            writer.close()
 
-    if df.empty:
+    if not stats:
         print("\n✗ No data found")
         return
 
-    # Generate signals if requested
-    if args.signals and args.details:
+    if score:
         print("\n" + "="*60)
-        print("Generating trading signals...")
+        print("Trading signals")
         print("="*60)
 
-        df = InsiderSignalAnalyzer.analyze_dataframe(df)
-
         # Show signal summary
         print("\nSignal Summary:")
-        print(df['signal'].value_counts())
+        print(pd.Series(signal_counts, name='count').rename_axis('signal').sort_values(ascending=False))
 
     # Display results
-    print("\n" + "="*60)
-    print("Results")
-    print("="*60)
+    if not args.summary_only:
+        df = pd.concat(frames, ignore_index=True)
 
-    if args.details:
-        # Show detailed transactions
-        display_cols = ['ticker', 'filing_date', 'insider_name', 'position',
-                       'transaction_type', 'shares', 'total_value']
+        print("\n" + "="*60)
+        print("Results")
+        print("="*60)
 
-        if args.signals:
-            display_cols.append('signal')
+        if args.details:
+            # Show detailed transactions
+            display_cols = ['ticker', 'filing_date', 'insider_name', 'position',
+                           'transaction_type', 'shares', 'total_value']
 
-        print(df[display_cols].to_string(index=False))
+            if args.signals:
+                display_cols.append('signal')
+
+            print(df[display_cols].to_string(index=False))
+        else:
+            # Show filing summary
+            print(df.to_string(index=False))
 
-        # Show summary statistics
+    # Show summary statistics
+    if args.details or args.summary_only:
         print("\n" + "="*60)
         print("Summary Statistics")
         print("="*60)
 
-        for ticker in df['ticker'].unique():
-            ticker_df = df[df['ticker'] == ticker]
+        for ticker, entry in stats.items():
             print(f"\n{ticker}:")
-            print(f"  Total transactions: {len(ticker_df)}")
-            print(f"  Total value: ${ticker_df['total_value'].sum():,.2f}")
+            if not args.details:
+                print(f"  Filings: {entry['rows']}")
+                continue
+
+            print(f"  Total transactions: {entry['rows']}")
+            print(f"  Total value: ${entry['value']:,.2f}")
 
             if args.signals:
-                bullish = ticker_df[ticker_df['signal'].isin(['BUY', 'STRONG_BUY'])]
-                bearish = ticker_df[ticker_df['signal'].isin(['SELL', 'STRONG_SELL'])]
+                print(f"  Bullish signals: {entry['bullish']}")
+                print(f"  Bearish signals: {entry['bearish']}")
+
+    if writer:
+        print(f"\n✓ {writer.rows} rows saved to {args.output}")
+
+    print(f"\n✓ Complete!")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Fetch SEC Form 4 insider trading data')
 
-                print(f"  Bullish signals: {len(bullish)}")
-                print(f"  Bearish signals: {len(bearish)}")
+    parser.add_argument('--ticker', type=str, help='Stock ticker symbol')
+    parser.add_argument('--tickers', type=str, help='Comma-separated list of ticker symbols')
+    parser.add_argument('--days', type=int, default=30, help='Number of days to look back (default: 30)')
+    parser.add_argument('--details', action='store_true', help='Fetch detailed transaction data')
+    parser.add_argument('--signals', action='store_true', help='Generate trading signals')
+    parser.add_argument('--output', type=str,
+                       help='Output file path; rows are written per ticker as they are fetched')
+    parser.add_argument('--format', choices=FORMATS,
+                       help='Output format (default: from the --output extension, else csv)')
+    parser.add_argument('--summary-only', action='store_true',
+                       help='Print only the per-ticker summary instead of the full results table')
+    parser.add_argument('--user-agent', type=str, default='Your Name (your.email@example.com)',
+                       help='User-Agent header for SEC requests')
+    parser.add_argument('--concurrency', type=int, default=0,
+                       help='Fetch tickers and filings concurrently with up to N requests in flight (needs aiohttp)')
+    parser.add_argument('--metrics-json', type=str,
+                       help='Write request/parse/scoring metrics to this JSON file when done')
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                       help='Write CPU and allocation profiles of this run under DIR (default: profiles/)')
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if not args.ticker and not args.tickers:
+        parser.error('Either --ticker or --tickers must be specified')
+    if args.format and not args.output:
+        parser.error('--format needs --output')
 
+    # Determine tickers to fetch
+    if args.tickers:
+        tickers = [t.strip().upper() for t in args.tickers.split(',')]
     else:
-        # Show filing summary
-        print(df.to_string(index=False))
+        tickers = [args.ticker.upper()]
+
+    print(f"Fetching insider trading data for: {', '.join(tickers)}")
+    print(f"Looking back {args.days} days")
+    print()
 
-    # Save to CSV if requested
-    if args.output:
-        df.to_csv(args.output, index=False)
-        print(f"\n✓ Data saved to {args.output}")
+    profiler = Profiler('fetcher', args.profile) if args.profile else None
+    if profiler:
+        profiler.start()
 
-    print(f"\n✓ Complete!")
+    # Initialize fetcher
+    sec = SECInsiderTrading(user_agent=args.user_agent)
+
+    try:
+        run(sec, tickers, args)
+    finally:
+        if profiler:
+            profiler.stop()
+        if args.metrics_json:
+            REGISTRY.write_json(args.metrics_json)
+            print(f"\n✓ Metrics saved to {args.metrics_json}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Incremental EDGAR Atom feed parser
+
+Parses getcurrent and getcompany Form 4 feeds from a byte stream using
+ElementTree's pull parser, so entries are available as soon as their
+closing tag arrives and each entry element is freed once extracted.
+Parsing stops at the first already-seen accession (feeds are newest first).
+
+Usage:
+    parser = AtomFeedParser(stop_at=monitor.is_seen)
+    async for chunk in response.content.iter_chunked(16384):
+        entries.extend(parser.feed(chunk))
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional
+
+ACCESSION_RE = re.compile(r'(\d{10}-\d{2}-\d{6})')
+TITLE_RE = re.compile(r'^\s*(?P<form>[^\s]+)\s+-\s+(?P<name>.*?)\s+\((?P<cik>\d{10})\)\s+\((?P<role>[^)]+)\)')
+ARCHIVE_CIK_RE = re.compile(r'/edgar/data/(\d+)/')
+FILED_RE = re.compile(r'Filed:\s*(?:</b>)?\s*(\d{4}-\d{2}-\d{2})')
+
+# Child elements of <entry> whose text we keep
+ENTRY_FIELDS = {
+    'title', 'summary', 'updated', 'id', 'accession-number', 'filing-date',
+    'filing-type', 'filing-href'
+}
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class AtomFeedParser:
+    """Streaming parser yielding monitor entry dicts"""
+
+    def __init__(self, stop_at: Optional[Callable[[str], bool]] = None):
+        self.stop_at = stop_at
+        self.stopped = False
+        self.company_cik = ''
+        self.company_name = ''
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._root = None
+        self._in_entry = False
+        self._in_company = False
+        self._fields: Dict[str, str] = {}
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """Consume a chunk of the response body, returning completed entries"""
+        if self.stopped:
+            return []
+
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict]:
+        """Finish parsing; returns any entries completed by the final chunk"""
+        if self.stopped:
+            return []
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[Dict]:
+        entries = []
+
+        for event, elem in self._parser.read_events():
+            tag = _local(elem.tag)
+
+            if event == 'start':
+                if self._root is None:
+                    self._root = elem
+                elif tag == 'entry':
+                    self._in_entry = True
+                    self._fields = {}
+                elif tag == 'company-info':
+                    self._in_company = True
+                continue
+
+            if self._in_entry:
+                if tag in ENTRY_FIELDS:
+                    self._fields[tag] = (elem.text or '').strip()
+                elif tag == 'link':
+                    self._fields.setdefault('link', elem.get('href', ''))
+                elif tag == 'category':
+                    self._fields['category'] = elem.get('term', '')
+                elif tag == 'entry':
+                    self._in_entry = False
+                    entry = self._build_entry(self._fields)
+                    self._root.clear()  # release parsed entries
+
+                    if self.stop_at and entry['accession_number'] and self.stop_at(entry['accession_number']):
+                        self.stopped = True
+                        break
+                    entries.append(entry)
+
+            elif self._in_company:
+                if tag == 'cik':
+                    self.company_cik = (elem.text or '').strip().zfill(10)
+                elif tag == 'conformed-name':
+                    self.company_name = (elem.text or '').strip()
+                elif tag == 'company-info':
+                    self._in_company = False
+
+        return entries
+
+    def _build_entry(self, fields: Dict[str, str]) -> Dict:
+        link = fields.get('filing-href') or fields.get('link', '')
+
+        accession = fields.get('accession-number', '')
+        if not accession:
+            match = ACCESSION_RE.search(fields.get('id', '')) or ACCESSION_RE.search(link)
+            accession = match.group(1) if match else ''
+
+        # getcurrent titles: "4 - Name (0001234567) (Reporting)"
+        company_name = self.company_name
+        cik = self.company_cik
+        role = 'issuer' if self.company_cik else ''
+        form = fields.get('filing-type') or fields.get('category', '')
+
+        title = TITLE_RE.match(fields.get('title', ''))
+        if title:
+            company_name = title.group('name')
+            cik = title.group('cik')
+            role = 'reporting' if title.group('role').lower().startswith('report') else 'issuer'
+            form = form or title.group('form')
+
+        if not cik:
+            match = ARCHIVE_CIK_RE.search(link)
+            cik = match.group(1).zfill(10) if match else ''
+
+        filing_date = fields.get('filing-date', '')
+        if not filing_date:
+            match = FILED_RE.search(fields.get('summary', ''))
+            filing_date = match.group(1) if match else ''
+
+        return {
+            'accession_number': accession,
+            'ticker': '',
+            'company_name': company_name,
+            'cik': cik,
+            'role': role,
+            'form': form,
+            'filing_date': filing_date,
+            'filed_date': fields.get('updated', ''),
+            'url': link,
+            'summary': fields.get('summary', '')
+        }
+
+
+def parse_atom(data: bytes, stop_at: Optional[Callable[[str], bool]] = None,
+               chunk_size: int = 16384) -> List[Dict]:
+    """Parse a complete feed body (convenience wrapper, chunked like a stream)"""
+    parser = AtomFeedParser(stop_at=stop_at)
+    entries = []
+    for i in range(0, len(data), chunk_size):
+        entries.extend(parser.feed(data[i:i + chunk_size]))
+        if parser.stopped:
+            return entries
+    entries.extend(parser.close())
+    return entries
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming Atom parser vs feedparser
+
+Builds a synthetic 100-entry getcurrent Form 4 page (same shape as EDGAR's)
+and times full parses with both parsers, plus the early-stop case where the
+monitor has already seen everything past the first few entries.
+
+Usage:
+    python scrapers/bench_atom_parser.py
+    python scrapers/bench_atom_parser.py --entries 100 --rounds 200
+    python scrapers/bench_atom_parser.py --file saved_getcurrent.xml
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from atom_parser import parse_atom
+
+ENTRY_TEMPLATE = '''<entry>
+<title>4 - {name} ({cik}) ({role})</title>
+<link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/edgar/data/{cik_int}/{acc_clean}/{acc}-index.htm"/>
+<summary type="html"> &lt;b&gt;Filed:&lt;/b&gt; 2025-02-07 &lt;b&gt;AccNo:&lt;/b&gt; {acc} &lt;b&gt;Size:&lt;/b&gt; 5 KB</summary>
+<updated>2025-02-07T16:{minute:02d}:12-05:00</updated>
+<category scheme="https://www.sec.gov/" label="form type" term="4"/>
+<id>urn:tag:sec.gov,2008:accession-number={acc}</id>
+</entry>
+'''
+
+
+def build_feed(entries: int) -> bytes:
+    """Synthetic getcurrent page; each accession appears as issuer and reporting owner"""
+    parts = [
+        '<?xml version="1.0" encoding="ISO-8859-1" ?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        '<title>Latest Filings - Mon, 07 Feb 2025 16:59:59 EST</title>\n'
+        '<link rel="alternate" href="/cgi-bin/browse-edgar?action=getcurrent"/>\n'
+        '<updated>2025-02-07T16:59:59-05:00</updated>\n'
+    ]
+    for i in range(entries):
+        acc = f'0001209191-25-{i // 2:06d}'
+        cik = f'{1000000 + i:010d}'
+        parts.append(ENTRY_TEMPLATE.format(
+            name=f'Company {i} Inc' if i % 2 else f'Insider {i} John',
+            cik=cik,
+            cik_int=int(cik),
+            role='Issuer' if i % 2 else 'Reporting',
+            acc=acc,
+            acc_clean=acc.replace('-', ''),
+            minute=59 - i % 60
+        ))
+    parts.append('</feed>\n')
+    return ''.join(parts).encode('latin-1')
+
+
+def bench(label: str, func: Callable, rounds: int):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    elapsed = (time.perf_counter() - start) / rounds
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<34} {elapsed * 1000:8.3f} ms/page  {peak / 1024:8.1f} KiB peak  {len(result):4d} entries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Atom feed parsers')
+    parser.add_argument('--entries', type=int, default=100, help='Entries per synthetic page')
+    parser.add_argument('--rounds', type=int, default=200, help='Timed rounds per parser')
+    parser.add_argument('--file', type=str, help='Use a saved EDGAR Atom page instead')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            data = f.read()
+    else:
+        data = build_feed(args.entries)
+
+    print(f"Feed size: {len(data) / 1024:.1f} KiB\n")
+
+    bench('atom_parser (full page)', lambda: parse_atom(data), args.rounds)
+
+    entries = parse_atom(data)
+    if len(entries) > 10:
+        # Everything after the 10th entry was seen on the previous poll
+        seen = {e['accession_number'] for e in entries[10:]}
+        bench('atom_parser (early stop @10)', lambda: parse_atom(data, stop_at=seen.__contains__), args.rounds)
+
+    try:
+        import feedparser
+    except ImportError:
+        print("feedparser not installed; skipping comparison")
+        return
+
+    bench('feedparser', lambda: feedparser.parse(data).entries, max(args.rounds // 10, 1))
+
+
+if __name__ == '__main__':
+    main()
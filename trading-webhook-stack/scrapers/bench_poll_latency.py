@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: acceptance-to-alert latency of the low-latency polling mode
+
+Runs SECForm4Monitor.monitor_fast against a local simulated EDGAR that
+"accepts" Form 4 filings at random (Poisson) times and serves them on a
+getcurrent Atom feed with ETag support, plus a local webhook sink. Reports
+the latency from acceptance to webhook delivery and the request rate spent.
+
+Usage:
+    python scrapers/bench_poll_latency.py
+    python scrapers/bench_poll_latency.py --duration 120 --poll-seconds 5 --rate 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from sec_monitor import SECForm4Monitor, percentile
+
+ENTRY = '''<entry>
+<title>4 - Company {n} Inc ({cik}) (Issuer)</title>
+<link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/edgar/data/{cik_int}/{acc_clean}/{acc}-index.htm"/>
+<summary type="html"> &lt;b&gt;Filed:&lt;/b&gt; {day} &lt;b&gt;AccNo:&lt;/b&gt; {acc}</summary>
+<updated>{updated}</updated>
+<category scheme="https://www.sec.gov/" label="form type" term="4"/>
+<id>urn:tag:sec.gov,2008:accession-number={acc}</id>
+</entry>
+'''
+
+
+class SimulatedEdgar:
+    """getcurrent feed backed by filings accepted at Poisson arrival times"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.filings = []  # newest first: (accession, accepted_at, xml)
+        self.accepted_at = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    async def accept_filings(self):
+        n = 0
+        while True:
+            await asyncio.sleep(random.expovariate(self.rate))
+            n += 1
+            acc = f'0009999999-25-{n:06d}'
+            cik = f'{1000000 + n:010d}'
+            now = time.time()
+            xml = ENTRY.format(
+                n=n, cik=cik, cik_int=int(cik), acc=acc, acc_clean=acc.replace('-', ''),
+                day=time.strftime('%Y-%m-%d'), updated=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+            )
+            self.filings.insert(0, (acc, now, xml))
+            self.accepted_at[acc] = now
+
+    async def company_tickers(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            str(n): {'cik_str': 1000000 + n, 'ticker': f'T{n}', 'title': f'Company {n} Inc'}
+            for n in range(1, 10000)
+        })
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        etag = f'"{self.filings[0][0]}"' if self.filings else '"empty"'
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        start = int(request.query.get('start', 0))
+        count = int(request.query.get('count', 100))
+        page = ''.join(xml for _, _, xml in self.filings[start:start + count])
+        body = f'<?xml version="1.0"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n{page}</feed>\n'
+        return web.Response(body=body.encode(), content_type='application/atom+xml', headers={'ETag': etag})
+
+
+async def run(args):
+    edgar = SimulatedEdgar(args.rate)
+    latencies = []
+
+    async def webhook(request: web.Request) -> web.Response:
+        received = time.time()
+        data = await request.json()
+        acc = data['url'].rsplit('/', 1)[-1].replace('-index.htm', '')
+        if acc in edgar.accepted_at:
+            latencies.append(received - edgar.accepted_at[acc])
+        return web.json_response({'status': 'ok'})
+
+    app = web.Application()
+    app.router.add_get('/cgi-bin/browse-edgar', edgar.handle)
+    app.router.add_get('/files/company_tickers.json', edgar.company_tickers)
+    app.router.add_post('/webhook', webhook)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', args.port).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = SECForm4Monitor(
+            db_path=str(Path(tmp) / 'bench.db'),
+            webhook_url=f'http://127.0.0.1:{args.port}/webhook'
+        )
+        monitor.browse_url = f'http://127.0.0.1:{args.port}/cgi-bin/browse-edgar'
+        monitor.company_tickers_url = f'http://127.0.0.1:{args.port}/files/company_tickers.json'
+
+        accepting = asyncio.create_task(edgar.accept_filings())
+        polling = asyncio.create_task(monitor.monitor_fast(poll_seconds=args.poll_seconds))
+        await asyncio.sleep(args.duration)
+
+        for task in (accepting, polling):
+            task.cancel()
+        await monitor.close()
+
+    await runner.cleanup()
+
+    minutes = args.duration / 60
+    print(f"\nFilings accepted:   {len(edgar.accepted_at)}")
+    print(f"Alerts delivered:   {len(latencies)}")
+    print(f"SEC requests:       {edgar.requests} ({edgar.requests / minutes:.1f}/min, "
+          f"{edgar.not_modified} answered 304)")
+    print("Acceptance-to-alert latency:")
+    for pct in (50, 95, 99):
+        print(f"  p{pct}: {percentile(latencies, pct):6.2f}s")
+    print(f"  max: {max(latencies, default=0):6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark low-latency polling')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run')
+    parser.add_argument('--poll-seconds', type=float, default=5.0, help='Monitor poll period')
+    parser.add_argument('--rate', type=float, default=0.5, help='Simulated filings per second')
+    parser.add_argument('--port', type=int, default=8089, help='Local port for the simulator')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Compiled CIK -> ticker index for resolving feed entries
+
+Built once from SEC's company_tickers.json and stored as a compact,
+memory-mappable open-addressing hash table, so a restart maps the file
+instead of re-parsing JSON. Lookups are O(1): one multiplicative hash and a
+short linear probe over fixed-size slots.
+
+File layout (little endian):
+    header   magic 'CIKX', u16 version, u16 reserved, u32 slot_count, u32 entry_count
+    slots    slot_count x (u32 cik, u32 string_offset); cik 0 marks an empty slot
+    strings  NUL-terminated ASCII tickers
+"""
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+MAGIC = b'CIKX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+SLOT = struct.Struct('<II')
+
+
+def _slot_for(cik: int, slot_count: int) -> int:
+    return ((cik * 2654435761) & 0xFFFFFFFF) & (slot_count - 1)
+
+
+class CikIndex:
+    """Read-only CIK -> ticker lookup over a memory-mapped index file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self.slot_count, self.entry_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a CIK index file: {path}")
+        self._strings = HEADER.size + self.slot_count * SLOT.size
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def ticker(self, cik) -> Optional[str]:
+        """Ticker for an issuer CIK (str or int), or None for non-issuers"""
+        try:
+            cik = int(cik)
+        except (TypeError, ValueError):
+            return None
+        if cik <= 0 or not self.slot_count:
+            return None
+
+        mask = self.slot_count - 1
+        slot = _slot_for(cik, self.slot_count)
+        while True:
+            slot_cik, offset = SLOT.unpack_from(self._mm, HEADER.size + slot * SLOT.size)
+            if slot_cik == cik:
+                start = self._strings + offset
+                return self._mm[start:self._mm.find(b'\0', start)].decode('ascii')
+            if slot_cik == 0:
+                return None
+            slot = (slot + 1) & mask
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        """All (cik, ticker) pairs, in slot order"""
+        for slot in range(self.slot_count):
+            cik, offset = SLOT.unpack_from(self._mm, HEADER.size + slot * SLOT.size)
+            if cik:
+                start = self._strings + offset
+                yield cik, self._mm[start:self._mm.find(b'\0', start)].decode('ascii')
+
+    def is_issuer(self, cik) -> bool:
+        """Listed companies are issuers; reporting owners are not in the ticker map"""
+        return self.ticker(cik) is not None
+
+    def close(self):
+        self._mm.close()
+
+    @staticmethod
+    def build(company_tickers: Dict, path: str) -> 'CikIndex':
+        """Compile SEC company_tickers.json data into an index file at `path`"""
+        tickers: Dict[int, str] = {}
+        for item in company_tickers.values():
+            # The first listing per CIK is the primary share class (GOOGL before GOOG)
+            tickers.setdefault(int(item['cik_str']), item['ticker'].upper())
+
+        slot_count = 1
+        while slot_count < len(tickers) * 2:
+            slot_count <<= 1
+
+        slots = bytearray(slot_count * SLOT.size)
+        strings = bytearray()
+        for cik, ticker in tickers.items():
+            slot = _slot_for(cik, slot_count)
+            while SLOT.unpack_from(slots, slot * SLOT.size)[0]:
+                slot = (slot + 1) & (slot_count - 1)
+            SLOT.pack_into(slots, slot * SLOT.size, cik, len(strings))
+            strings += ticker.encode('ascii', 'replace') + b'\0'
+
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, slot_count, len(tickers)))
+            f.write(slots)
+            f.write(strings)
+        os.replace(tmp, path)
+
+        return CikIndex(path)
+
+    @staticmethod
+    def is_fresh(path: str, max_age_seconds: float) -> bool:
+        """True if the index file exists and is younger than max_age_seconds"""
+        try:
+            return time.time() - Path(path).stat().st_mtime < max_age_seconds
+        except OSError:
+            return False
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Compressed storage, archival and vacuuming for filings.raw_data
+
+Raw payloads are small, repetitive JSON documents, so plain zlib gains
+little per row. A preset dictionary trained on recent payloads (the keys,
+the summary HTML and the EDGAR URL prefixes they all share) lets each row
+compress against that shared context instead.
+
+    raw_codec NULL   raw_data is the original JSON text
+    raw_codec 0      zlib, no dictionary
+    raw_codec N      zlib with payload_dicts.id = N as preset dictionary
+
+Rows past the archive age are appended to gzip partitions, one per month
+(filings-YYYY-MM.jsonl.gz), and their raw_data is cleared; the filing row
+itself stays, so transactions and stats keep working. Freed pages are
+returned to the filesystem a slice at a time with incremental vacuum.
+
+All functions taking a connection are meant to run as SQLiteWriter jobs.
+"""
+
+import gzip
+import json
+import logging
+import re
+import sqlite3
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DICT_SIZE = 16 * 1024
+MIN_TRAINING_SAMPLES = 200
+TRAINING_SAMPLES = 2000
+
+# Byte runs without digits: keys, markup and URL prefixes shared by payloads
+_SEGMENT_RE = re.compile(rb'\D{4,}')
+
+
+def init_tables(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS payload_dicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dict BLOB NOT NULL,
+            samples INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(filings)')}
+    if 'raw_codec' not in columns:
+        conn.execute('ALTER TABLE filings ADD COLUMN raw_codec INTEGER')
+    if 'archived' not in columns:
+        conn.execute('ALTER TABLE filings ADD COLUMN archived TEXT')
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = DICT_SIZE) -> bytes:
+    """Build a zlib preset dictionary from sample payloads
+
+    Segments are scored by how many samples contain them times their
+    length. The best ones go last, since zlib reaches the end of the
+    dictionary with the shortest distances.
+    """
+    document_freq: Counter = Counter()
+    count = 0
+    for sample in samples:
+        document_freq.update(set(_SEGMENT_RE.findall(sample)))
+        count += 1
+
+    threshold = max(2, count // 20)
+    ranked = sorted(
+        (segment for segment, freq in document_freq.items() if freq >= threshold),
+        key=lambda segment: document_freq[segment] * len(segment)
+    )
+
+    parts = []
+    total = 0
+    for segment in reversed(ranked):
+        if total + len(segment) > size:
+            continue
+        parts.append(segment)
+        total += len(segment)
+
+    return b''.join(reversed(parts))
+
+
+class PayloadCodec:
+    """Encode/decode raw_data with the newest trained dictionary"""
+
+    def __init__(self, dicts: Optional[Dict[int, bytes]] = None):
+        self.dicts = dict(dicts or {})
+        self.current = max(self.dicts, default=0)
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> 'PayloadCodec':
+        return cls(dict(conn.execute('SELECT id, dict FROM payload_dicts')))
+
+    def refresh(self, conn: sqlite3.Connection):
+        """Pick up dictionaries trained by other workers sharing the database"""
+        for dict_id, zdict in conn.execute('SELECT id, dict FROM payload_dicts WHERE id > ?', (self.current,)):
+            self.dicts[dict_id] = zdict
+            self.current = dict_id
+
+    def encode(self, text: str) -> Tuple[bytes, int]:
+        """Compress a payload; returns (blob, raw_codec)"""
+        data = text.encode()
+        if not self.current:
+            return zlib.compress(data, 9), 0
+
+        compressor = zlib.compressobj(9, zdict=self.dicts[self.current])
+        return compressor.compress(data) + compressor.flush(), self.current
+
+    def decode(self, raw, codec: Optional[int]) -> Optional[str]:
+        """Original payload text for a stored raw_data value"""
+        if raw is None or codec is None:
+            return raw
+        if not codec:
+            return zlib.decompress(raw).decode()
+
+        decompressor = zlib.decompressobj(zdict=self.dicts[codec])
+        return (decompressor.decompress(raw) + decompressor.flush()).decode()
+
+    def retrain(self, conn: sqlite3.Connection, max_age_days: int = 30) -> Optional[int]:
+        """Train a new dictionary once the current one is missing or stale; returns its id"""
+        self.refresh(conn)
+        fresh = conn.execute(
+            "SELECT 1 FROM payload_dicts WHERE id = ? AND created_at >= datetime('now', ?)",
+            (self.current, f'-{max_age_days} days')
+        ).fetchone()
+        if fresh:
+            return None
+
+        rows = conn.execute(
+            'SELECT raw_data, raw_codec FROM filings WHERE raw_data IS NOT NULL ORDER BY id DESC LIMIT ?',
+            (TRAINING_SAMPLES,)
+        ).fetchall()
+        if len(rows) < MIN_TRAINING_SAMPLES:
+            return None
+
+        samples = [self.decode(raw, codec).encode() for raw, codec in rows]
+        zdict = train_dictionary(samples)
+        cursor = conn.execute('INSERT INTO payload_dicts (dict, samples) VALUES (?, ?)', (zdict, len(samples)))
+        self.dicts[cursor.lastrowid] = zdict
+        self.current = cursor.lastrowid
+        return self.current
+
+
+def compact_rows(conn: sqlite3.Connection, codec: PayloadCodec, limit: int = 5000) -> int:
+    """Compress up to `limit` rows still stored as plain text"""
+    codec.refresh(conn)
+    rows = conn.execute(
+        'SELECT id, raw_data FROM filings WHERE raw_codec IS NULL AND raw_data IS NOT NULL LIMIT ?',
+        (limit,)
+    ).fetchall()
+
+    updates = []
+    for row_id, raw in rows:
+        blob, codec_id = codec.encode(raw)
+        updates.append((blob, codec_id, row_id))
+
+    conn.executemany('UPDATE filings SET raw_data = ?, raw_codec = ? WHERE id = ?', updates)
+    return len(updates)
+
+
+def archive_rows(conn: sqlite3.Connection, codec: PayloadCodec, archive_dir: str,
+                 older_than_days: int, limit: int = 5000) -> int:
+    """Move raw payloads past the archive age into monthly gzip partitions"""
+    codec.refresh(conn)
+    rows = conn.execute('''
+        SELECT id, accession_number, strftime('%Y-%m', created_at), raw_data, raw_codec
+        FROM filings
+        WHERE created_at < datetime('now', ?) AND raw_data IS NOT NULL
+        ORDER BY id
+        LIMIT ?
+    ''', (f'-{older_than_days} days', limit)).fetchall()
+    if not rows:
+        return 0
+
+    partitions: Dict[str, list] = {}
+    for row_id, accession, month, raw, codec_id in rows:
+        partitions.setdefault(month or 'unknown', []).append((row_id, accession, codec.decode(raw, codec_id)))
+
+    directory = Path(archive_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for month, items in partitions.items():
+        # Appending adds a gzip member; multi-member files read back as one stream
+        name = f'filings-{month}.jsonl.gz'
+        with gzip.open(directory / name, 'at', encoding='utf-8') as f:
+            for _, accession, payload in items:
+                f.write(json.dumps({'accession_number': accession, 'raw_data': payload}) + '\n')
+
+        conn.executemany(
+            'UPDATE filings SET raw_data = NULL, raw_codec = NULL, archived = ? WHERE id = ?',
+            [(name, row_id) for row_id, _, _ in items]
+        )
+
+    return len(rows)
+
+
+def incremental_vacuum(conn: sqlite3.Connection, max_pages: int = 2000) -> int:
+    """Return up to `max_pages` free pages to the filesystem; returns pages freed
+
+    The first call on a database created without incremental auto-vacuum
+    switches it over, which needs one full VACUUM.
+    """
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        conn.commit()
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        logger.info('Enabled incremental auto-vacuum (one-time full VACUUM)')
+
+    before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    conn.execute(f'PRAGMA incremental_vacuum({int(max_pages)})').fetchall()
+    freed = before - conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    # Shrink the WAL file back down after the bulk rewrites
+    conn.commit()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return freed
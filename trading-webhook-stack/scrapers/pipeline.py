@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Staged asyncio pipeline with bounded queues
+
+Each stage has its own input queue and worker count. Workers hand results to
+the next stage with a blocking put(), so when a stage falls behind its queue
+fills and the stage feeding it waits, pushing backpressure all the way up to
+the source instead of buffering without limit or stalling unrelated stages.
+
+Usage:
+    pipeline = Pipeline()
+    pipeline.add_stage('fetch', fetch, workers=4)
+    pipeline.add_stage('notify', notify)
+    pipeline.start()
+    await pipeline.put(job)
+    await pipeline.drain()   # let everything queued reach the end
+    await pipeline.stop()
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """One pipeline step: a bounded input queue served by N workers
+
+    The handler's return value is passed to the next stage; returning None
+    drops the item (e.g. a poll that found nothing new).
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]],
+                 workers: int = 1, queue_size: int = 8):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.next: Optional['Stage'] = None
+        self.tasks: List[asyncio.Task] = []
+
+        self.processed = 0
+        self.errors = 0
+        self.peak_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    async def put(self, item: Any):
+        """Enqueue an item, waiting while the stage is full"""
+        await self.queue.put(item)
+        self.peak_depth = max(self.peak_depth, self.queue.qsize())
+
+    async def work(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                result = await self.handler(item)
+                self.processed += 1
+                if result is not None and self.next is not None:
+                    await self.next.put(result)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Stage {self.name} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+
+class Pipeline:
+    """Stages connected in order by bounded queues"""
+
+    def __init__(self):
+        self.stages: List[Stage] = []
+
+    def add_stage(self, name: str, handler: Callable[[Any], Awaitable[Any]],
+                  workers: int = 1, queue_size: int = 8) -> Stage:
+        stage = Stage(name, handler, workers=workers, queue_size=queue_size)
+        if self.stages:
+            self.stages[-1].next = stage
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        for stage in self.stages:
+            stage.tasks = [
+                asyncio.create_task(stage.work(), name=f'{stage.name}-{i}')
+                for i in range(stage.workers)
+            ]
+
+    async def put(self, item: Any):
+        """Feed the first stage (blocks under backpressure)"""
+        await self.stages[0].put(item)
+
+    def depths(self) -> Dict[str, int]:
+        """Per-stage queue depth gauge"""
+        return {stage.name: stage.depth for stage in self.stages}
+
+    def describe(self) -> str:
+        return ' '.join(
+            f"{stage.name}={stage.depth}/{stage.queue.maxsize}" for stage in self.stages
+        )
+
+    async def drain(self):
+        """Wait until every queued item has passed through all stages
+
+        Joining the queues in order is enough: a worker forwards its result
+        before marking the item done, so once stage N is joined everything
+        it produced is already queued in stage N + 1.
+        """
+        for stage in self.stages:
+            await stage.queue.join()
+
+    async def stop(self):
+        """Cancel all workers (call drain() first to finish queued work)"""
+        tasks = [task for stage in self.stages for task in stage.tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
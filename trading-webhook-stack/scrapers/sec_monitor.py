@@ -6,19 +6,42 @@ Integrates with your existing trading webhook stack
 Usage:
     python scrapers/sec_monitor.py --ticker AAPL --interval 30
     python scrapers/sec_monitor.py --watchlist tickers.txt
+    python scrapers/sec_monitor.py --calendar --interval 30 --peak-seconds 30
 """
 
 import argparse
 import asyncio
 import aiohttp
-import feedparser
 import sqlite3
 import logging
 import json
+import math
+import random
+import re
+import signal
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Tuple
+
+# Shared fetcher/enrichment modules live in the stack root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from form4_enrichment import Form4Enricher  # noqa: E402
+from insider_metrics import (  # noqa: E402
+    REGISTRY, QUEUE_DEPTH, format_timestamp, latency_summary, observe_alert_latency,
+    parse_timestamp, percentile, sec_request, webhook_delivery
+)
+from insider_profiling import Profiler  # noqa: E402
+from atom_parser import AtomFeedParser  # noqa: E402
+from cik_index import CikIndex  # noqa: E402
+from edgar_calendar import EDGAR_TZ, EdgarCalendar  # noqa: E402
+from pipeline import Pipeline  # noqa: E402
+import payload_store  # noqa: E402
+from payload_store import PayloadCodec  # noqa: E402
+from seen_index import SeenIndex  # noqa: E402
+from shard_coordinator import ShardCoordinator, default_worker_id  # noqa: E402
+from sqlite_writer import SQLiteWriter  # noqa: E402
 
 # Configure logging
 logging.basicConfig(
@@ -30,20 +53,183 @@ logger = logging.getLogger(__name__)
 # Webhook configuration
 WEBHOOK_URL = "http://localhost:3000/webhook/insider-trading"
 
+ARCHIVE_CIK_RE = re.compile(r'/edgar/data/(\d+)/')
+
+EDGAR_BROWSE_URL = "https://www.sec.gov/cgi-bin/browse-edgar"
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+CIK_INDEX_MAX_AGE = 7 * 86400  # rebuild the compiled ticker map weekly
+CIK_INDEX_RETRY_SECONDS = 3600
+SEC_USER_AGENT = 'InsiderTradingMonitor/1.0 (contact: your-email@example.com)'
+
+# Long-lived connection pool settings
+SEC_CONNECTIONS_PER_HOST = 8
+SEC_REQUESTS_PER_SECOND = 5  # SEC allows ~10/s; stay at half
+WEBHOOK_CONNECTIONS = 8
+KEEPALIVE_SECONDS = 60
+DNS_CACHE_SECONDS = 300
+
+FEED_CHUNK_SIZE = 16384
+
+# Low-latency mode: getcurrent page size and catch-up depth
+CURRENT_PAGE_SIZE = 100
+CURRENT_MAX_PAGES = 10
+
+# Max batches waiting in front of each daemon pipeline stage
+PIPELINE_QUEUE_SIZE = 8
+PIPELINE_REPORT_SECONDS = 60
+
+# Watchlist sweeps dispatch one slice of tickers at most this often
+SWEEP_SLICE_SECONDS = 60
+
+# Calendar mode: poll period during the post-close Form 4 peak
+PEAK_POLL_SECONDS = 30
+
+
+class RateLimiter:
+    """Spaces request starts evenly so bursts never exceed the SEC rate limit"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    def set_rate(self, rate: float):
+        self.interval = 1.0 / rate
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AlertBatcher:
+    """Coalesce webhook alerts into a single array payload.
+
+    A batch is flushed when it reaches ``max_size`` alerts or when its oldest
+    alert has been queued for ``max_wait`` seconds, whichever comes first.
+    """
+
+    def __init__(self, send, max_size: int = 50, max_wait: float = 5.0):
+        self.send = send
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.pending: List[Dict] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def add(self, alert: Dict):
+        """Queue an alert, flushing if the batch is full"""
+        self.pending.append(alert)
+
+        if len(self.pending) >= self.max_size:
+            await self.flush()
+        elif self._timer is None:
+            # First alert of a new batch starts the latency clock
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Send all queued alerts as one batch payload"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self.pending:
+            return
+
+        alerts, self.pending = self.pending, []
+        await self.send({
+            'type': 'insider_trading_batch',
+            'count': len(alerts),
+            'alerts': alerts,
+            'timestamp': datetime.now().isoformat()
+        })
+
+
 class SECForm4Monitor:
     """Monitor SEC Form 4 filings with webhook integration"""
 
     def __init__(
         self,
         db_path: str = 'insider_trading.db',
-        webhook_url: str = WEBHOOK_URL
+        webhook_url: str = WEBHOOK_URL,
+        batch_size: int = 0,
+        batch_wait: float = 5.0,
+        enrich_workers: int = 0,
+        webhook_concurrency: int = WEBHOOK_CONNECTIONS,
+        seen_retention_days: int = 90,
+        sec_rate: float = SEC_REQUESTS_PER_SECOND,
+        sec_concurrency: int = SEC_CONNECTIONS_PER_HOST,
+        shard: Optional[ShardCoordinator] = None,
+        archive_days: int = 365,
+        archive_dir: Optional[str] = None
     ):
         self.db_path = db_path
         self.webhook_url = webhook_url
-        self.seen_entries: Set[str] = set()
+        self.webhook_concurrency = webhook_concurrency
+        self.seen_retention_days = seen_retention_days
+        self.last_prune = 0.0
+
+        # raw_data older than archive_days moves to monthly gzip partitions
+        self.archive_days = archive_days
+        self.archive_dir = archive_dir or str(Path(db_path).resolve().parent / 'archive')
+        self.codec = PayloadCodec()
+
+        # Long-lived HTTP sessions, created lazily on the running loop
+        self.sec_session: Optional[aiohttp.ClientSession] = None
+        self.webhook_session: Optional[aiohttp.ClientSession] = None
+        self.sec_concurrency = sec_concurrency
+        self.sec_semaphore = asyncio.Semaphore(sec_concurrency)
+        self.sec_rate = sec_rate
+        self.rate_limiter = RateLimiter(sec_rate)
+        self.browse_url = EDGAR_BROWSE_URL
+
+        # CIK -> ticker resolution, compiled next to the database
+        self.cik_index_path = str(Path(db_path).with_suffix('.cikidx'))
+        self.cik_index: Optional[CikIndex] = None
+        self.cik_index_retry_at = 0.0
+        self.company_tickers_url = COMPANY_TICKERS_URL
+        self.ticker_ciks: Dict[str, str] = {}
+
+        # Multi-worker mode: this process handles only the CIKs it owns
+        self.shard = shard
+        self.shard_by_entry = False
+        self.rescan_current = False
+
+        # Validators from the last getcurrent response, for conditional requests
+        self.current_validators: Dict[str, str] = {}
+        self.current_lock = asyncio.Lock()
+
+        # Daemon pipeline (fetch -> dedupe -> persist -> enrich -> notify)
+        self.pipeline: Optional[Pipeline] = None
+        self.stop_event = asyncio.Event()
+
+        # Optional alert coalescing (batch_size <= 1 sends one POST per filing)
+        self.batcher: Optional[AlertBatcher] = None
+        if batch_size > 1:
+            self.batcher = AlertBatcher(self.send_alert, max_size=batch_size, max_wait=batch_wait)
+
+        # Optional transaction enrichment of newly seen accessions
+        self.enricher: Optional[Form4Enricher] = None
+        if enrich_workers > 0:
+            self.enricher = Form4Enricher(max_workers=enrich_workers)
+
         self.init_database()
+        self.seen = SeenIndex(self.db_path, retention_days=seen_retention_days)
         self.load_seen_entries()
 
+        # All writes go through one background thread (WAL mode)
+        self.writer = SQLiteWriter(self.db_path)
+
+        QUEUE_DEPTH.labels(queue='sqlite_writer').set_function(self.writer.jobs.qsize)
+        if self.batcher:
+            QUEUE_DEPTH.labels(queue='alert_batch').set_function(lambda: len(self.batcher.pending))
+
     def init_database(self):
         """Initialize SQLite database"""
         conn = sqlite3.connect(self.db_path)
@@ -100,58 +286,186 @@ class SECForm4Monitor:
                 seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_seen_entries_seen_at ON seen_entries(seen_at)')
+
+        # Per-filing alert latency: EDGAR acceptance -> first seen -> saved -> delivered (epoch seconds)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_latency (
+                accession_number TEXT PRIMARY KEY,
+                ticker TEXT,
+                accepted_at REAL,
+                first_seen_at REAL,
+                persisted_at REAL,
+                sent_at REAL,
+                delivered_at REAL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alert_latency_delivered_at ON alert_latency(delivered_at)')
+
+        # Worker leases (multi-worker mode)
+        ShardCoordinator.init_table(conn)
+
+        # Compressed raw_data: codec columns and trained dictionaries
+        payload_store.init_tables(conn)
+        self.codec = PayloadCodec.load(conn)
+
+        # Filing rollups, kept current by a trigger in the inserting transaction
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS filing_stats_daily (
+                date TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                filings INTEGER DEFAULT 0,
+                PRIMARY KEY (date, ticker)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS filing_stats_ticker (
+                ticker TEXT PRIMARY KEY,
+                filings INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_filing_stats_ticker_filings ON filing_stats_ticker(filings)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_filings_created_at ON filings(created_at)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_filings_rollup AFTER INSERT ON filings BEGIN
+                INSERT INTO filing_stats_daily (date, ticker, filings)
+                VALUES (DATE(NEW.created_at), COALESCE(NEW.ticker, ''), 1)
+                ON CONFLICT(date, ticker) DO UPDATE SET filings = filings + 1;
+
+                INSERT INTO filing_stats_ticker (ticker, filings)
+                VALUES (COALESCE(NEW.ticker, ''), 1)
+                ON CONFLICT(ticker) DO UPDATE SET filings = filings + 1;
+            END
+        ''')
+
+        # Databases from before the rollups existed: backfill once
+        if cursor.execute('PRAGMA user_version').fetchone()[0] < 1:
+            cursor.execute('DELETE FROM filing_stats_daily')
+            cursor.execute('DELETE FROM filing_stats_ticker')
+            cursor.execute('''
+                INSERT INTO filing_stats_daily (date, ticker, filings)
+                SELECT DATE(created_at), COALESCE(ticker, ''), COUNT(*) FROM filings GROUP BY 1, 2
+            ''')
+            cursor.execute('''
+                INSERT INTO filing_stats_ticker (ticker, filings)
+                SELECT ticker, SUM(filings) FROM filing_stats_daily GROUP BY ticker
+            ''')
+            cursor.execute('PRAGMA user_version = 1')
 
         conn.commit()
         conn.close()
 
     def load_seen_entries(self):
-        """Load previously seen entry IDs"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT entry_id FROM seen_entries')
-        self.seen_entries = {row[0] for row in cursor.fetchall()}
-        conn.close()
-        logger.info(f"Loaded {len(self.seen_entries)} seen entries")
+        """Build the bounded dedup index from retained seen entries"""
+        self.seen.load()
+        logger.info(
+            f"Loaded {len(self.seen)} recent seen entries "
+            f"(bloom filter: {self.seen.bloom.count} retained)"
+        )
 
     def is_seen(self, entry_id: str) -> bool:
         """Check if entry was already seen"""
-        return entry_id in self.seen_entries
+        return entry_id in self.seen
 
     def mark_seen(self, entry_id: str):
-        """Mark entry as seen"""
-        if entry_id not in self.seen_entries:
-            self.seen_entries.add(entry_id)
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        """Mark entry as seen (persisted with the cycle by save_entries, forgotten if that write fails)"""
+        self.seen.add(entry_id)
+
+    def is_stale(self, entry: Dict) -> bool:
+        """True for filings older than the dedup retention period
+
+        Their seen markers may already be pruned, so they must never be
+        treated as new (per-company feeds can list years-old filings).
+        """
+        filed = (entry.get('filing_date') or entry.get('filed_date') or '')[:10]
+        if not filed:
+            return False
+        cutoff = (datetime.now() - timedelta(days=self.seen_retention_days)).strftime('%Y-%m-%d')
+        return filed < cutoff
+
+    async def prune_seen(self):
+        """Delete seen markers past retention and rebuild the Bloom filter"""
+        sql, params = self.seen.prune_sql()
+        deleted = await self.writer.submit(lambda conn: conn.execute(sql, params).rowcount)
+
+        loop = asyncio.get_running_loop()
+        self.seen.install(await loop.run_in_executor(None, self.seen.rebuild))
+        self.last_prune = time.monotonic()
+        logger.info(f"Pruned {deleted} seen entries older than {self.seen_retention_days} days")
+
+    def get_sec_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for SEC requests"""
+        if self.sec_session is None or self.sec_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.sec_concurrency,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ttl_dns_cache=DNS_CACHE_SECONDS
+            )
+            self.sec_session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': SEC_USER_AGENT, 'Accept-Encoding': 'gzip, deflate'},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.sec_session
+
+    def get_webhook_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for webhook deliveries"""
+        if self.webhook_session is None or self.webhook_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=WEBHOOK_CONNECTIONS,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ttl_dns_cache=DNS_CACHE_SECONDS
+            )
+            self.webhook_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self.webhook_session
+
+    async def close(self):
+        """Flush queued alerts and release sessions and worker threads"""
+        await self.flush_alerts()
+
+        for session in (self.sec_session, self.webhook_session):
+            if session is not None and not session.closed:
+                await session.close()
+
+        if self.enricher:
+            self.enricher.shutdown()
+
+        if self.cik_index:
+            self.cik_index.close()
+
+        if self.shard:
             try:
-                cursor.execute('INSERT INTO seen_entries (entry_id) VALUES (?)', (entry_id,))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                pass  # Already exists
-            finally:
-                conn.close()
+                await self.writer.submit(self.shard.release)
+            except Exception as e:
+                logger.error(f"Error releasing worker lease: {e}")
+
+        await self.writer.close()
+        self.seen.close()
 
     async def fetch_sec_rss(self, tickers: Optional[List[str]] = None) -> List[Dict]:
         """Fetch SEC RSS feed for Form 4 filings"""
 
         # Build URL
-        base_url = "https://www.sec.gov/cgi-bin/browse-edgar"
+        base_url = self.browse_url
 
         if tickers:
-            # Fetch individual tickers
-            feeds = []
-            for ticker in tickers[:10]:  # Limit to 10 concurrent requests
-                url = f"{base_url}?action=getcompany&CIK={ticker}&type=4&count=10&owner=only&output=atom"
-                feeds.append(url)
+            # Fetch every ticker; fetch_feed bounds concurrency and request rate
+            feeds = [
+                f"{base_url}?action=getcompany&CIK={ticker}&type=4&count=10&owner=only&output=atom"
+                for ticker in tickers
+            ]
         else:
             # Fetch all recent filings
             url = f"{base_url}?action=getcurrent&type=4&count=100&owner=only&output=atom"
             feeds = [url]
 
-        # Fetch all feeds
-        async with aiohttp.ClientSession() as session:
-            tasks = [self.fetch_feed(session, url) for url in feeds]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Fetch all feeds over the shared connection pool
+        session = self.get_sec_session()
+        tasks = [self.fetch_feed(session, url) for url in feeds]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Combine results
         all_entries = []
@@ -165,81 +479,320 @@ class SECForm4Monitor:
         return all_entries
 
     async def fetch_feed(self, session: aiohttp.ClientSession, url: str) -> List[Dict]:
-        """Fetch single RSS feed"""
+        """Fetch and stream-parse a single Atom feed, stopping at the first seen accession"""
+        _, entries, _ = await self.fetch_feed_page(session, url)
+        return entries
+
+    async def fetch_feed_page(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        remember_validators: bool = False,
+        early_stop: bool = True
+    ) -> Tuple[int, List[Dict], bool]:
+        """Fetch one feed page; returns (status, entries, reached_seen_entry)"""
         try:
-            headers = {
-                'User-Agent': 'InsiderTradingMonitor/1.0 (contact: your-email@example.com)'
-            }
+            async with self.sec_semaphore:
+                await self.rate_limiter.acquire()
+                with sec_request(url) as call:
+                    async with session.get(url, headers=headers) as response:
+                        call.status = response.status
+                        if response.status == 304:
+                            return 304, [], True
+
+                        if response.status != 200:
+                            logger.error(f"HTTP {response.status} for {url}")
+                            return response.status, [], False
+
+                        parser = AtomFeedParser(stop_at=self.is_seen if early_stop else None)
+                        entries = []
+
+                        # Keep reading after an early stop so the connection can be reused;
+                        # the parser ignores input once stopped
+                        async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                            entries.extend(parser.feed(chunk))
+                        entries.extend(parser.close())
+
+                        first_seen_at = time.time()
+                        for entry in entries:
+                            entry['first_seen_at'] = first_seen_at
+
+                        if remember_validators:
+                            # ETag/Last-Modified for the next conditional request
+                            self.current_validators = {
+                                key: response.headers[header]
+                                for key, header in (('If-None-Match', 'ETag'), ('If-Modified-Since', 'Last-Modified'))
+                                if header in response.headers
+                            }
+
+            return 200, entries, parser.stopped
+
+        except Exception as e:
+            logger.error(f"Error parsing feed from {url}: {e}")
+            return 0, [], False
+
+    async def poll_current(self) -> List[Dict]:
+        """Fetch getcurrent pages until reaching an already-seen accession
+
+        The first page is a conditional request, so an unchanged feed costs
+        one 304. Later pages are only requested when a burst pushed every
+        entry on the previous page past the last one we saw.
+        """
+        async with self.current_lock:
+            return await self._poll_current()
+
+    async def _poll_current(self) -> List[Dict]:
+        session = self.get_sec_session()
+        entries: List[Dict] = []
+
+        for page in range(CURRENT_MAX_PAGES):
+            url = (
+                f"{self.browse_url}?action=getcurrent&type=4&owner=only"
+                f"&count={CURRENT_PAGE_SIZE}&start={page * CURRENT_PAGE_SIZE}&output=atom"
+            )
+            first = page == 0
+            if first and self.rescan_current:
+                # After a re-shard, re-read the newest page in full: filings of a
+                # dead worker's CIKs may sit behind entries this worker has seen
+                self.rescan_current = False
+                status, page_entries, _ = await self.fetch_feed_page(
+                    session, url, remember_validators=True, early_stop=False
+                )
+                entries.extend(page_entries)
+                break
+
+            status, page_entries, reached_seen = await self.fetch_feed_page(
+                session, url, self.current_validators if first else None, remember_validators=first
+            )
 
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    logger.error(f"HTTP {response.status} for {url}")
-                    return []
+            entries.extend(page_entries)
+            if status != 200 or reached_seen or len(page_entries) < CURRENT_PAGE_SIZE:
+                break
 
-                content = await response.text()
+            # Nothing seen yet (fresh database): one page is enough to start from
+            if not self.seen.bloom.count:
+                break
+        else:
+            logger.warning(f"Caught up {CURRENT_MAX_PAGES} pages without reaching a seen filing")
 
-            # Parse RSS
-            feed = feedparser.parse(content)
-            entries = []
+        return entries
 
-            for entry in feed.entries:
-                # Extract accession number from link
-                link = entry.get('link', '')
-                accession = link.split('accession_number=')[-1].split('&')[0] if 'accession_number=' in link else ''
+    async def load_cik_index(self):
+        """Map the compiled CIK index, rebuilding it from SEC's ticker map when stale"""
+        path = self.cik_index_path
 
-                # Get company info
-                summary = entry.get('summary', '')
-                company_name = entry.get('sec_company_name', '')
+        if not CikIndex.is_fresh(path, CIK_INDEX_MAX_AGE):
+            try:
+                await self.rate_limiter.acquire()
+                with sec_request(self.company_tickers_url) as call:
+                    async with self.get_sec_session().get(self.company_tickers_url) as response:
+                        call.status = response.status
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+
+                loop = asyncio.get_running_loop()
+                index = await loop.run_in_executor(None, CikIndex.build, data, path)
+                index.close()
+                logger.info(f"Compiled CIK index with {len(index)} issuers")
+            except Exception as e:
+                logger.error(f"Error refreshing ticker map: {e}")
 
-                entries.append({
-                    'accession_number': accession,
-                    'ticker': self.extract_ticker(summary),
-                    'company_name': company_name,
-                    'cik': entry.get('sec_cik', ''),
-                    'filing_date': entry.get('filing_date', {}).get('day', ''),
-                    'filed_date': entry.get('date', ''),
-                    'url': link,
-                    'summary': summary
-                })
+        try:
+            self.cik_index = CikIndex(path)
+            if self.shard:
+                self.ticker_ciks = {ticker: str(cik) for cik, ticker in self.cik_index.items()}
+        except (OSError, ValueError) as e:
+            # Entries go out without tickers until a later retry succeeds
+            self.cik_index_retry_at = time.monotonic() + CIK_INDEX_RETRY_SECONDS
+            logger.error(f"CIK index unavailable: {e}")
+
+    async def ensure_cik_index(self):
+        """Load the CIK index on first use (and after a failed load, once the retry delay passed)"""
+        if self.cik_index is None and time.monotonic() >= self.cik_index_retry_at:
+            await self.load_cik_index()
+
+    def owns(self, key: str) -> bool:
+        """True unless sharding assigns this issuer CIK (or ticker) to another worker"""
+        if not self.shard:
+            return True
+        key = key.upper()
+        return self.shard.owns(self.ticker_ciks.get(key, key))
+
+    def classify(self, entry: Dict) -> str:
+        """'issuer' or 'reporting' for a feed entry"""
+        if entry.get('role'):
+            return entry['role']
+        if self.cik_index and self.cik_index.is_issuer(entry['cik']):
+            return 'issuer'
+        return 'reporting'
+
+    def resolve_entries(self, entries: List[Dict]) -> List[Dict]:
+        """Collapse issuer and reporting-owner entries into one entry per accession
+
+        getcurrent lists each Form 4 once under the issuer and once per
+        reporting owner. The merged entry carries the issuer's CIK, name and
+        ticker plus owner_cik/owner_name. If only the owner's entry was seen,
+        the issuer fields stay empty rather than holding the owner's.
+        """
+        groups: Dict[str, Dict[str, Dict]] = {}
+        for entry in entries:
+            if entry['accession_number']:
+                group = groups.setdefault(entry['accession_number'], {})
+                group.setdefault(self.classify(entry), entry)
 
-            return entries
+        resolved = []
+        for group in groups.values():
+            issuer = group.get('issuer')
+            owner = group.get('reporting')
 
-        except Exception as e:
-            logger.error(f"Error parsing feed from {url}: {e}")
-            return []
+            entry = dict(issuer or owner)
+            entry['role'] = 'issuer' if issuer else 'reporting'
+            entry['owner_cik'] = owner['cik'] if owner else ''
+            entry['owner_name'] = owner['company_name'] if owner else ''
+
+            if issuer:
+                ticker = self.cik_index.ticker(issuer['cik']) if self.cik_index else None
+                entry['ticker'] = ticker or ''
+            else:
+                entry.update(cik='', company_name='', ticker='')
+
+            resolved.append(entry)
 
-    def extract_ticker(self, summary: str) -> str:
-        """Extract ticker from summary text"""
-        # Simple extraction - looks for ticker pattern
-        import re
-        match = re.search(r'Ticker:\s*([A-Z]{1,5})', summary)
-        return match.group(1) if match else ''
+        return resolved
 
-    async def send_to_webhook(self, data: Dict):
+    async def send_to_webhook(self, data: Dict) -> bool:
         """Send filing data to webhook"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.webhook_url,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        logger.info(f"Sent webhook for {data.get('ticker')}: {data.get('company')}")
-                    else:
-                        logger.error(f"Webhook failed: HTTP {response.status}")
+            with webhook_delivery() as call:
+                async with self.get_webhook_session().post(self.webhook_url, json=data) as response:
+                    await response.read()  # drain so the connection returns to the pool
+                    call.status = response.status
+
+            if response.status != 200:
+                logger.error(f"Webhook failed: HTTP {response.status}")
+                return False
+            elif data.get('type') == 'insider_trading_batch':
+                logger.info(f"Sent batch webhook with {data['count']} alerts")
+            else:
+                logger.info(f"Sent webhook for {data.get('ticker')}: {data.get('company')}")
+            return True
 
         except Exception as e:
             logger.error(f"Error sending webhook: {e}")
+            return False
+
+    async def send_alert(self, data: Dict) -> bool:
+        """Send one alert or batch payload and record its filings' delivery latency"""
+        alerts = data['alerts'] if data.get('type') == 'insider_trading_batch' else [data]
+        sent_at = time.time()
+        for alert in alerts:
+            alert['sent_at'] = format_timestamp(sent_at)
+
+        delivered = await self.send_to_webhook(data)
+        self.record_latency(alerts, sent_at, time.time() if delivered else None)
+        return delivered
+
+    def record_latency(self, alerts: List[Dict], sent_at: float,
+                       delivered_at: Optional[float]) -> asyncio.Future:
+        """Queue the alerts' latency timestamps (delivered_at None = delivery failed)"""
+        rows = []
+        for alert in alerts:
+            # Backfilled filings keep no acceptance time, so they stay out of end-to-end stats
+            accepted_at = None if alert.get('backfill') else parse_timestamp(alert.get('accepted_at'))
+            observe_alert_latency(accepted_at, delivered_at)
+            rows.append((
+                alert.get('accession_number'), alert.get('ticker'), accepted_at,
+                parse_timestamp(alert.get('first_seen_at')), parse_timestamp(alert.get('persisted_at')),
+                sent_at, delivered_at
+            ))
 
-    async def process_entries(self, entries: List[Dict], notify: bool = True):
-        """Process filing entries"""
-        new_filings = 0
+        def write(conn: sqlite3.Connection):
+            conn.executemany('''
+                INSERT OR REPLACE INTO alert_latency
+                (accession_number, ticker, accepted_at, first_seen_at, persisted_at, sent_at, delivered_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+        return self.writer.submit(write)
+
+    async def deliver_alerts(self, alerts: List[Dict]) -> List[float]:
+        """Send alerts concurrently, keeping each ticker's alerts in order
+
+        Alerts for the same ticker go out one after another; different
+        tickers are delivered in parallel up to webhook_concurrency.
+        Returns per-alert delivery latencies in seconds.
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for alert in alerts:
+            # Alerts without a ticker have no ordering constraint
+            key = alert.get('ticker') or alert.get('url') or str(id(alert))
+            groups.setdefault(key, []).append(alert)
+
+        semaphore = asyncio.Semaphore(self.webhook_concurrency)
+        latencies: List[float] = []
+        start = time.perf_counter()
+
+        async def deliver_group(group: List[Dict]):
+            for alert in group:
+                async with semaphore:
+                    await self.send_alert(alert)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(deliver_group(group) for group in groups.values()))
+        return latencies
+
+    async def flush_alerts(self):
+        """Send any alerts still queued in the batcher"""
+        if self.batcher:
+            await self.batcher.flush()
+
+    async def enrich_entries(self, entries: List[Dict]) -> Dict[str, List[Dict]]:
+        """Download and parse new filings in the enricher's worker pool"""
+        loop = asyncio.get_running_loop()
+        tasks = []
 
         for entry in entries:
+            # getcurrent entries often lack a CIK, but the archive link carries one
+            cik = entry['cik']
+            if not cik:
+                match = ARCHIVE_CIK_RE.search(entry.get('url', ''))
+                cik = match.group(1) if match else ''
+
+            tasks.append(loop.run_in_executor(
+                self.enricher.executor, self.enricher.fetch_transactions, cik, entry['accession_number']
+            ))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        parsed = {}
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error enriching {entry['accession_number']}: {result}")
+                continue
+            parsed[entry['accession_number']] = result
+
+        self.save_transactions(parsed)
+        logger.info(f"Enriched {len(parsed)} filings")
+        return parsed
+
+    async def dedupe_entries(self, entries: List[Dict]) -> Optional[List[Dict]]:
+        """Resolve fetched entries and keep the unseen ones (None if nothing is new)"""
+        await self.ensure_cik_index()
+
+        new_entries = []
+        self.seen.expire()
+        # A fresh database's first poll is a backlog, not a measure of alert latency
+        backfill = not self.seen.bloom.count
+
+        for entry in self.resolve_entries(entries):
             entry_id = entry['accession_number']
 
-            if not entry_id:
+            if not entry_id or self.is_stale(entry):
+                continue
+
+            # getcurrent is polled by every worker; keep only our issuers
+            if self.shard_by_entry and not self.owns(entry['cik'] or entry_id):
                 continue
 
             # Skip if already seen
@@ -248,39 +801,78 @@ class SECForm4Monitor:
 
             # Mark as seen
             self.mark_seen(entry_id)
+            entry['backfill'] = backfill
+            new_entries.append(entry)
 
-            # Save to database
-            self.save_filing(entry)
+        return new_entries or None
 
-            # Send webhook notification
-            if notify:
-                webhook_data = {
-                    'type': 'insider_trading',
-                    'ticker': entry['ticker'],
-                    'company': entry['company_name'],
-                    'filing_date': entry['filing_date'],
-                    'url': entry['url'],
-                    'timestamp': datetime.now().isoformat()
-                }
-
-                await self.send_to_webhook(webhook_data)
+    async def notify_entries(self, entries: List[Dict], transactions: Dict[str, List[Dict]]):
+        """Build alerts for new filings and send them (batched or fanned out)"""
+        alerts = []
+        for entry in entries:
+            webhook_data = {
+                'type': 'insider_trading',
+                'ticker': entry['ticker'],
+                'company': entry['company_name'],
+                'filing_date': entry['filing_date'],
+                'url': entry['url'],
+                'accession_number': entry['accession_number'],
+                'accepted_at': format_timestamp(parse_timestamp(entry.get('filed_date'))),
+                'first_seen_at': format_timestamp(entry.get('first_seen_at')),
+                'persisted_at': format_timestamp(entry.get('persisted_at')),
+                'backfill': entry.get('backfill', False),
+                'timestamp': datetime.now().isoformat()
+            }
+            webhook_data.update(Form4Enricher.summarize(transactions.get(entry['accession_number'], [])))
+            alerts.append(webhook_data)
 
-            new_filings += 1
+        if self.batcher:
+            for webhook_data in alerts:
+                await self.batcher.add(webhook_data)
+        else:
+            latencies = await self.deliver_alerts(alerts)
+            logger.info(
+                f"Delivered {len(latencies)} alerts: "
+                f"p50={percentile(latencies, 50) * 1000:.0f}ms "
+                f"p95={percentile(latencies, 95) * 1000:.0f}ms "
+                f"p99={percentile(latencies, 99) * 1000:.0f}ms"
+            )
 
+    async def process_entries(self, entries: List[Dict], notify: bool = True):
+        """Process filing entries (all stages in sequence; the daemon uses the pipeline)"""
+        new_entries = await self.dedupe_entries(entries) or []
+
+        # Claim and persist first, as the pipeline does: another worker enriches
+        # and alerts the filings it claimed
+        if new_entries:
+            claimed = await self.save_entries(new_entries)
+            persisted_at = time.time()
+            for entry in new_entries:
+                entry['persisted_at'] = persisted_at
+            new_entries = [entry for entry in new_entries if entry['accession_number'] in claimed]
+
+        # Parse only the claimed accessions, all at once
+        transactions = {}
+        if self.enricher and new_entries:
+            transactions = await self.enrich_entries(new_entries)
+
+        if notify and new_entries:
+            await self.notify_entries(new_entries, transactions)
+
+        new_filings = len(new_entries)
         logger.info(f"Processed {new_filings} new filings")
         return new_filings
 
-    def save_filing(self, entry: Dict):
-        """Save filing to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def save_entries(self, entries: List[Dict]) -> asyncio.Future:
+        """Queue the seen markers and filings of a poll cycle as one transaction
 
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO filings
-                (accession_number, ticker, company_name, cik, filing_date, filed_date, raw_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        Resolves to the accessions whose seen marker this call inserted. With
+        several workers on one database, a marker that already exists means
+        another worker claimed (and alerts) that filing.
+        """
+        seen_rows = [(entry['accession_number'],) for entry in entries]
+        filing_rows = [
+            (
                 entry['accession_number'],
                 entry['ticker'],
                 entry['company_name'],
@@ -288,68 +880,404 @@ class SECForm4Monitor:
                 entry['filing_date'],
                 entry['filed_date'],
                 json.dumps(entry)
-            ))
+            )
+            for entry in entries
+        ]
+        codec = self.codec
+
+        def write(conn: sqlite3.Connection) -> int:
+            claimed = {
+                row[0] for row in seen_rows
+                if conn.execute('INSERT OR IGNORE INTO seen_entries (entry_id) VALUES (?)', row).rowcount
+            }
+            # Compress here, on the writer thread, to keep the event loop free
+            conn.executemany('''
+                INSERT OR IGNORE INTO filings
+                (accession_number, ticker, company_name, cik, filing_date, filed_date, raw_data, raw_codec)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [row[:-1] + codec.encode(row[-1]) for row in filing_rows])
+            return claimed
+
+        def forget_if_failed(future: asyncio.Future):
+            # dedupe_entries marked these seen up front; a failed write must not
+            # hide them for the rest of the process, so the next poll retries them
+            if not future.cancelled() and future.exception() is not None:
+                for (entry_id,) in seen_rows:
+                    self.seen.discard(entry_id)
+                logger.error(f"Saving {len(seen_rows)} filings failed; they will be retried on the next poll")
+
+        future = self.writer.submit(write)
+        future.add_done_callback(forget_if_failed)
+        return future
+
+    def save_transactions(self, parsed: Dict[str, List[Dict]]) -> asyncio.Future:
+        """Queue parsed transactions and their insiders as one transaction
+
+        Runs after the cycle's save_entries job on the same writer thread,
+        so the filing rows it references already exist.
+        """
+        def write(conn: sqlite3.Connection) -> int:
+            if not any(parsed.values()):
+                return 0
+
+            placeholders = ','.join('?' * len(parsed))
+            filing_ids = dict(conn.execute(
+                f'SELECT accession_number, id FROM filings WHERE accession_number IN ({placeholders})',
+                list(parsed)
+            ).fetchall())
+
+            insiders = {
+                (t['insider_cik'], t['insider_name']): t['position']
+                for transactions in parsed.values() for t in transactions
+            }
+            conn.executemany('''
+                INSERT INTO insiders (cik, name, title) VALUES (?, ?, ?)
+                ON CONFLICT(cik, name) DO UPDATE SET title = excluded.title, updated_at = CURRENT_TIMESTAMP
+            ''', [(cik, name, title) for (cik, name), title in insiders.items()])
+
+            insider_ids = {
+                key: conn.execute('SELECT id FROM insiders WHERE cik = ? AND name = ?', key).fetchone()[0]
+                for key in insiders
+            }
 
-            conn.commit()
+            rows = [
+                (filing_ids.get(accession), insider_ids[(t['insider_cik'], t['insider_name'])],
+                 t['transaction_code'], t['shares'], t['price_per_share'], t['total_value'],
+                 t['shares_owned_after'], t['transaction_date'])
+                for accession, transactions in parsed.items()
+                for t in transactions
+            ]
+            conn.executemany('''
+                INSERT OR IGNORE INTO transactions
+                (filing_id, insider_id, transaction_type, shares, price, total_value,
+                 shares_owned_after, transaction_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            return len(rows)
+
+        return self.writer.submit(write)
+
+    def build_pipeline(self) -> Pipeline:
+        """Daemon stages: fetch -> dedupe -> persist -> enrich -> notify
+
+        Fetch runs up to sec_concurrency jobs at once (the rate limiter still
+        applies). Dedupe and persist are single workers so seen-state and
+        write order stay simple; persist waits for the writer thread, so a
+        slow disk throttles fetching rather than growing memory.
+        """
+        async def fetch(job):
+            return await job() or None
+
+        async def persist(entries):
+            claimed = await self.save_entries(entries)
+            persisted_at = time.time()
+            for entry in entries:
+                entry['persisted_at'] = persisted_at
+            logger.info(f"Persisted {len(entries)} new filings")
+
+            # Drop filings another worker already claimed (e.g. during a re-shard)
+            return [entry for entry in entries if entry['accession_number'] in claimed] or None
+
+        async def enrich(entries):
+            transactions = await self.enrich_entries(entries) if self.enricher else {}
+            return entries, transactions
+
+        async def notify(item):
+            await self.notify_entries(*item)
+
+        pipeline = Pipeline()
+        pipeline.add_stage('fetch', fetch, workers=self.sec_concurrency, queue_size=PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage('dedupe', self.dedupe_entries, queue_size=PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage('persist', persist, queue_size=PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage('enrich', enrich, workers=2 if self.enricher else 1, queue_size=PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage('notify', notify, queue_size=PIPELINE_QUEUE_SIZE)
+        return pipeline
+
+    async def run_pipeline(self, source):
+        """Run the daemon pipeline fed by `source` until stop() is requested, then drain"""
+        self.pipeline = self.build_pipeline()
+        self.pipeline.start()
+        for stage in self.pipeline.stages:
+            QUEUE_DEPTH.labels(queue=f'pipeline_{stage.name}').set_function(lambda stage=stage: stage.depth)
+
+        async def report():
+            while True:
+                await asyncio.sleep(PIPELINE_REPORT_SECONDS)
+                logger.info(f"Pipeline depth: {self.pipeline.describe()}")
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(self.shard.lease_seconds / 3)
+                try:
+                    await self.heartbeat()
+                except Exception as e:
+                    logger.error(f"Error renewing worker lease: {e}")
+
+        reporter = asyncio.create_task(report())
+        if self.shard:
+            await self.heartbeat()
+            logger.info(f"Worker {self.shard.worker_id} joined ({len(self.shard.workers)} live)")
+            heartbeats = asyncio.create_task(heartbeat())
 
-        except Exception as e:
-            logger.error(f"Error saving filing: {e}")
+        try:
+            await source
+            logger.info(f"Draining pipeline ({self.pipeline.describe()})")
+            await self.pipeline.drain()
         finally:
-            conn.close()
+            reporter.cancel()
+            if self.shard:
+                heartbeats.cancel()
+            await self.pipeline.stop()
+
+    async def heartbeat(self):
+        """Renew this worker's lease; re-shard and re-split the SEC budget on membership changes"""
+        workers = await self.writer.submit(self.shard.heartbeat)
+        if self.shard.set_workers(workers):
+            rate = self.sec_rate / len(self.shard.workers)
+            self.rate_limiter.set_rate(rate)
+            self.rescan_current = self.shard_by_entry
+            logger.info(
+                f"Re-sharded across {len(self.shard.workers)} workers "
+                f"({', '.join(self.shard.workers)}); SEC budget {rate:.2f} req/s"
+            )
 
-    async def monitor(self, tickers: Optional[List[str]] = None, interval_minutes: int = 30):
-        """Continuous monitoring loop"""
-        logger.info(f"Starting monitoring (interval: {interval_minutes}min)")
+    def stop(self):
+        """Ask the daemon to stop polling and finish in-flight filings (SIGTERM)"""
+        logger.info("Stop requested, draining in-flight filings...")
+        self.stop_event.set()
 
-        if tickers:
-            logger.info(f"Watching tickers: {', '.join(tickers)}")
+    async def wait_or_stop(self, seconds: float) -> bool:
+        """Sleep up to `seconds`; True if a stop was requested meanwhile"""
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=max(seconds, 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def maybe_prune(self):
+        """Daily retention pass keeps seen_entries, the dedup index and raw_data bounded"""
+        if time.monotonic() - self.last_prune > 86400 or not self.last_prune:
+            await self.prune_seen()
+
+            # One worker maintains storage for everyone sharing the database
+            if not self.shard or self.shard.owns('storage-maintenance'):
+                try:
+                    await self.maintain_storage()
+                except Exception as e:
+                    logger.error(f"Error maintaining storage: {e}")
+
+    async def maintain_storage(self, batch: int = 5000):
+        """Retrain the payload dictionary, compress, archive and vacuum
+
+        Work is split into writer jobs of `batch` rows so saves from the
+        pipeline interleave with maintenance instead of waiting behind it.
+        """
+        codec = self.codec
+        dict_id = await self.writer.submit(codec.retrain)
+        if dict_id:
+            logger.info(f"Trained payload dictionary #{dict_id}")
+
+        compacted = archived = 0
+        while True:
+            done = await self.writer.submit(lambda conn: payload_store.compact_rows(conn, codec, batch))
+            compacted += done
+            if done < batch:
+                break
 
         while True:
-            try:
-                # Fetch new entries
-                entries = await self.fetch_sec_rss(tickers)
+            done = await self.writer.submit(lambda conn: payload_store.archive_rows(
+                conn, codec, self.archive_dir, self.archive_days, batch
+            ))
+            archived += done
+            if done < batch:
+                break
 
-                # Process entries
-                await self.process_entries(entries, notify=True)
+        freed = await self.writer.submit(payload_store.incremental_vacuum)
+        logger.info(
+            f"Storage maintenance: compressed {compacted}, archived {archived} "
+            f"payloads to {self.archive_dir}, freed {freed} pages"
+        )
+
+    async def sweep_watchlist(self, tickers: List[str], period: float):
+        """Queue the whole watchlist once, spread evenly over `period` seconds
+
+        The watchlist is cut into slices dispatched at even gaps (at most one
+        per SWEEP_SLICE_SECONDS), so thousands of tickers become a small,
+        steady request rate instead of a burst at the top of each interval.
+        """
+        loop = asyncio.get_running_loop()
+        slice_count = max(1, min(len(tickers), int(period // SWEEP_SLICE_SECONDS)))
+        slice_size = math.ceil(len(tickers) / slice_count)
+        slices = [tickers[i:i + slice_size] for i in range(0, len(tickers), slice_size)]
+        gap = period / len(slices)
+
+        logger.info(f"Sweeping {len(tickers)} tickers in {len(slices)} slices every {gap:.0f}s")
+        start = loop.time()
+
+        for n, chunk in enumerate(slices):
+            if await self.wait_or_stop(start + n * gap - loop.time()):
+                return
+
+            # Ownership is checked per slice, so a re-shard applies mid-sweep
+            chunk = [ticker for ticker in chunk if self.owns(ticker)]
+            if chunk:
+                await self.pipeline.put(lambda chunk=chunk: self.fetch_sec_rss(chunk))
+
+        await self.wait_or_stop(start + period - loop.time())
+
+    async def wait_for_edgar(self, calendar: EdgarCalendar) -> bool:
+        """Sleep through EDGAR's closed hours; True if a stop was requested meanwhile"""
+        now = datetime.now(timezone.utc)
+        if calendar.phase(now) != 'closed':
+            return False
+
+        opening = calendar.next_change(now)
+        logger.info(f"EDGAR closed, no polling until {opening.astimezone(EDGAR_TZ):%a %Y-%m-%d %H:%M %Z}")
+        if await self.wait_or_stop((opening - now).total_seconds()):
+            return True
+        logger.info("EDGAR open, catching up from the last seen filing")
+        return False
+
+    async def monitor_fast(self, poll_seconds: float = 5.0, jitter: float = 0.2,
+                           calendar: Optional[EdgarCalendar] = None):
+        """Low-latency loop: poll getcurrent every few seconds with jitter
+
+        With a calendar, polling pauses while EDGAR is closed; the first
+        poll after the opening pages back to the last seen filing.
+        """
+        logger.info(f"Starting low-latency monitoring (poll: {poll_seconds}s ±{jitter:.0%})")
+        self.shard_by_entry = True
+
+        async def source():
+            while not self.stop_event.is_set():
+                if calendar and await self.wait_for_edgar(calendar):
+                    break
+
+                try:
+                    await self.maybe_prune()
+                except Exception as e:
+                    logger.error(f"Error pruning seen entries: {e}")
+
+                # Blocks while the fetch stage is full
+                await self.pipeline.put(self.poll_current)
+                await self.wait_or_stop(poll_seconds * random.uniform(1 - jitter, 1 + jitter))
+
+        await self.run_pipeline(source())
+
+    async def monitor(self, tickers: Optional[List[str]] = None, interval_minutes: float = 30,
+                      calendar: Optional[EdgarCalendar] = None, peak_seconds: float = PEAK_POLL_SECONDS):
+        """Continuous monitoring loop
+
+        Without a calendar every check is `interval_minutes` apart around the
+        clock. With one, checks follow EDGAR's acceptance hours: every
+        `peak_seconds` in the post-close peak, every `interval_minutes`
+        during the rest of the day and none while EDGAR is closed. Each
+        getcurrent check pages back to the last seen filing (poll_current),
+        so the first check after a quiet stretch catches up in one pass.
+        """
+        if calendar:
+            logger.info(f"Starting monitoring on the EDGAR calendar "
+                        f"(interval: {interval_minutes}min, peak: {peak_seconds:g}s)")
+        else:
+            logger.info(f"Starting monitoring (interval: {interval_minutes}min)")
+
+        if tickers:
+            more = ' ...' if len(tickers) > 20 else ''
+            logger.info(f"Watching {len(tickers)} tickers: {', '.join(tickers[:20])}{more}")
+
+        # Watchlists are sharded by ticker before fetching; getcurrent by issuer after
+        self.shard_by_entry = not tickers
+
+        intervals = {'open': interval_minutes * 60, 'peak': peak_seconds}
+        phase = None
+
+        def period() -> float:
+            """Seconds until the next check"""
+            if not calendar:
+                return interval_minutes * 60
+            now = datetime.now(timezone.utc)
+            return (calendar.next_poll(now, intervals) - now).total_seconds()
+
+        async def source():
+            nonlocal phase
+            while not self.stop_event.is_set():
+                if calendar:
+                    current = calendar.phase(datetime.now(timezone.utc))
+                    if current == 'closed' and phase in (None, 'closed'):
+                        # Started while closed: nothing to check until the opening
+                        phase = current
+                        if await self.wait_for_edgar(calendar):
+                            break
+                        continue
+
+                    if current == 'closed':
+                        logger.info("EDGAR closed: last check until the next opening")
+                    elif current != phase:
+                        logger.info(f"EDGAR {current}: checking every {intervals[current]:g}s")
+                    phase = current
+
+                try:
+                    await self.maybe_prune()
+                    await self.ensure_cik_index()
+                except Exception as e:
+                    logger.error(f"Error pruning seen entries: {e}")
+
+                if tickers:
+                    # Watchlist: spread the tickers across the interval, but never
+                    # faster than the SEC budget can sweep them
+                    fastest = len(tickers) * self.rate_limiter.interval
+                    if phase == 'closed':
+                        await self.sweep_watchlist(tickers, fastest)
+                        await self.wait_or_stop(period())
+                    else:
+                        await self.sweep_watchlist(tickers, max(period(), fastest))
+                    continue
+
+                await self.pipeline.put(self.poll_current if calendar else self.fetch_sec_rss)
 
                 # Wait for next interval
-                logger.info(f"Waiting {interval_minutes} minutes until next check...")
-                await asyncio.sleep(interval_minutes * 60)
+                if not calendar:
+                    logger.info(f"Waiting {interval_minutes} minutes until next check...")
+                await self.wait_or_stop(period())
 
-            except KeyboardInterrupt:
-                logger.info("Stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(60)
+        await self.run_pipeline(source())
 
-    def get_stats(self) -> Dict:
-        """Get database statistics"""
+    def get_stats(self, latency_window_hours: float = 24) -> Dict:
+        """Get database statistics (from the rollup tables, not a filings scan)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         stats = {}
 
         # Total filings
-        cursor.execute('SELECT COUNT(*) FROM filings')
+        cursor.execute('SELECT COALESCE(SUM(filings), 0) FROM filing_stats_ticker')
         stats['total_filings'] = cursor.fetchone()[0]
 
-        # Filings in last 24h
-        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
-        cursor.execute('SELECT COUNT(*) FROM filings WHERE created_at > ?', (yesterday,))
+        # Filings in last 24h: indexed range in CURRENT_TIMESTAMP's own format
+        cursor.execute("SELECT COUNT(*) FROM filings WHERE created_at > datetime('now', '-1 day')")
         stats['last_24h'] = cursor.fetchone()[0]
 
         # Top tickers
         cursor.execute('''
-            SELECT ticker, COUNT(*) as count
-            FROM filings
-            WHERE ticker IS NOT NULL AND ticker != ''
-            GROUP BY ticker
-            ORDER BY count DESC
+            SELECT ticker, filings
+            FROM filing_stats_ticker
+            WHERE ticker != ''
+            ORDER BY filings DESC
             LIMIT 10
         ''')
         stats['top_tickers'] = dict(cursor.fetchall())
 
+        # Rolling filing-to-alert latency over the alerts delivered in the window
+        cursor.execute('''
+            SELECT accepted_at, first_seen_at, persisted_at, delivered_at
+            FROM alert_latency
+            WHERE delivered_at > ?
+        ''', (time.time() - latency_window_hours * 3600,))
+        stats['latency'] = latency_summary(cursor.fetchall())
+        cursor.execute('SELECT COUNT(*) FROM alert_latency WHERE delivered_at IS NULL AND sent_at > ?',
+                       (time.time() - latency_window_hours * 3600,))
+        stats['failed_alerts'] = cursor.fetchone()[0]
+
         conn.close()
         return stats
 
@@ -359,11 +1287,52 @@ async def main():
     parser = argparse.ArgumentParser(description='SEC Form 4 Insider Trading Monitor')
     parser.add_argument('--ticker', action='append', help='Ticker(s) to monitor')
     parser.add_argument('--watchlist', type=str, help='File with ticker list (one per line)')
-    parser.add_argument('--interval', type=int, default=30, help='Check interval in minutes')
+    parser.add_argument('--interval', type=float, default=30, help='Check interval in minutes')
+    parser.add_argument('--fast', action='store_true',
+                        help='Low-latency mode: poll the current-filings feed every few seconds')
+    parser.add_argument('--poll-seconds', type=float, default=5.0, help='Poll period in --fast mode')
+    parser.add_argument('--calendar', action='store_true',
+                        help='Follow EDGAR acceptance hours: dense checks after the close, none while closed')
+    parser.add_argument('--holidays', type=str,
+                        help='EDGAR holiday file, one YYYY-MM-DD per line (implies --calendar)')
+    parser.add_argument('--peak-seconds', type=float, default=PEAK_POLL_SECONDS,
+                        help='Check period during the post-close peak with --calendar')
     parser.add_argument('--webhook', type=str, default=WEBHOOK_URL, help='Webhook URL')
     parser.add_argument('--db', type=str, default='insider_trading.db', help='Database path')
+    parser.add_argument('--enrich', action='store_true',
+                        help='Download new filings and alert with shares, price and value')
+    parser.add_argument('--enrich-workers', type=int, default=4, help='Parallel filing downloads when enriching')
+    parser.add_argument('--webhook-concurrency', type=int, default=WEBHOOK_CONNECTIONS,
+                        help='Max alerts delivered in parallel')
+    parser.add_argument('--seen-retention-days', type=int, default=90,
+                        help='Days to keep dedup markers in seen_entries')
+    parser.add_argument('--sec-rate', type=float, default=SEC_REQUESTS_PER_SECOND,
+                        help='Max SEC requests per second (shared by all workers in --shard mode)')
+    parser.add_argument('--sec-concurrency', type=int, default=SEC_CONNECTIONS_PER_HOST,
+                        help='Max SEC requests in flight')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='Coalesce up to N alerts into one webhook payload (0 = disabled)')
+    parser.add_argument('--batch-wait', type=float, default=5.0,
+                        help='Max seconds an alert may wait in a batch')
+    parser.add_argument('--archive-days', type=int, default=365,
+                        help='Move raw filing payloads older than N days to monthly archive files')
+    parser.add_argument('--archive-dir', type=str, help='Archive directory (default: archive/ next to --db)')
+    parser.add_argument('--shard', action='store_true',
+                        help='Run as one of several workers splitting the watchlist over a shared database')
+    parser.add_argument('--worker-id', type=str, help='Worker name in --shard mode (default: hostname-pid)')
+    parser.add_argument('--lease-seconds', type=float, default=30,
+                        help="Seconds before a silent worker's share is reassigned")
+    parser.add_argument('--metrics-port', type=int, default=0,
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT/metrics (0 = disabled)')
+    parser.add_argument('--metrics-json', type=str, help='Write a JSON metrics summary to this file on exit')
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                        help='Write CPU/allocation profiles and slow event-loop callbacks under DIR')
+    parser.add_argument('--slow-callback-ms', type=float, default=100,
+                        help='With --profile, log event-loop callbacks slower than this')
     parser.add_argument('--once', action='store_true', help='Run once and exit')
     parser.add_argument('--stats', action='store_true', help='Show statistics and exit')
+    parser.add_argument('--latency-window', type=float, default=24,
+                        help='Hours of delivered alerts summarised by --stats latency percentiles')
 
     args = parser.parse_args()
 
@@ -379,31 +1348,82 @@ async def main():
             logger.error(f"Watchlist file not found: {args.watchlist}")
             sys.exit(1)
 
+    calendar = None
+    if args.calendar or args.holidays:
+        try:
+            calendar = EdgarCalendar.from_file(args.holidays)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot load holiday file {args.holidays}: {e}")
+            sys.exit(1)
+        logger.info(f"EDGAR calendar with {len(calendar.holidays)} holidays")
+
     # Create monitor
-    monitor = SECForm4Monitor(db_path=args.db, webhook_url=args.webhook)
+    monitor = SECForm4Monitor(
+        db_path=args.db,
+        webhook_url=args.webhook,
+        batch_size=args.batch_size,
+        batch_wait=args.batch_wait,
+        enrich_workers=args.enrich_workers if args.enrich else 0,
+        webhook_concurrency=args.webhook_concurrency,
+        seen_retention_days=args.seen_retention_days,
+        sec_rate=args.sec_rate,
+        sec_concurrency=args.sec_concurrency,
+        shard=ShardCoordinator(args.worker_id or default_worker_id(), args.lease_seconds) if args.shard else None,
+        archive_days=args.archive_days,
+        archive_dir=args.archive_dir
+    )
 
     # Show stats
     if args.stats:
-        stats = monitor.get_stats()
+        stats = monitor.get_stats(latency_window_hours=args.latency_window)
         print("\n=== SEC Form 4 Monitor Statistics ===")
         print(f"Total filings: {stats['total_filings']}")
         print(f"Last 24 hours: {stats['last_24h']}")
         print("\nTop tickers:")
         for ticker, count in stats['top_tickers'].items():
             print(f"  {ticker}: {count}")
+        print(f"\nFiling-to-alert latency (last {args.latency_window:g}h, "
+              f"{stats['failed_alerts']} failed deliveries):")
+        for stage, summary in stats['latency'].items():
+            print(f"  {stage:<11} n={summary['count']:<6} p50={summary['p50']:8.2f}s "
+                  f"p95={summary['p95']:8.2f}s p99={summary['p99']:8.2f}s")
         sys.exit(0)
 
-    # Run once
-    if args.once:
-        logger.info("Running single check...")
-        entries = await monitor.fetch_sec_rss(tickers if tickers else None)
-        await monitor.process_entries(entries, notify=True)
-        logger.info("Done!")
-        sys.exit(0)
+    profiler = Profiler('sec_monitor', args.profile) if args.profile else None
+    if profiler:
+        profiler.start()
+        profiler.watch_loop(asyncio.get_running_loop(), args.slow_callback_ms / 1000)
 
-    # Continuous monitoring
-    await monitor.monitor(tickers if tickers else None, interval_minutes=args.interval)
+    # SIGTERM (docker stop) stops polling and drains the pipeline before close()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, monitor.stop)
 
+    if args.metrics_port and not args.once:
+        REGISTRY.start_http_server(args.metrics_port)
+
+    try:
+        # Run once
+        if args.once:
+            logger.info("Running single check...")
+            entries = await monitor.fetch_sec_rss(tickers if tickers else None)
+            await monitor.process_entries(entries, notify=True)
+            logger.info("Done!")
+            return
+
+        # Continuous monitoring
+        if args.fast:
+            await monitor.monitor_fast(poll_seconds=args.poll_seconds, calendar=calendar)
+            return
+
+        await monitor.monitor(tickers if tickers else None, interval_minutes=args.interval,
+                              calendar=calendar, peak_seconds=args.peak_seconds)
+
+    finally:
+        await monitor.close()
+        if profiler:
+            profiler.stop()
+        if args.metrics_json:
+            REGISTRY.write_json(args.metrics_json)
+            logger.info(f"Metrics saved to {args.metrics_json}")
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory deduplication for the SEC monitor
+
+Membership is answered in three tiers:
+
+1. a time-windowed dict of recently seen accessions (exact, O(1));
+2. a Bloom filter over every accession still retained in ``seen_entries``,
+   which rules out almost all genuinely new accessions without touching disk;
+3. an indexed primary-key lookup in SQLite for the rare Bloom hits that are
+   not in the recent window.
+
+Rows older than the retention period are pruned from ``seen_entries``, so
+memory, startup time and table size all stay flat over time.
+"""
+
+import hashlib
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over blake2b"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIndex:
+    """Recent-window set + Bloom filter + SQLite fallback for seen accessions"""
+
+    def __init__(self, db_path: str, window_hours: float = 48, retention_days: int = 90,
+                 bloom_capacity: int = 500_000, bloom_error_rate: float = 0.001):
+        self.db_path = db_path
+        self.window_seconds = window_hours * 3600
+        self.retention_days = retention_days
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+
+        self.recent: 'OrderedDict[str, float]' = OrderedDict()  # entry_id -> first seen (monotonic)
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.db_lookups = 0
+        self.conn = sqlite3.connect(db_path)
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def load(self):
+        """Build the Bloom filter from retained rows and seed the recent window"""
+        self.bloom = self.build_bloom(self.conn)
+
+        cursor = self.conn.execute(
+            "SELECT entry_id FROM seen_entries WHERE seen_at >= datetime('now', ?) ORDER BY seen_at",
+            (f'-{self.window_seconds} seconds',)
+        )
+        now = time.monotonic()
+        self.recent = OrderedDict((row[0], now) for row in cursor)
+
+    def build_bloom(self, conn: sqlite3.Connection) -> BloomFilter:
+        """Bloom filter over every entry still inside the retention period"""
+        retained = conn.execute(
+            "SELECT COUNT(*) FROM seen_entries WHERE seen_at >= datetime('now', ?)",
+            (f'-{self.retention_days} days',)
+        ).fetchone()[0]
+
+        # Grow past the configured capacity rather than let the error rate climb
+        bloom = BloomFilter(max(self.bloom_capacity, retained * 2), self.bloom_error_rate)
+        for (entry_id,) in conn.execute(
+            "SELECT entry_id FROM seen_entries WHERE seen_at >= datetime('now', ?)",
+            (f'-{self.retention_days} days',)
+        ):
+            bloom.add(entry_id)
+        return bloom
+
+    def rebuild(self) -> BloomFilter:
+        """Build a fresh Bloom filter from the database (safe to run in a worker thread)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return self.build_bloom(conn)
+        finally:
+            conn.close()
+
+    def install(self, bloom: BloomFilter):
+        """Swap in a rebuilt filter (call from the loop thread)"""
+        # Entries added while rebuilding are in the recent window; carry them over
+        for entry_id in self.recent:
+            bloom.add(entry_id)
+        self.bloom = bloom
+
+    def __contains__(self, entry_id: str) -> bool:
+        if entry_id in self.recent:
+            return True
+        if entry_id not in self.bloom:
+            return False
+
+        # Possible hit (or false positive): confirm against the primary key index
+        self.db_lookups += 1
+        row = self.conn.execute('SELECT 1 FROM seen_entries WHERE entry_id = ?', (entry_id,)).fetchone()
+        return row is not None
+
+    def add(self, entry_id: str):
+        if entry_id not in self.recent:
+            self.recent[entry_id] = time.monotonic()
+            self.bloom.add(entry_id)
+
+    def discard(self, entry_id: str):
+        """Forget an accession whose seen marker was never written
+
+        The Bloom bit stays set, so the next lookup falls through to SQLite,
+        finds no row and reports the accession as new.
+        """
+        self.recent.pop(entry_id, None)
+
+    def expire(self):
+        """Drop entries that have aged out of the recent window"""
+        cutoff = time.monotonic() - self.window_seconds
+        while self.recent:
+            if next(iter(self.recent.values())) >= cutoff:
+                break
+            self.recent.popitem(last=False)
+
+    def prune_sql(self) -> tuple:
+        """DELETE statement removing rows past retention, for the writer thread"""
+        return (
+            "DELETE FROM seen_entries WHERE seen_at < datetime('now', ?)",
+            (f'-{self.retention_days} days',)
+        )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Lease-based sharding for running several SEC monitor workers
+
+Workers sharing one insider_trading.db register a lease row in
+``worker_leases`` and renew it every few seconds. The live lease holders
+form a consistent-hash ring (virtual nodes per worker) over issuer CIKs, so
+each worker polls and alerts only its own slice of the watchlist. When a
+worker stops renewing, its lease expires and the survivors pick up its
+CIKs on their next heartbeat; only ~1/N of the keys move.
+
+Heartbeat and release are plain functions of a connection so they run as
+SQLiteWriter jobs.
+"""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import time
+from typing import List, Tuple
+
+VIRTUAL_NODES = 64
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+def default_worker_id() -> str:
+    """hostname-pid: unique per container replica and per process"""
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class ShardCoordinator:
+    """Consistent-hash ownership of CIKs among workers holding live leases"""
+
+    def __init__(self, worker_id: str, lease_seconds: float = 30, vnodes: int = VIRTUAL_NODES):
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.vnodes = vnodes
+        self.workers: List[str] = []
+        self.ring: List[Tuple[int, str]] = []
+        self.set_workers([worker_id])
+
+    @staticmethod
+    def init_table(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS worker_leases (
+                worker_id TEXT PRIMARY KEY,
+                host TEXT,
+                pid INTEGER,
+                started_at REAL,
+                expires_at REAL
+            )
+        ''')
+
+    def heartbeat(self, conn: sqlite3.Connection) -> List[str]:
+        """Renew our lease, drop expired ones and return the live workers (writer job)"""
+        now = time.time()
+        conn.execute('''
+            INSERT INTO worker_leases (worker_id, host, pid, started_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(worker_id) DO UPDATE SET expires_at = excluded.expires_at
+        ''', (self.worker_id, socket.gethostname(), os.getpid(), now, now + self.lease_seconds))
+        conn.execute('DELETE FROM worker_leases WHERE expires_at < ?', (now,))
+        return [row[0] for row in conn.execute('SELECT worker_id FROM worker_leases ORDER BY worker_id')]
+
+    def release(self, conn: sqlite3.Connection):
+        """Give up our lease so the others re-shard immediately (writer job)"""
+        conn.execute('DELETE FROM worker_leases WHERE worker_id = ?', (self.worker_id,))
+
+    def set_workers(self, workers: List[str]) -> bool:
+        """Rebuild the ring for a new membership; True if it changed"""
+        workers = sorted(set(workers) | {self.worker_id})
+        if workers == self.workers:
+            return False
+
+        self.ring = sorted(
+            (_hash(f'{worker}#{i}'), worker) for worker in workers for i in range(self.vnodes)
+        )
+        self.workers = workers
+        return True
+
+    def owner(self, key: str) -> str:
+        """Worker responsible for a CIK (or any other key)"""
+        key = str(int(key)) if key.isdigit() else key
+        i = bisect.bisect(self.ring, (_hash(key),))
+        return self.ring[i % len(self.ring)][1]
+
+    def owns(self, key: str) -> bool:
+        return self.owner(key) == self.worker_id
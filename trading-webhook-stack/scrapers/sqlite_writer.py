@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Background SQLite writer for the SEC monitor
+
+All writes go through one dedicated thread that owns the write connection,
+so the asyncio loop never blocks on SQLite locks or disk syncs. Each job is
+a function run inside a single transaction; jobs are applied in submission
+order, which lets later jobs rely on rows written by earlier ones.
+"""
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from insider_metrics import DB_WRITE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def _job_name(func: Callable) -> str:
+    """Metrics label for a job: the method that built it (save_entries, heartbeat, ...)"""
+    name = getattr(func, '__qualname__', type(func).__name__)
+    return name.split('.<locals>')[0].rsplit('.', 1)[-1]
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: BaseException = None):
+    """Complete a future from the loop thread, unless it was cancelled"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class SQLiteWriter:
+    """Single writer thread with a WAL-mode connection"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.jobs: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        # Generous busy timeout: several monitor workers may share the database
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL lets readers proceed during writes; NORMAL skips the fsync on every commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # Bounded page cache (8 MiB) for small hosts
+        conn.execute('PRAGMA cache_size=-8192')
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            func, future, loop = job
+            start = time.perf_counter()
+            try:
+                with conn:
+                    result = func(conn)
+                loop.call_soon_threadsafe(_resolve, future, result)
+            except Exception as e:
+                logger.error(f"SQLite write failed: {e}")
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+            finally:
+                DB_WRITE_SECONDS.labels(op=_job_name(func)).observe(time.perf_counter() - start)
+
+        conn.close()
+
+    def submit(self, func: Callable[[sqlite3.Connection], Any]) -> asyncio.Future:
+        """Queue func(conn) to run in its own transaction; returns an awaitable future"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Fire-and-forget callers never read the result; don't warn about it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.jobs.put((func, future, loop))
+        return future
+
+    async def close(self):
+        """Apply every queued job, then stop the thread"""
+        if not self.thread.is_alive():
+            return
+        self.jobs.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self.thread.join)
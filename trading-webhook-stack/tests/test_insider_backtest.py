@@ -0,0 +1,64 @@
+"""Known-answer checks for the backtest's entry join"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from insider_backtest import event_returns  # noqa: E402
+
+
+def make_prices() -> pd.DataFrame:
+    # AAA trades 2026-01-05..09, then nothing until 2026-02-02..06; BBB sorts right after it
+    aaa_days = pd.bdate_range('2026-01-05', '2026-01-09').append(pd.bdate_range('2026-02-02', '2026-02-06'))
+    bbb_days = pd.bdate_range('2026-01-05', '2026-02-06')
+    return pd.DataFrame({
+        'ticker': ['AAA'] * len(aaa_days) + ['BBB'] * len(bbb_days),
+        'date': aaa_days.append(bbb_days),
+        'close': np.concatenate([100.0 + np.arange(len(aaa_days)), np.full(len(bbb_days), 50.0)])
+    })
+
+
+def make_events() -> pd.DataFrame:
+    rows = [
+        ('AAA', '2026-01-05'),  # priced: enters 01-06 at 101, exits 01-07 at 102
+        ('AAA', '2025-06-02'),  # before the price history
+        ('AAA', '2026-01-20'),  # in the gap: next close is 13 days later
+        ('AAA', '2026-02-06'),  # last bar of AAA: no later close (next row is BBB)
+        ('ZZZ', '2026-01-05'),  # no prices at all
+    ]
+    return pd.DataFrame({
+        'ticker': [ticker for ticker, _ in rows],
+        'event_date': pd.to_datetime([day for _, day in rows]),
+        'signal': 'BUY',
+        'position': 'CEO',
+        'total_value': 1e6
+    })
+
+
+def test_entry_join_known_answers():
+    entries = event_returns(make_events(), make_prices(), horizons=[1], max_entry_days=5)
+
+    assert entries['entry_date'].tolist()[0] == pd.Timestamp('2026-01-06')
+    assert entries['entry_date'].iloc[1:].isna().all()
+
+    assert entries['ret_1d'].iloc[0] == 102.0 / 101.0 - 1
+    assert entries['hit_1d'].iloc[0] == 1.0
+    assert entries['ret_1d'].iloc[1:].isna().all()
+    assert entries['hit_1d'].iloc[1:].isna().all()
+
+    gaps = entries['entry_gap_days'].tolist()
+    assert gaps[0] == 1
+    assert gaps[1] == (pd.Timestamp('2026-01-05') - pd.Timestamp('2025-06-02')).days
+    assert gaps[2] == 13
+    assert np.isnan(gaps[3]) and np.isnan(gaps[4])
+
+
+def test_max_entry_days_admits_the_gap():
+    entries = event_returns(make_events(), make_prices(), horizons=[1], max_entry_days=20)
+
+    assert entries['entry_date'].iloc[2] == pd.Timestamp('2026-02-02')
+    assert entries['ret_1d'].iloc[2] == 106.0 / 105.0 - 1
+    assert entries['entry_date'].iloc[[1, 3, 4]].isna().all()